@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+purple_line: Benchmark the search for the purple line's points of tangency.
+
+Compares the linear-time search in tc1_97.compute.purple_line_indices with
+the Delaunay triangulation it replaces, on the spectrum loci of a few
+observers, and checks that both give the same points of tangency.
+
+Usage: python benchmarks/purple_line.py [repeat]
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from tc1_97.compute import (compute_tabulated, purple_line_indices,
+                            _purple_line_indices_delaunay)
+
+OBSERVERS = [(2, 32, 390, 830), (10, 32, 390, 830), (1, 20, 390, 830),
+             (5, 60, 400, 700), (10, 70, 420, 650)]
+
+
+def spectrum_loci():
+    """
+    Collect the spectral chromaticity points of the diagrams of each observer.
+
+    Returns
+    -------
+    loci : list
+        List of (label, points) tuples.
+    """
+    loci = []
+    for (field_size, age, λ_min, λ_max) in OBSERVERS:
+        plots = compute_tabulated(field_size, age, λ_min, λ_max, 1)[1]
+        label = '%s° %s yr %s-%s nm' % (field_size, age, λ_min, λ_max)
+        loci.append((label + ' xyz', plots['xyz'][:, 1:3]))
+        loci.append((label + ' lms_mb', plots['lms_mb'][:, 1:4:2]))
+        loci.append((label + ' lms_mw', plots['lms_mw'][:, 1:3]))
+    return loci
+
+
+def main(repeat=5):
+    print('%-34s %12s %12s %8s' % ('locus', 'Delaunay', 'linear', 'same'))
+    total_delaunay = total_linear = 0
+    for (label, points) in spectrum_loci():
+        t_delaunay = min(timeit.repeat(
+            lambda: _purple_line_indices_delaunay(points),
+            number=1, repeat=repeat))
+        t_linear = min(timeit.repeat(
+            lambda: purple_line_indices(points),
+            number=1, repeat=repeat))
+        same = (_purple_line_indices_delaunay(points) ==
+                purple_line_indices(points))
+        total_delaunay += t_delaunay
+        total_linear += t_linear
+        print('%-34s %10.2f ms %10.3f ms %8s' %
+              (label, 1e3 * t_delaunay, 1e3 * t_linear, same))
+    print('Speed-up: %.0fx' % (total_delaunay / total_linear))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
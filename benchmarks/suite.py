@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+suite: Benchmark the compute, table, description and plot paths.
+
+Times tc1_97.compute_tabulated for a matrix of observers and wavelength
+steps, both with the stage cache filled by an earlier call of the same
+observer (compute/*) and empty (compute_cold/*),
+tc1_97.compute_tabulated_batch against a loop over the same observers, and
+every generator of tc1_97.table, tc1_97.description and tc1_97.plot (drawn
+on an Agg canvas, so no display is needed). The timings
+are written as JSON, and can be compared with those of an earlier run to
+find regressions.
+
+Usage: python benchmarks/suite.py [-r REPEAT] [-o OUTPUT] [-c BASELINE]
+                                  [-t THRESHOLD] [-k PATTERN]
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import fnmatch
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import matplotlib
+import numpy as np
+import scipy
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import tc1_97
+import tc1_97.description
+import tc1_97.plot
+import tc1_97.table
+
+# Standard observers (2° and 10° at 32 years) use the tabulated CIE 2006
+# LMS functions; the others compute them, and all optimise the XYZ
+# transformation matrix.
+OBSERVERS = [(2, 32), (10, 32), (1, 20), (5, 60), (10, 70)]
+STEPS = [1, 0.5, 0.1]
+
+# Observers of compute_tabulated_batch, compared with a loop over
+# compute_tabulated for the same outputs
+BATCH_FIELD_SIZES = np.linspace(1, 10, 40)
+BATCH_AGES = np.linspace(20, 80, 40)
+
+# Observer of the tables, descriptions and plots
+OUTPUT_OBSERVER = (5, 60, 390, 830, 1)
+
+# As in the desktop app
+OPTIONS = {'grid': True,
+           'cie31': True,
+           'cie64': True,
+           'labels': False,
+           'log10': False,
+           'norm': False,
+           'label_fontsize': 7,
+           'title_fontsize': 10.5,
+           'full_title': True,
+           'axis_labels': True}
+
+
+def generators(module):
+    """
+    Return the public functions of a module, as (name, function) tuples.
+    """
+    return [(name, function)
+            for (name, function) in inspect.getmembers(module,
+                                                       inspect.isfunction)
+            if not name.startswith('_') and
+            function.__module__ == module.__name__]
+
+
+def draw(function, plots, options):
+    """
+    Draw a plot on an Agg canvas.
+    """
+    fig = Figure(figsize=(8.0, 4.8))
+    FigureCanvasAgg(fig)
+    function(fig.add_subplot(111), plots, options)
+    fig.canvas.draw()
+
+
+def compute_cold(field_size, age, λ_step):
+    """
+    Compute an observer with an empty stage cache.
+    """
+    tc1_97.compute.stage_cache.clear()
+    tc1_97.compute_tabulated(field_size, age, 390, 830, λ_step)
+
+
+def loop_LMS():
+    """
+    Compute the batch observers one by one, with a cold stage cache.
+    """
+    tc1_97.compute.stage_cache.clear()
+    for (field_size, age) in zip(BATCH_FIELD_SIZES, BATCH_AGES):
+        tc1_97.compute_tabulated(field_size, age,
+                                 outputs=['LMS', 'LMS_base'])
+
+
+def cases():
+    """
+    Generate the benchmarks, as (name, function of no arguments) tuples.
+    """
+    for (field_size, age) in OBSERVERS:
+        for λ_step in STEPS:
+            name = '%s°_%syr_step%s' % (field_size, age, λ_step)
+            # warm: the stages of the observer are in the stage cache (after
+            # the untimed first call), as for repeated requests
+            yield ('compute/' + name,
+                   lambda field_size=field_size, age=age, λ_step=λ_step:
+                   tc1_97.compute_tabulated(field_size, age, 390, 830, λ_step))
+            # cold: a new observer
+            yield ('compute_cold/' + name,
+                   lambda field_size=field_size, age=age, λ_step=λ_step:
+                   compute_cold(field_size, age, λ_step))
+    yield ('batch/LMS_%d_observers' % len(BATCH_AGES),
+           lambda: tc1_97.compute_tabulated_batch(BATCH_FIELD_SIZES,
+                                                  BATCH_AGES))
+    yield ('batch/LMS_%d_observers_loop' % len(BATCH_AGES), loop_LMS)
+    (results, plots) = tc1_97.compute_tabulated(*OUTPUT_OBSERVER)
+    for (name, function) in generators(tc1_97.table):
+        yield ('table/' + name,
+               lambda function=function: function(results, OPTIONS, True))
+    for (name, function) in generators(tc1_97.description):
+        yield ('description/' + name,
+               lambda function=function: function(results, '', OPTIONS, True))
+    for (name, function) in generators(tc1_97.plot):
+        yield ('plot/' + name,
+               lambda function=function: draw(function, plots, OPTIONS))
+
+
+def metadata():
+    """
+    Return the environment of the run: commit, versions and platform.
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'commit': commit or None,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'scipy': scipy.__version__,
+            'matplotlib': matplotlib.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine()}
+
+
+def run(repeat=5, pattern='*'):
+    """
+    Run the benchmarks with names matching pattern.
+
+    Parameters
+    ----------
+    repeat : int
+        Number of timings of each benchmark (after one untimed call, which
+        fills the caches; the cold benchmarks empty them when timed).
+    pattern : str
+        Shell-style pattern of the benchmark names.
+
+    Returns
+    -------
+    benchmarks : dict
+        Benchmark name -> dict with the min, median and max seconds, or the
+        error raised.
+    """
+    benchmarks = dict()
+    for (name, function) in cases():
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        try:
+            function()  # warm-up
+            times = timeit.repeat(function, number=1, repeat=repeat)
+        except Exception as e:
+            benchmarks[name] = {'error': repr(e)}
+            print('%-45s %s' % (name, repr(e)))
+            continue
+        benchmarks[name] = {'min': min(times),
+                            'median': statistics.median(times),
+                            'max': max(times),
+                            'repeat': repeat}
+        print('%-45s %10.3f ms' % (name, 1e3 * min(times)))
+    return benchmarks
+
+
+def compare(benchmarks, baseline, threshold=1.2):
+    """
+    Compare the minimum times with those of a baseline run, and print them.
+
+    Returns
+    -------
+    regressions : list
+        Names of the benchmarks slower than threshold times the baseline.
+    """
+    regressions = []
+    print('\n%-45s %12s %12s %8s' % ('benchmark', 'baseline', 'now', 'ratio'))
+    for (name, timing) in benchmarks.items():
+        before = baseline.get(name, {})
+        if 'min' not in timing or 'min' not in before:
+            continue
+        ratio = timing['min'] / before['min']
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print('%-45s %9.3f ms %9.3f ms %8.2f%s' % (
+            name, 1e3 * before['min'], 1e3 * timing['min'], ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('-o', '--output', help='Write the results as JSON')
+    parser.add_argument('-c', '--compare',
+                        help='JSON results of an earlier run to compare with')
+    parser.add_argument('-t', '--threshold', type=float, default=1.2,
+                        help='Slow-down ratio counted as a regression')
+    parser.add_argument('-k', '--pattern', default='*',
+                        help='Run only the benchmarks matching the pattern, '
+                        'e.g. "compute/*"')
+    args = parser.parse_args(argv)
+    benchmarks = run(args.repeat, args.pattern)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'metadata': metadata(), 'benchmarks': benchmarks},
+                      f, indent=1, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['benchmarks']
+        if compare(benchmarks, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -613,7 +613,8 @@ with this program.  If not, see <http://www.gnu.org/licenses/>.
             self.last_age,
             self.last_lambda_min,
             self.last_lambda_max,
-            self.last_resolution)
+            self.last_resolution,
+            atlas=tc1_97.load_observer_atlas())
         if self.results['XYZ'][-1, 0] < 700:
             self.lambda_max_spin.setMinimum(self.results['XYZ'][-1, 0])
         if self.results['XYZ'][-1, 0] != self.last_lambda_max:
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+batch: Compute the CIE cone-fundamental-based colorimetric functions for a
+sweep of observers, without GUI, in a pool of processes.
+
+Usage: python -m tc1_97 --field-sizes 1:10:0.1 --ages 20:80:1
+                        --outputs LMS XYZ_N xyz -o sweep/ [--consolidate
+                        sweep.npz] [--domains 390:830:1 ...] [-j JOBS]
+
+Each observer is written to its own .npz file in the output directory,
+named after its parameters, and observers already written are skipped, so
+that an interrupted sweep is resumed by running the same command again.
+With --consolidate, all the observers are also collected in one .npz file.
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import argparse
+import concurrent.futures
+import itertools
+import os
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+from tc1_97.compute import (compute_tabulated, load_observer_atlas,
+                            required_stages, STAGE_OUTPUTS)
+
+DEFAULT_OUTPUTS = ('LMS', 'XYZ', 'xyz', 'lms_mb')
+
+
+# =============================================================================
+# Observers
+# =============================================================================
+
+def parse_values(specs):
+    """
+    Parse values given as numbers or inclusive ranges start:stop:step.
+
+    Parameters
+    ----------
+    specs : list of str
+        E.g. ['2', '10'] or ['1:10:0.1'].
+
+    Returns
+    -------
+    values : list of float
+        The values, in the given order, without duplicates.
+    """
+    values = []
+    for spec in specs:
+        parts = [float(part) for part in spec.split(':')]
+        if len(parts) == 1:
+            new = parts
+        elif len(parts) == 3 and parts[2] > 0:
+            (start, stop, step) = parts
+            new = np.round(np.arange(start, stop + step / 2, step), 10)
+        else:
+            raise ValueError('Invalid range %r (use start:stop:step)' % spec)
+        values.extend(float(value) for value in new
+                      if float(value) not in values)
+    return values
+
+
+def parse_domain(spec):
+    """
+    Parse a wavelength domain λ_min:λ_max:λ_step.
+    """
+    parts = [float(part) for part in spec.split(':')]
+    if len(parts) != 3 or parts[2] <= 0 or parts[0] >= parts[1]:
+        raise ValueError('Invalid domain %r (use λ_min:λ_max:λ_step)' % spec)
+    return tuple(parts)
+
+
+def observer_name(parameters):
+    """
+    Return the file name (without extension) of an observer given by
+    (field_size, age, λ_min, λ_max, λ_step).
+    """
+    return 'fs%g_age%g_%g-%g-%g' % parameters
+
+
+def check_outputs(outputs):
+    """
+    Check that the outputs are arrays in the results of compute_tabulated.
+    """
+    known = set(itertools.chain(*STAGE_OUTPUTS.values()))
+    for output in outputs:
+        if output not in known:
+            raise ValueError('Unknown output: %s (one of %s)' %
+                             (output, ', '.join(sorted(known))))
+    required_stages(outputs)
+
+
+# =============================================================================
+# Computation
+# =============================================================================
+
+def is_done(filename, outputs):
+    """
+    Check whether an observer file exists and contains all the outputs.
+    """
+    try:
+        with zipfile.ZipFile(filename) as npz:
+            names = set(npz.namelist())
+    except (OSError, zipfile.BadZipFile):
+        return False
+    return all(output + '.npy' in names for output in outputs)
+
+
+def compute_observer(task):
+    """
+    Compute the outputs of one observer and write them to its file.
+
+    Parameters
+    ----------
+    task : tuple
+        (parameters, outputs, directory), where parameters is
+        (field_size, age, λ_min, λ_max, λ_step).
+
+    Returns
+    -------
+    name : str
+        Name of the observer.
+    """
+    (parameters, outputs, directory) = task
+    name = observer_name(parameters)
+    results = compute_tabulated(*parameters, outputs=outputs,
+                                atlas=load_observer_atlas())[0]
+    filename = os.path.join(directory, name + '.npz')
+    with open(filename + '.tmp', 'wb') as f:
+        np.savez(f, parameters=np.array(parameters),
+                 **{output: results[output] for output in outputs})
+    os.replace(filename + '.tmp', filename)  # atomic, for resuming
+    return name
+
+
+def consolidate(directory, observers, filename):
+    """
+    Collect the observer files in one .npz file, with the array
+    'parameters' (one row per observer: field_size, age, λ_min, λ_max,
+    λ_step) and the arrays '<observer name>/<output>'.
+    """
+    arrays = {'parameters': np.array(observers)}
+    for parameters in observers:
+        name = observer_name(parameters)
+        with np.load(os.path.join(directory, name + '.npz')) as npz:
+            for output in npz.files:
+                if output != 'parameters':
+                    arrays[name + '/' + output] = npz[output]
+    with open(filename + '.tmp', 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(filename + '.tmp', filename)
+
+
+class Progress:
+    """
+    Report the progress of a sweep on stderr, at most once per interval.
+    """
+
+    def __init__(self, total, interval=1.):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.start = time.time()
+        self.last = 0.
+
+    def update(self, count=1, final=False):
+        self.done += count
+        now = time.time()
+        if not final and now - self.last < self.interval:
+            return
+        self.last = now
+        elapsed = now - self.start
+        remaining = (elapsed / self.done * (self.total - self.done)
+                     if self.done else float('nan'))
+        sys.stderr.write('%d/%d observers, %.0f s elapsed, %.0f s remaining\n'
+                         % (self.done, self.total, elapsed, remaining))
+
+
+def run(observers, outputs, directory, jobs=None, chunk_size=None,
+        progress=True):
+    """
+    Compute the observers not already in the directory in a process pool.
+
+    Parameters
+    ----------
+    observers : list of tuple
+        (field_size, age, λ_min, λ_max, λ_step) of each observer.
+    outputs : list of str
+        Keys of the results of compute_tabulated to write.
+    directory : str
+        Output directory.
+    jobs : int
+        Number of processes (default: number of CPUs).
+    chunk_size : int
+        Number of observers sent to a process at a time (default: about
+        four chunks per process).
+    progress : bool
+        Report the progress on stderr.
+
+    Returns
+    -------
+    computed : int
+        Number of observers computed (the others were done already).
+    """
+    os.makedirs(directory, exist_ok=True)
+    todo = [parameters for parameters in observers
+            if not is_done(os.path.join(directory,
+                                        observer_name(parameters) + '.npz'),
+                           outputs)]
+    if progress and len(todo) < len(observers):
+        sys.stderr.write('%d of %d observers done already\n' %
+                         (len(observers) - len(todo), len(observers)))
+    if not todo:
+        return 0
+    jobs = jobs or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, len(todo) // (4 * jobs))
+    tasks = [(parameters, list(outputs), directory) for parameters in todo]
+    reporter = Progress(len(todo)) if progress else None
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        for _ in executor.map(compute_observer, tasks, chunksize=chunk_size):
+            if reporter:
+                reporter.update()
+    if reporter:
+        reporter.update(0, final=True)
+    return len(todo)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m tc1_97',
+        description='Compute the CIE cone-fundamental-based colorimetric '
+        'functions for a sweep of observers.')
+    parser.add_argument('-f', '--field-sizes', nargs='+', default=['2'],
+                        help='Field sizes in degrees, as values or ranges '
+                        'start:stop:step (inclusive)')
+    parser.add_argument('-a', '--ages', nargs='+', default=['32'],
+                        help='Ages in years, as values or ranges')
+    parser.add_argument('-d', '--domains', nargs='+', default=['390:830:1'],
+                        help='Wavelength domains λ_min:λ_max:λ_step in nm')
+    parser.add_argument('--outputs', nargs='+', default=list(DEFAULT_OUTPUTS),
+                        help='Results to write (default: %(default)s)')
+    parser.add_argument('-o', '--output-dir', required=True,
+                        help='Directory of the observer files')
+    parser.add_argument('-c', '--consolidate', metavar='FILE',
+                        help='Also collect all observers in one .npz file')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='Number of processes (default: number of CPUs)')
+    parser.add_argument('--chunk-size', type=int,
+                        help='Observers per task sent to a process')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='Do not report the progress')
+    args = parser.parse_args(argv)
+    try:
+        check_outputs(args.outputs)
+        field_sizes = parse_values(args.field_sizes)
+        ages = parse_values(args.ages)
+        domains = [parse_domain(domain) for domain in args.domains]
+    except ValueError as e:
+        parser.error(str(e))
+    observers = [(field_size, age) + domain
+                 for domain in domains
+                 for field_size in field_sizes
+                 for age in ages]
+    run(observers, args.outputs, args.output_dir, args.jobs, args.chunk_size,
+        not args.quiet)
+    if args.consolidate:
+        consolidate(args.output_dir, observers, args.consolidate)
+    return 0
@@ -19,9 +19,19 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import json
 import numpy as np
 import scipy.optimize
 import scipy.interpolate
+import os
+import threading
+import time
+import tracemalloc
+import types
 import warnings
 from scipy.spatial import Delaunay
 from tc1_97.utils import resource_path
@@ -193,33 +203,406 @@ def docul_fine(ocular_sum_32, docul2):
     return (docul1_fine, docul2_fine)
 
 
+# The tables of the data bundle: name, source CSV file, columns (None for
+# all) and padding value for missing values.
+DATA_TABLES = [
+    ('absorbance', 'data/absorbances0_1nm.csv', [0, 2, 3, 4], -np.inf),
+    ('macula_2', 'data/absorbances0_1nm.csv', [0, 6], -np.inf),
+    ('ocular_sum_32', 'data/absorbances0_1nm.csv', [0, 5], -np.inf),
+    ('docul2', 'data/docul2.csv', None, -np.inf),
+    ('LMS10_log_quantal', 'data/ss10q_fine_8dp.csv', None, -np.inf),
+    ('LMS10_lin_energy_9_signfig', 'data/linss10e_fine_8dp.csv', None, 0),
+    ('LMS10_lin_energy_6_signfig', 'data/linss10e_fine.csv', None, 0),
+    ('LMS2_log_quantal', 'data/ss2_10q_fine_8dp.csv', None, -np.inf),
+    ('LMS2_lin_energy_9_signfig', 'data/linss2_10e_fine_8dp.csv', None, 0),
+    ('LMS2_lin_energy_6_signfig', 'data/linss2_10e_fine.csv', None, 0),
+    ('VλLM_10_lin_energy', 'data/linCIE2015v10e_fine_8dp.csv', None, -np.inf),
+    ('VλLM_2_lin_energy', 'data/linCIE2015v2e_fine_8dp.csv', None, -np.inf),
+    ('VλLM_10_log_quantal', 'data/logCIE2015v10q_fine_8dp.csv', None,
+     -np.inf),
+    ('VλLM_2_log_quantal', 'data/logCIE2015v2q_fine_8dp.csv', None, -np.inf),
+    ('XYZ31', 'data/ciexyz31_1.csv', None, -np.inf),
+    ('XYZ64', 'data/ciexyz64_1.csv', None, -np.inf),
+]
+
+DATA_BUNDLE = 'data/visual_data.bin'
+DATA_BUNDLE_INDEX = 'data/visual_data.json'
+
+_data_bundle = None
+
+
+def _file_checksum(filename):
+    """
+    Compute the SHA-256 checksum of a data file.
+
+    Parameters
+    ----------
+    filename : string
+        Name of the file, relative to the package.
+
+    Returns
+    -------
+    checksum : string
+        The hexadecimal digest.
+    """
+    with open(resource_path(filename), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_data_tables():
+    """
+    Read all the tables of the data bundle from the CSV files, reading each
+    file only once.
+
+    Returns
+    -------
+    tables : dict
+        The tables by name.
+    """
+    csv_arrays = dict()
+    tables = dict()
+    for (name, filename, columns, pad) in DATA_TABLES:
+        if (filename, pad) not in csv_arrays:
+            csv_arrays[(filename, pad)] = read_csv_file(filename, pad)
+        arr = csv_arrays[(filename, pad)]
+        tables[name] = arr if columns is None else arr[:, columns]
+    return tables
+
+
+def build_data_bundle():
+    """
+    Pack the tables read from the CSV files into the binary data bundle.
+
+    The tables are stored as contiguous float64 arrays in DATA_BUNDLE. The
+    index DATA_BUNDLE_INDEX holds the offset and shape of each table and
+    the checksums of the CSV files it was generated from. Rerun whenever
+    the CSV files change.
+    """
+    tables = read_data_tables()
+    index = {'csv_checksums': dict(), 'tables': dict()}
+    offset = 0
+    with open(resource_path(DATA_BUNDLE), 'wb') as f:
+        for (name, filename, columns, pad) in DATA_TABLES:
+            arr = np.ascontiguousarray(tables[name], dtype='<f8')
+            f.write(arr.tobytes())
+            index['tables'][name] = {'offset': offset, 'shape': arr.shape}
+            index['csv_checksums'][filename] = _file_checksum(filename)
+            offset += arr.nbytes
+    with open(resource_path(DATA_BUNDLE_INDEX), 'w') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+
+
+def load_data_bundle():
+    """
+    Map the tables of the binary data bundle into memory.
+
+    The bundle is memory-mapped read-only, so the pages are shared between
+    processes. If the bundle is missing, the tables are read from the CSV
+    files instead. The CSV files are not checksummed here, which would
+    defeat the fast loading; see verify_data_bundle.
+
+    Returns
+    -------
+    tables : dict
+        The (read-only) tables by name.
+    """
+    global _data_bundle
+    if _data_bundle is not None:
+        return _data_bundle
+    try:
+        with open(resource_path(DATA_BUNDLE_INDEX)) as f:
+            index = json.load(f)
+        bundle = np.memmap(resource_path(DATA_BUNDLE), dtype='<f8', mode='r')
+        tables = dict()
+        for (name, entry) in index['tables'].items():
+            start = entry['offset'] // bundle.itemsize
+            size = int(np.prod(entry['shape']))
+            tables[name] = bundle[start:start + size].reshape(
+                entry['shape']).view(np.ndarray)
+    except (OSError, ValueError, KeyError) as e:
+        warnings.warn('Data bundle not used (%s), reading the CSV files' % e)
+        tables = read_data_tables()
+        _read_only_all(tuple(tables.values()))
+    _data_bundle = tables
+    return _data_bundle
+
+
+def verify_data_bundle():
+    """
+    Check that the data bundle is identical to the tables of the CSV files,
+    and that the CSV files match the checksums recorded when the bundle was
+    built.
+
+    Returns
+    -------
+    mismatches : list
+        Names of the tables that differ, or whose CSV file has changed
+        (empty if the bundle is valid).
+    """
+    with open(resource_path(DATA_BUNDLE_INDEX)) as f:
+        checksums = json.load(f)['csv_checksums']
+    tables = read_data_tables()
+    bundle = load_data_bundle()
+    return [name for (name, filename, columns, pad) in DATA_TABLES
+            if name not in bundle or
+            checksums.get(filename) != _file_checksum(filename) or
+            not np.array_equal(tables[name], bundle[name])]
+
+
+class _lazy_data:
+    """
+    Class attribute of VisualData, computed on first access.
+    """
+
+    def __init__(self, load):
+        """
+        Parameters
+        ----------
+        load : callable
+            Function without arguments returning the value.
+        """
+        self.load = load
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        value = self.load()
+        setattr(owner, self.name, value)  # replace the descriptor
+        return value
+
+
+def _bundled(name):
+    """
+    Create a lazy VisualData attribute for a table of the data bundle.
+    """
+    return _lazy_data(lambda: load_data_bundle()[name])
+
+
 class VisualData:
     """
     Class containing all visual data input to the computations.
-    
+
+    The tables are loaded from the data bundle on first access.
     """
-    absorbance = read_csv_file('data/absorbances0_1nm.csv')[:, [0, 2, 3, 4]]
-    macula_2 = read_csv_file('data/absorbances0_1nm.csv')[:, [0, 6]]
-    macula_rel = macula_2 / .35  # since macula at 2° has a
-                                 # maximum of 0.35 at 460 (at 5nm step)
-    docul2 = read_csv_file('data/docul2.csv')
-    ocular_sum_32 = read_csv_file(
-        'data/absorbances0_1nm.csv')[:, [0, 5]]  # 32 years only!
-    (docul1_fine, docul2_fine) = docul_fine(ocular_sum_32, docul2)
-    LMS10_log_quantal = read_csv_file('data/ss10q_fine_8dp.csv')
-    LMS10_lin_energy_9_signfig = read_csv_file('data/linss10e_fine_8dp.csv', 0)
-    LMS10_lin_energy_6_signfig = read_csv_file('data/linss10e_fine.csv', 0)
-    LMS2_log_quantal = read_csv_file('data/ss2_10q_fine_8dp.csv')
-    LMS2_lin_energy_9_signfig = read_csv_file('data/linss2_10e_fine_8dp.csv',0)
-    LMS2_lin_energy_6_signfig = read_csv_file('data/linss2_10e_fine.csv', 0)
-    VλLM_10_lin_energy = read_csv_file('data/linCIE2015v10e_fine_8dp.csv')
-    VλLM_2_lin_energy = read_csv_file('data/linCIE2015v2e_fine_8dp.csv')
-    VλLM_10_log_quantal = read_csv_file('data/logCIE2015v10q_fine_8dp.csv')
-    VλLM_2_log_quantal = read_csv_file('data/logCIE2015v2q_fine_8dp.csv')
-    XYZ31 = read_csv_file('data/ciexyz31_1.csv')
-    XYZ64 = read_csv_file('data/ciexyz64_1.csv')
+    absorbance = _bundled('absorbance')
+    macula_2 = _bundled('macula_2')
+    # since macula at 2° has a maximum of 0.35 at 460 (at 5nm step)
+    macula_rel = _lazy_data(lambda: VisualData.macula_2 / .35)
+    docul2 = _bundled('docul2')
+    ocular_sum_32 = _bundled('ocular_sum_32')  # 32 years only!
+    docul1_fine = _lazy_data(lambda: docul_fine(VisualData.ocular_sum_32,
+                                                VisualData.docul2)[0])
+    docul2_fine = _lazy_data(lambda: docul_fine(VisualData.ocular_sum_32,
+                                                VisualData.docul2)[1])
+    LMS10_log_quantal = _bundled('LMS10_log_quantal')
+    LMS10_lin_energy_9_signfig = _bundled('LMS10_lin_energy_9_signfig')
+    LMS10_lin_energy_6_signfig = _bundled('LMS10_lin_energy_6_signfig')
+    LMS2_log_quantal = _bundled('LMS2_log_quantal')
+    LMS2_lin_energy_9_signfig = _bundled('LMS2_lin_energy_9_signfig')
+    LMS2_lin_energy_6_signfig = _bundled('LMS2_lin_energy_6_signfig')
+    VλLM_10_lin_energy = _bundled('VλLM_10_lin_energy')
+    VλLM_2_lin_energy = _bundled('VλLM_2_lin_energy')
+    VλLM_10_log_quantal = _bundled('VλLM_10_log_quantal')
+    VλLM_2_log_quantal = _bundled('VλLM_2_log_quantal')
+    XYZ31 = _bundled('XYZ31')
+    XYZ64 = _bundled('XYZ64')
 
     
+#=============================================================================
+#  Caching of the age- and field-size-dependent stages
+#=============================================================================
+
+class StageCache:
+    """
+    Bounded least-recently-used cache for the results of the age- and
+    field-size-dependent stages of the computation.
+
+    Entries are keyed on the name of the stage and the (rounded) parameters.
+    Cached arrays are read-only, since they are shared between callers.
+    """
+
+    def __init__(self, maxsize=256):
+        """
+        Initialise an empty cache.
+
+        Parameters
+        ----------
+        maxsize : int
+            Maximum number of cached entries. If 0, nothing is cached.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it if missing.
+
+        Parameters
+        ----------
+        key : tuple
+            Name of the stage followed by the rounded parameters.
+        compute : callable
+            Function without arguments computing the value.
+
+        Returns
+        -------
+        value : ndarray or tuple
+            The (read-only) cached value.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        value = _read_only_all(compute())
+        with self._lock:
+            if self.maxsize > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def resize(self, maxsize):
+        """
+        Change the maximum number of entries, evicting the least recently
+        used entries if necessary.
+
+        Parameters
+        ----------
+        maxsize : int
+            New maximum number of cached entries.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all entries and reset the hit and miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Return statistics for the cache.
+
+        Returns
+        -------
+        info : dict
+            Number of hits and misses, current size and maximum size.
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._entries),
+                    'maxsize': self.maxsize}
+
+
+stage_cache = StageCache()
+
+
+def _read_only_all(value):
+    """
+    Mark all arrays in value (possibly nested in tuples) as read-only.
+
+    Parameters
+    ----------
+    value : ndarray, tuple or other
+        The value to be protected against in-place editing.
+
+    Returns
+    -------
+    value : ndarray, tuple or other
+        The same value.
+    """
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, tuple):
+        for item in value:
+            _read_only_all(item)
+    return value
+
+
+def _rounded_parameter(arg):
+    """
+    Round a number parameter of a stage to 10 decimal points.
+
+    The stages are called with the rounded parameters, so that the cached
+    value is a function of the cache key only (e.g., an age of 32 + 1e-12
+    is the standard age 32 both for the key and for the computation).
+
+    Parameters
+    ----------
+    arg : float, int, bool or ndarray
+        The parameter.
+
+    Returns
+    -------
+    arg : float, bool or ndarray
+        Rounded number, or the unchanged boolean or array.
+    """
+    if isinstance(arg, (bool, np.bool_, np.ndarray)):
+        return arg
+    return round(float(arg), 10)
+
+
+def _cache_key_item(arg):
+    """
+    Convert a parameter to a hashable key item, rounding numbers.
+
+    Parameters
+    ----------
+    arg : float, int, bool or ndarray
+        The parameter.
+
+    Returns
+    -------
+    item : hashable
+        Rounded number, or shape and digest of an array.
+    """
+    if isinstance(arg, np.ndarray):
+        return (arg.shape, hashlib.sha1(np.ascontiguousarray(arg)).hexdigest())
+    return _rounded_parameter(arg)
+
+
+def memoized_stage(func):
+    """
+    Decorator caching the results of a stage function in stage_cache.
+
+    Parameters
+    ----------
+    func : callable
+        Function of numbers and/or arrays only.
+
+    Returns
+    -------
+    wrapper : callable
+        The memoized function, called with the parameters rounded by
+        _rounded_parameter. The returned arrays are read-only.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        args = tuple(_rounded_parameter(arg) for arg in args)
+        kwargs = {name: _rounded_parameter(value)
+                  for (name, value) in kwargs.items()}
+        key = ((func.__name__,) +
+               tuple(_cache_key_item(arg) for arg in args) +
+               tuple((name, _cache_key_item(kwargs[name]))
+                     for name in sorted(kwargs)))
+        return stage_cache.get(key, lambda: func(*args, **kwargs))
+    return wrapper
+
+
 #=============================================================================  
 #  Basic colorimetrically related functions
 #=============================================================================
@@ -300,6 +683,7 @@ def linear_transformation_λ(trans_mat, tristimulus_λ):
 #  Functions of age and/or field size
 #==============================================================================
 
+@memoized_stage
 def d_ocular(age):
     """
     Compute the optical density of the ocular media for given age.
@@ -383,6 +767,7 @@ def d_S_max(field_size):
     return my_round(0.30 + 0.45*np.exp(-field_size/1.333), 3)
 
 
+@memoized_stage
 def absorptance(field_size):
     """
     Compute the quantal absorptance of the L, M and S cones for given field
@@ -409,6 +794,7 @@ def absorptance(field_size):
     return absorpt
 
 
+@memoized_stage
 def LMS_quantal(field_size, age):
     """
     Compute the quantum_based LMS cone fundamentals for given field size and
@@ -438,6 +824,7 @@ def LMS_quantal(field_size, age):
     return LMSq
 
 
+@memoized_stage
 def LMS_energy(field_size, age, base=False):
     """
     Compute the energy-based LMS cone fundamentals for given field size and
@@ -514,17 +901,36 @@ def relative_L_cone_weight_Vλ_quantal(field_size, age, strategy_2=True):
     if strategy_2:
         field_size = 2.
     abt_fs = absorptance(field_size)
-    abt_2 = absorptance(2.)
     LMSq_fs_age = LMS_quantal(field_size, age)
-    LMSq_2_32 = LMS_quantal(2, 32)
     const_fs_age = (abt_fs[0, 1] * LMSq_fs_age[0, 2] /
                     (abt_fs[0, 2] * LMSq_fs_age[0, 1]))
-    const_2_32 = (abt_2[0, 1] * LMSq_2_32[0, 2] /
-                  (abt_2[0, 2] * LMSq_2_32[0, 1]))
-    kLq_rel = 1.89 * const_fs_age / const_2_32
+    kLq_rel = 1.89 * const_fs_age / _L_cone_weight_const_2_32()
     return kLq_rel
 
 
+_const_2_32 = None
+
+
+def _L_cone_weight_const_2_32():
+    """
+    Compute the constant term of the 2°, 32 year reference observer in
+    relative_L_cone_weight_Vλ_quantal (computed once per process).
+
+    Returns
+    -------
+    const_2_32 : float
+        Ratio of the L and M quantal absorptances to the L and M quantal
+        cone fundamentals at the shortest wavelength.
+    """
+    global _const_2_32
+    if _const_2_32 is None:
+        abt_2 = absorptance(2.)
+        LMSq_2_32 = LMS_quantal(2, 32)
+        _const_2_32 = (abt_2[0, 1] * LMSq_2_32[0, 2] /
+                       (abt_2[0, 2] * LMSq_2_32[0, 1]))
+    return _const_2_32
+
+
 def Vλ_energy_and_LM_weights(field_size, age):
     """
     Compute the energy-based V(λ) function (starting from energy-based LMS).
@@ -567,6 +973,7 @@ def Vλ_energy_and_LM_weights(field_size, age):
     return (Vλ, (a21, a22))
 
 
+@memoized_stage
 def xyz_interpolated_reference_system(field_size, XYZ31_std, XYZ64_std):
     """
     Compute the spectral chromaticity coordinates of the reference system
@@ -643,6 +1050,139 @@ def xyz_interpolated_reference_system(field_size, XYZ31_std, XYZ64_std):
 # Minimisation function
 # =============================================================================
 
+class A13Objective:
+    """
+    Precomputed context for the function to be optimised for determination
+    of element a13 in the (non-renormalized) transformation matrix of the
+    linear transformation LMS --> XYZ (see square_sum).
+
+    The spline sums, the LMS values at 1 nm steps from 390 nm to 830 nm and
+    the truncated reference chromaticities are evaluated once, and the terms
+    of a11 and a12 not depending on a13 once per λ_ref_min, in the same order
+    of operations as in the original formulation. Each evaluation then costs
+    one 3x3 by 3x441 matrix product and the error reduction.
+    """
+
+    def __init__(self, a21, a22, a33, L_spline, M_spline, S_spline, V_spline,
+                 λ, xyz_ref, λ_ref_min=None):
+        """
+        Evaluate the invariants of the objective function.
+
+        Parameters
+        ----------
+        a21, a22, a33 : float
+            Parameters in matrix for LMS to XYZ conversion.
+        L_spline, M_spline, S_spline, V_spline: InterpolatedUnivariateSpline LMS and V(λ).
+        λ : ndarray
+            λ values according to chosen step size.
+        xyz_ref : ndarray
+            Reference xyz chromaticity coordinates at 1 nm steps.
+        λ_ref_min : float
+            λ value that gives a minimum for the x-coordinate in the
+            corresponding reference diagram (see set_reference).
+        """
+        (self.a21, self.a22, self.a33) = (a21, a22, a33)
+        self.splines = (L_spline, M_spline, S_spline)
+        # Stripping reference values in accordance with CIE2006 tables
+        self.xyz_ref_trunk = xyz_ref[30:, 1:].T
+        self.x_ref_min = self.xyz_ref_trunk[0, :].min()
+        self.sums = (L_spline(λ).sum(), M_spline(λ).sum(),
+                     S_spline(λ).sum(), V_spline(λ).sum())
+        self.λ_main = np.arange(390, 831)
+        self.LMS = np.array([L_spline(self.λ_main),
+                             M_spline(self.λ_main),
+                             S_spline(self.λ_main)])
+        self.λ_ref_min = None
+        if λ_ref_min is not None:
+            self.set_reference(λ_ref_min)
+
+    def set_reference(self, λ_ref_min):
+        """
+        Precompute the terms of a11 and a12 that depend on λ_ref_min only.
+
+        Parameters
+        ----------
+        λ_ref_min : float
+            λ value that gives a minimum for the x-coordinate in the
+            corresponding reference diagram, i.e. x(λ_ref_min) = x_ref_min.
+        """
+        if λ_ref_min == self.λ_ref_min:
+            return
+        (a21, a22, a33) = (self.a21, self.a22, self.a33)
+        (L_sum, M_sum, S_sum, V_sum) = self.sums
+        x_ref_min = self.x_ref_min
+        (L_ref, M_ref, S_ref) = [spline(λ_ref_min) for spline in self.splines]
+        weighted_ref = a21 * L_ref + a22 * M_ref + a33 * S_ref
+        # Transformation coefficients (a11 and a12 computed by Mathematica):
+        # a1i = (a13 * (1 - x_ref_min) * slope + const_0 - const_1) / denom
+        self.a11_terms = ((M_ref * S_sum - S_ref * M_sum),
+                          (x_ref_min * weighted_ref * M_sum),
+                          ((1 - x_ref_min) * M_ref * V_sum),
+                          ((1 - x_ref_min) * (L_ref * M_sum - M_ref * L_sum)))
+        self.a12_terms = ((L_ref * S_sum - S_ref * L_sum),
+                          (x_ref_min * weighted_ref * L_sum),
+                          ((1 - x_ref_min) * L_ref * V_sum),
+                          ((1 - x_ref_min) * (M_ref * L_sum - L_ref * M_sum)))
+        self.λ_ref_min = λ_ref_min
+
+    def full(self, a13):
+        """
+        Evaluate the objective function with all results.
+
+        Parameters
+        ----------
+        a13 : float or ndarray
+            Parameter to optimise (float or 1x1 array).
+
+        Returns
+        -------
+        err : float
+            Computed error.
+        trans_mat : ndarray
+            Transformation matrix.
+        λ_test_min : float
+            argmin(x(λ)).
+        ok : bool
+            Hit the correct minimum wavelength.
+        """
+        a13 = np.ravel(a13)[0]
+        (slope, const_0, const_1, denom) = self.a11_terms
+        a11 = ((a13 * (1 - self.x_ref_min) * slope) + const_0 - const_1) / denom
+        (slope, const_0, const_1, denom) = self.a12_terms
+        a12 = ((a13 * (1 - self.x_ref_min) * slope) + const_0 - const_1) / denom
+        a11 = my_round(a11, 8)
+        a12 = my_round(a12, 8)
+        a13 = my_round(a13, 8)
+        trans_mat = np.array([[a11, a12, a13],
+                              [self.a21, self.a22, 0],
+                              [0, 0, self.a33]], dtype=float)
+        (X, Y, Z) = sign_figs(np.dot(trans_mat, self.LMS), 7)
+        sumXYZ = X + Y + Z
+        xyz = np.array([X / sumXYZ, Y / sumXYZ, Z / sumXYZ])
+        err = ((xyz - self.xyz_ref_trunk)**2).sum()
+        λ_test_min = self.λ_main[xyz[0, :].argmin()]
+        ok = (λ_test_min == self.λ_ref_min)
+        if not ok:
+            err = err + np.inf
+        return (err, trans_mat, λ_test_min, ok)
+
+    def __call__(self, a13):
+        """
+        Evaluate the objective function (for the optimiser).
+
+        Parameters
+        ----------
+        a13 : float or ndarray
+            Parameter to optimise (float or 1x1 array).
+
+        Returns
+        -------
+        err : float
+            Computed error.
+        """
+        return self.full(a13)[0]
+
+
 def square_sum(a13, a21, a22, a33, L_spline, M_spline, S_spline, V_spline,
                λ, λ_ref_min, xyz_ref, full_results=False):
     """
@@ -678,55 +1218,312 @@ def square_sum(a13, a21, a22, a33, L_spline, M_spline, S_spline, V_spline,
     ok : bool
         Hit the correct minimum wavelength.
     """
-    # Stripping reference values in accordance with CIE2006 tables
-    xyz_ref_trunk = xyz_ref[30:, 1:].T
-    x_ref_min = xyz_ref_trunk[0, :].min()
-    # Transformation coefficients (a11 and a12 computed by Mathematica)
-    a11 = (((a13 * (1 - x_ref_min) *
-             (M_spline(λ_ref_min) * S_spline(λ).sum() -
-              S_spline(λ_ref_min) * M_spline(λ).sum())) +
-            (x_ref_min *
-             (a21 * L_spline(λ_ref_min) + a22 * M_spline(λ_ref_min) +
-              a33 * S_spline(λ_ref_min)) * M_spline(λ).sum()) -
-            ((1 - x_ref_min) * M_spline(λ_ref_min) * V_spline(λ).sum())) /
-           ((1 - x_ref_min) *
-            (L_spline(λ_ref_min) * M_spline(λ).sum() -
-             M_spline(λ_ref_min) * L_spline(λ).sum())))
-    a12 = (((a13 * (1 - x_ref_min) *
-             (L_spline(λ_ref_min) * S_spline(λ).sum() -
-              S_spline(λ_ref_min) * L_spline(λ).sum())) +
-            (x_ref_min *
-             (a21 * L_spline(λ_ref_min) + a22 * M_spline(λ_ref_min) +
-              a33 * S_spline(λ_ref_min)) * L_spline(λ).sum()) -
-            ((1 - x_ref_min) * L_spline(λ_ref_min) * V_spline(λ).sum())) /
-           ((1 - x_ref_min) *
-            (M_spline(λ_ref_min) * L_spline(λ).sum() -
-             L_spline(λ_ref_min) * M_spline(λ).sum())))
-    a11 = my_round(a11[0], 8)
-    a12 = my_round(a12[0], 8)
-    a13 = my_round(a13[0], 8)
-    trans_mat = np.array([[a11, a12, a13], [a21, a22, 0], [0, 0, a33]])
-    LMS = np.array([L_spline(np.arange(390, 831)),
-                    M_spline(np.arange(390, 831)),
-                    S_spline(np.arange(390, 831))])
-    (X, Y, Z) = sign_figs(np.dot(trans_mat, LMS), 7)
-    sumXYZ = X + Y + Z
-    xyz = np.array([X / sumXYZ, Y / sumXYZ, Z / sumXYZ])
-    err = ((xyz - xyz_ref_trunk)**2).sum()
-    λ_test_min = np.arange(390, 831)[xyz[0, :].argmin()]
-    ok = (λ_test_min == λ_ref_min)
-    if not ok:
-        err = err + np.inf
+    objective = A13Objective(a21, a22, a33,
+                             L_spline, M_spline, S_spline, V_spline,
+                             λ, xyz_ref, λ_ref_min)
     if full_results:
-        return (err, trans_mat, λ_test_min, ok)
+        return objective.full(a13)
     else:
-        return err
+        return objective(a13)
+
+
+def solve_a13(a21, a22, a33, L_spline, M_spline, S_spline, V_spline,
+              λ, xyz_ref, λ_x_min_ref=502, a13_start=0.39):
+    """
+    Determine the element a13 in the (non-renormalized) transformation
+    matrix of the linear transformation LMS --> XYZ by minimising square_sum.
+
+    The Nelder–Mead simplex method is used as in the original tabulations,
+    restarted with the wavelength of minimum x found until it is consistent.
+    The invariants of square_sum are evaluated once per solve (see
+    A13Objective), so that the results are identical to the original ones.
+
+    Parameters
+    ----------
+    a21, a22, a33 : float
+        Parameters in matrix for LMS to XYZ conversion.
+    L_spline, M_spline, S_spline, V_spline: InterpolatedUnivariateSpline LMS and V(λ).
+    λ : ndarray
+        λ values according to chosen step size.
+    xyz_ref : ndarray
+        Reference xyz chromaticity coordinates at 1 nm steps.
+    λ_x_min_ref : float
+        Initial guess for the wavelength of minimum x.
+    a13_start : float
+        Initial guess for a13.
+
+    Returns
+    -------
+    trans_mat : ndarray
+        Non-renormalized transformation matrix.
+    info : dict
+        Convergence diagnostics: a13 (non-rounded), λ_x_min_ref,
+        λ_x_min_ref_tried, iterations, function_evaluations, error and
+        converged.
+    """
+    info = {'λ_x_min_ref_tried': [],
+            'iterations': 0,
+            'function_evaluations': 0}
+    objective = A13Objective(a21, a22, a33,
+                             L_spline, M_spline, S_spline, V_spline,
+                             λ, xyz_ref)
+    ok = False
+    while not ok:
+        info['λ_x_min_ref_tried'].append(λ_x_min_ref)
+        objective.set_reference(λ_x_min_ref)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            (a13, fopt, nit, nfev, warnflag) = scipy.optimize.fmin(
+                objective, a13_start,
+                xtol=10**(-(10)), disp=False,  # exp: -(mat_dp + 2) = -10
+                full_output=True)
+        info['iterations'] += nit
+        info['function_evaluations'] += nfev
+        (err, trans_mat, λ_x_min_ref, ok) = objective.full(a13)
+    info['a13'] = a13[0]
+    info['λ_x_min_ref'] = λ_x_min_ref
+    info['error'] = err
+    info['converged'] = bool(ok)
+    return (trans_mat, info)
+
+
+class WarmStartStore:
+    """
+    Store of solutions of solve_a13, reused when an observer is computed
+    again, e.g., when a GUI user steps back to a previous age, or in a later
+    run of a parameter sweep with the store saved to disk.
+
+    Only the solution of the same observer is reused, so that the results
+    are identical to those of a cold start: square_sum is piecewise constant
+    on the scale of the rounding of the matrix, and started from the
+    solution of a neighbouring observer the solver ends up in a different
+    local minimum. The solution of the nearest observer is still available
+    through nearest.
+    """
+
+    # Typical ranges of the parameters, used for scaling the distance
+    FIELD_SIZE_RANGE = 9.
+    AGE_RANGE = 60.
+
+    def __init__(self, filename=None):
+        """
+        Initialise the store, loading it from file if the file exists.
+
+        Parameters
+        ----------
+        filename : string
+            Name of JSON file for persistence.
+        """
+        self.filename = filename
+        self._entries = dict()
+        self._lock = threading.Lock()
+        if filename is not None and os.path.exists(filename):
+            self.load(filename)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(field_size, age):
+        """
+        Return the key of an observer, rounded as the parameters of the
+        stages (see _rounded_parameter).
+        """
+        return (_rounded_parameter(float(field_size)),
+                _rounded_parameter(float(age)))
+
+    def record(self, field_size, age, a13, λ_x_min_ref, trans_mat):
+        """
+        Record the solution for the given observer.
+
+        Parameters
+        ----------
+        field_size : float
+            Field size in degrees.
+        age : float
+            Age in years.
+        a13 : float
+            The (non-rounded) solution of solve_a13.
+        λ_x_min_ref : float
+            The wavelength of minimum x for the solution.
+        trans_mat : ndarray
+            The non-renormalized transformation matrix.
+        """
+        with self._lock:
+            self._entries[self._key(field_size, age)] = (
+                float(a13), float(λ_x_min_ref),
+                np.array(trans_mat, dtype=float))
+
+    def lookup(self, field_size, age):
+        """
+        Return the transformation matrix recorded for the given observer.
+
+        Parameters
+        ----------
+        field_size : float
+            Field size in degrees.
+        age : float
+            Age in years.
+
+        Returns
+        -------
+        trans_mat : ndarray or None
+            The non-renormalized transformation matrix, or None if the
+            observer has not been recorded.
+        """
+        with self._lock:
+            entry = self._entries.get(self._key(field_size, age))
+        return None if entry is None else entry[2].copy()
+
+    def nearest(self, field_size, age):
+        """
+        Return the solution of the nearest recorded observer.
+
+        Parameters
+        ----------
+        field_size : float
+            Field size in degrees.
+        age : float
+            Age in years.
+
+        Returns
+        -------
+        start : tuple or None
+            (a13, λ_x_min_ref) of the nearest observer, or None if the store
+            is empty.
+        """
+        with self._lock:
+            if not self._entries:
+                return None
+            keys = np.array(list(self._entries.keys()))
+            dist = (((keys[:, 0] - field_size) / self.FIELD_SIZE_RANGE)**2 +
+                    ((keys[:, 1] - age) / self.AGE_RANGE)**2)
+            return self._entries[tuple(keys[dist.argmin()])][:2]
+
+    def save(self, filename=None):
+        """
+        Save the store as JSON.
+
+        Parameters
+        ----------
+        filename : string
+            Name of file. Defaults to the file given at initialisation.
+        """
+        filename = filename or self.filename
+        with self._lock:
+            entries = [[fs, age, a13, λ_x_min_ref, trans_mat.tolist()]
+                       for ((fs, age), (a13, λ_x_min_ref, trans_mat))
+                       in sorted(self._entries.items())]
+        with open(filename, 'w') as f:
+            json.dump(entries, f)
+
+    def load(self, filename=None):
+        """
+        Load (and merge) solutions from a JSON file written by save.
+
+        Parameters
+        ----------
+        filename : string
+            Name of file. Defaults to the file given at initialisation.
+        """
+        filename = filename or self.filename
+        with open(filename) as f:
+            entries = json.load(f)
+        for (fs, age, a13, λ_x_min_ref, trans_mat) in entries:
+            self.record(fs, age, a13, λ_x_min_ref, trans_mat)
 
 
 # =============================================================================
 # Specific functions concerning purple-line stimuli
 # =============================================================================
 
+def _purple_line_indices_delaunay(points):
+    """
+    Find the purple line from the convex hull of a Delaunay triangulation.
+
+    This is the original O(n log n) implementation, kept as a fallback for
+    spectrum loci that are not simple curves and as the reference for the
+    benchmark in benchmarks/purple_line.py.
+
+    Parameters
+    ----------
+    points : ndarray
+        The spectral chromaticity points (2-D), in wavelength order.
+
+    Returns
+    -------
+    (i_B, i_R) : tuple of int
+        The indices of the short- and long-wavelength points of tangency.
+    """
+    hull = Delaunay(points).convex_hull
+    ind = np.argmax(np.abs(hull[:, 0] - hull[:, 1]))
+    return (int(min(hull[ind])), int(max(hull[ind])))
+
+
+def purple_line_indices(points):
+    """
+    Find the points of tangency of the purple line with the spectrum locus.
+
+    The purple line is the edge of the convex hull of the spectrum locus
+    that joins the hull vertices of lowest and highest wavelength. Since
+    the points are ordered by wavelength, it can be found without
+    computing the full hull: the two points of the locus that are extreme
+    along the chord between its end points are hull vertices that split
+    the hull into the part passing along the body of the locus and the
+    part containing the purple line. The latter is narrowed down by
+    repeatedly taking the point farthest outside the current line (as in
+    quickhull), keeping only the sub-chain containing the jump in
+    wavelength. Each step works on the points outside the previous line
+    only, so the total work is linear in the number of points.
+
+    If the locus is not a simple curve (a point of the body turns up
+    outside the current line, or the final line does not support all the
+    points), the Delaunay-based search is used instead.
+
+    Parameters
+    ----------
+    points : ndarray
+        The spectral chromaticity points (2-D), in wavelength order.
+
+    Returns
+    -------
+    (i_B, i_R) : tuple of int
+        The indices of the short- and long-wavelength points of tangency.
+    """
+    n = len(points)
+
+    def outside(a, b, ind):
+        # Signed area of (points[a], points[b], points[ind])
+        ab = points[b] - points[a]
+        ap = points[ind] - points[a]
+        return ab[0] * ap[:, 1] - ab[1] * ap[:, 0]
+
+    proj = points.dot(points[-1] - points[0])
+    i_B = int(np.argmin(proj))
+    i_R = int(np.argmax(proj))
+    if i_B + 1 >= i_R:
+        return _purple_line_indices_delaunay(points)
+    # orient so that the body of the locus has negative signed area
+    orientation = -np.sign(np.sum(outside(i_R, i_B, np.arange(i_B + 1, i_R))))
+    candidates = np.r_[0:i_B, i_R + 1:n]
+    while len(candidates):
+        dist = orientation * outside(i_R, i_B, candidates)
+        beyond = dist > 0
+        if not beyond.any():
+            break
+        k = int(candidates[beyond][np.argmax(dist[beyond])])
+        if k > i_R:
+            i_R = k
+        elif k < i_B:
+            i_B = k
+        else:
+            return _purple_line_indices_delaunay(points)
+        candidates = candidates[beyond]
+    if np.any(orientation * outside(i_R, i_B, np.arange(n)) > 0):
+        return _purple_line_indices_delaunay(points)
+    return (i_B, i_R)
+
+
 def tangent_points_purple_line(chrom_coords_λ, MacLeod_Boynton=False,
                                tristimulus_λ=None,):
     """
@@ -759,29 +1556,27 @@ def tangent_points_purple_line(chrom_coords_λ, MacLeod_Boynton=False,
     """
     cc = chrom_coords_λ
     if MacLeod_Boynton:
-        delaunay = Delaunay(cc[:, 1:4:2])
+        (i_B, i_R) = purple_line_indices(cc[:, 1:4:2])
     else:
-        delaunay = Delaunay(cc[:, 1:3])
-    ind = np.argmax(np.abs(
-        delaunay.convex_hull[:, 0] - delaunay.convex_hull[:, 1]))
+        (i_B, i_R) = purple_line_indices(cc[:, 1:3])
     cc_tg_purple = np.zeros((2, 3))  # initialise for in-place editing
     if MacLeod_Boynton:
-        cc_tg_purple[0, 0] = cc[delaunay.convex_hull[ind, 0], 0]
-        cc_tg_purple[0, 1] = cc[delaunay.convex_hull[ind, 0], 1]
-        cc_tg_purple[0, 2] = cc[delaunay.convex_hull[ind, 0], 3]
-        cc_tg_purple[1, 0] = cc[delaunay.convex_hull[ind, 1], 0]
-        cc_tg_purple[1, 1] = cc[delaunay.convex_hull[ind, 1], 1]
-        cc_tg_purple[1, 2] = cc[delaunay.convex_hull[ind, 1], 3]
+        cc_tg_purple[0, 0] = cc[i_B, 0]
+        cc_tg_purple[0, 1] = cc[i_B, 1]
+        cc_tg_purple[0, 2] = cc[i_B, 3]
+        cc_tg_purple[1, 0] = cc[i_R, 0]
+        cc_tg_purple[1, 1] = cc[i_R, 1]
+        cc_tg_purple[1, 2] = cc[i_R, 3]
     else:
-        cc_tg_purple[0, :3] = cc[delaunay.convex_hull[ind, 0], :3]
-        cc_tg_purple[1, :3] = cc[delaunay.convex_hull[ind, 1], :3]
+        cc_tg_purple[0, :3] = cc[i_B, :3]
+        cc_tg_purple[1, :3] = cc[i_R, :3]
     if tristimulus_λ is None:
         return cc_tg_purple
     else:
         ts = tristimulus_λ
         ts_tg_purple = np.zeros((2, 4))  # initialise for in-place editing
-        ts_tg_purple[0, :4] = ts[delaunay.convex_hull[ind, 0], :4]
-        ts_tg_purple[1, :3] = ts[delaunay.convex_hull[ind, 1], :3]
+        ts_tg_purple[0, :4] = ts[i_B, :4]
+        ts_tg_purple[1, :3] = ts[i_R, :3]
         return (cc_tg_purple, ts_tg_purple)
 
 
@@ -812,30 +1607,33 @@ def XYZ_purples(xyz_λ, xyz_E, XYZ_tg_purple_line):
     (x_E, y_E) = xyz_E[:2]
     (X_B, Y_B, Z_B) = XYZ_tg_purple_line[0, 1:]  # short-wavelength terminus
     (X_R, Y_R, Z_R) = XYZ_tg_purple_line[1, 1:]  # long-wavelength terminus
-    XYZ_λc = []
-    inside = False
-    for i in range(len(xyz_λ[:, 0])):
-        λc = my_round(xyz_λ[i, 0], 1)
-        if (λc > my_round(XYZ_tg_purple_line[0, 0], 1) and
-                λc < my_round(XYZ_tg_purple_line[1, 0], 1)):
-            (x, y) = xyz_λ[i, 1:3]
-            # Parameter for the convex linear combination of the tristimulus
-            # values of the stimuli represented at the purple-line termini
-            # (determined by Mathematica):
-            α = (1 /
-                 (1 - ((y - y_E) * X_B - (x - x_E) * Y_B +
-                       (x * y_E - y * x_E) * (X_B + Y_B + Z_B)) /
-                  ((y - y_E) * X_R - (x - x_E) * Y_R +
-                   (x * y_E - y * x_E) * (X_R + Y_R + Z_R))))
-            if α >= 0 and α <= 1:
-                inside = True
-                X = α * X_B + (1 - α) * X_R
-                Y = α * Y_B + (1 - α) * Y_R
-                Z = α * Z_B + (1 - α) * Z_R
-                XYZ_λc.append([λc, X, Y, Z])
-            elif inside:
-                break
-    return np.array(XYZ_λc)
+    λc = my_round(xyz_λ[:, 0], 1)
+    in_range = ((λc > my_round(XYZ_tg_purple_line[0, 0], 1)) &
+                (λc < my_round(XYZ_tg_purple_line[1, 0], 1)))
+    (x, y) = (xyz_λ[:, 1], xyz_λ[:, 2])
+    # Parameter for the convex linear combination of the tristimulus
+    # values of the stimuli represented at the purple-line termini
+    # (determined by Mathematica):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        α = (1 /
+             (1 - ((y - y_E) * X_B - (x - x_E) * Y_B +
+                   (x * y_E - y * x_E) * (X_B + Y_B + Z_B)) /
+              ((y - y_E) * X_R - (x - x_E) * Y_R +
+               (x * y_E - y * x_E) * (X_R + Y_R + Z_R))))
+    inside = in_range & (α >= 0) & (α <= 1)
+    if not inside.any():
+        return np.array([])
+    # Keep the first contiguous run of in-range wavelengths with α in [0, 1]
+    # (in-range wavelengths outside [0, 1] after the run end it)
+    first = np.argmax(inside)
+    outside = np.nonzero(in_range[first:] & ~inside[first:])[0]
+    if len(outside):
+        inside[first + outside[0]:] = False
+    α = α[inside]
+    return np.array([λc[inside],
+                     α * X_B + (1 - α) * X_R,
+                     α * Y_B + (1 - α) * Y_R,
+                     α * Z_B + (1 - α) * Z_R]).T
 
 
 # =============================================================================
@@ -1095,7 +1893,8 @@ def compute_Maxwellian_diagram(LMS_spec, LMS_plot):
 
 def compute_XYZ(L_spline, M_spline, S_spline, V_spline,
                 LMS_spec, LMS_plot, LMS_all,
-                LM_weights, xyz_reference):
+                LM_weights, xyz_reference, diagnostics=None,
+                trans_mat=None):
     """
     Compute the CIE cone-fundamental-based XYZ tristimulus functions.
 
@@ -1126,6 +1925,11 @@ def compute_XYZ(L_spline, M_spline, S_spline, V_spline,
         The spectral chromaticity coordinates of the reference system
         (obtained by shape-morphing (interpolation) between the CIE 1931
         standard and the CIE 1964 standard).
+    diagnostics : dict
+        If given, updated with the convergence diagnostics of solve_a13.
+    trans_mat : ndarray
+        If given, the non-renormalized transformation matrix, e.g., from an
+        ObserverAtlas or a WarmStartStore, used instead of solving for it.
 
     Returns
     -------
@@ -1168,24 +1972,13 @@ def compute_XYZ(L_spline, M_spline, S_spline, V_spline,
     V_main = sign_figs(a21 * L_main + a22 * M_main, 7)
     a33 = my_round(V_main.sum() / S_main.sum(), 8)
     # Compute optimised non-renormalised transformation matrix
-    λ_x_min_ref = 502
-    ok = False
-    while not ok:
-        with warnings.catch_warnings():
-            warnings.simplefilter('ignore')
-            a13 = scipy.optimize.fmin(
-                square_sum, 0.39, (a21, a22, a33,
-                                   L_spline, M_spline, S_spline,
-                                   V_spline,
-                                   λ_main, λ_x_min_ref,
-                                   xyz_ref, False),
-                xtol=10**(-(10)), disp=False)  # exp: -(mat_dp + 2) = -10 
-        trans_mat, λ_x_min_ref, ok = (
-            square_sum(a13, a21, a22, a33, 
-                       L_spline, M_spline, S_spline, 
-                       V_spline, 
-                       λ_main, λ_x_min_ref, 
-                       xyz_ref, True)[1:])        
+    if trans_mat is None:
+        (trans_mat, solver_info) = solve_a13(a21, a22, a33,
+                                             L_spline, M_spline, S_spline,
+                                             V_spline,
+                                             λ_main, xyz_ref)
+        if diagnostics is not None:
+            diagnostics.update(solver_info)
     # Compute renormalized transformation matrix
     (λ_spec,
      X_exact_spec,
@@ -1679,110 +2472,447 @@ def compute_CIE_std_xy_diagram(XYZ31_standard, XYZ31_plot,
 
 
 # =============================================================================
-# Main function for derivation and tabulation of visual data
-# (for tables, plots and descriptions)
+# Parameter-independent CIE standards (computed once per process)
 # =============================================================================
 
-def compute_tabulated(field_size, age, λ_min=390, λ_max=830, λ_step=1):
+_CIE_standards = None
+
+
+def _read_only(arr):
     """
-    Compute tabulated quantities for given field size and age, at specified
-    wavlength steps, within specified wavelength domain.
+    Mark an array as read-only, for sharing between computations.
 
     Parameters
     ----------
-    field_size : float
-        Field size in degrees.
-    age : float
-        Age in years.
-    λ_min : float
-        Lower limit of wavelength domain.
-    λ_max : float
-        Upper limit of wavelength domain.
-    λ_step : float
-        steps of tabulated results in nm.
+    arr : ndarray
+        The array to be protected against in-place editing.
 
     Returns
     -------
-    results : dict
-        All results: LMS, logLMS, LMS_base, logLMS_base,
-        norm_coeffs_lms_mb, lms_mb, lms_mb_white, lms_mb_tg_purple,
-        norm_coeffs_lms_mw, lms_mw, lms_mw_white, lms_mw_tg_purple,
-        trans_mat, XYZ, trans_mat_N, XYZ_N, xyz, xyz_white,
-        xyz_tg_purple, XYZ_tg_purple, xyz_N, xyz_white_N,
-        xyz_tg_purple_N, XYZ_tg_purple_N, XYZ_purples, XYZ_purples_N,
-        xyz_purples, xyz_purples_N, XYZ31, XYZ64, xyz31, xyz31_white,
-        xyz31_tg_purple, xyz64, xyz64_white, xyz64_tg_purple,
-        field_size, age, λ_min, λ_max, λ_step, λ_purple_min,
-        λ_purple_max, λ_purple_min_N, λ_purple_max_N
-    plots : dict
-        Versions for plotting: LMS_base, logLMS_base, lms_mb,
-        lms_mb_white, lms_mb_tg_purple, lms_mw, lms_mw_white,
-        lms_mw_tg_purple, XYZ, XYZ_N, xyz, xyz_white,
-        xyz_tg_purple, XYZ_tg_purple, xyz_N, xyz_white_N,
-        xyz_tg_purple_N, XYZ_tg_purple_N, XYZ_purples,
-        XYZ_purples_N, xyz_purples, xyz_purples_N, XYZ31, XYZ64,
-        xyz31, xyz31_tg_purple, xyz64, xyz64_tg_purple, field_size,
-        age, λ_min, λ_max, λ_step, λ_purple_min, λ_purple_max,
-        λ_purple_min_N, λ_purple_max_N
+    arr : ndarray
+        The same array, no longer writeable.
     """
+    arr.setflags(write=False)
+    return arr
 
-    # =======================================================================
-    # Initialise result and plot directories for stacking of computed values
-    # =======================================================================
-
-    results = dict()
-    plots = dict()
 
-    # =======================================================================
-    # Create initial data arrays
-    # =======================================================================
+def CIE_standards():
+    """
+    Compute the CIE 1931 and CIE 1964 standard results for tables, plots and
+    descriptions.
 
-    # '_base' : 9 sign. figs.
-    # '_std'  : standard number of sign. figs./decimal places
-    # '_all'  : values given at 0.1 nm steps from 390 nm to 830 nm
-    # '_main' : values given at 1 nm steps from 390 nm to 830 nm
-    # '_spec' : values given at specified wavelengths
-    # '_plot' : values given at 0.1 nm steps within specified domain
+    The results do not depend on field size, age or wavelength domain, and
+    are therefore computed on the first call only. The returned mappings and
+    arrays are read-only, and shared between all calls.
 
-    # wavelength arrays:
+    Returns
+    -------
+    results : mappingproxy
+        XYZ31, XYZ64, xyz31, xyz31_white, xyz31_tg_purple, xyz64,
+        xyz64_white, xyz64_tg_purple
+    plots : mappingproxy
+        Versions for plotting: XYZ31, XYZ64, xyz31, xyz31_tg_purple, xyz64,
+        xyz64_tg_purple
+    """
+    global _CIE_standards
+    if _CIE_standards is not None:
+        return _CIE_standards
 
-    λ_all = my_round(np.arange(390., 830. + .01, .1), 1)
-    λ_spec = np.arange(λ_min, λ_max + .01, λ_step)
-    λ_max = λ_spec[-1]
-    λ_plot = my_round(np.arange(λ_min, λ_max + .01, .1), 1)
+    results = dict()
+    plots = dict()
 
-    # LMS arrays:
+    # NB!
+    # '_main  here means values given at 1 nm steps from 360 nm to 830 nm.
+    # '_plot' here means values given at 0.1 nm steps from 360 nm to 830 nm.
 
-    # LMS-base values (9 sign.figs.) at 0.1 nm steps from 390 nm to 830 nm;
-    # wavelengths in first column
-    LMS_base_all = LMS_energy(field_size, age, base=True)[0]
-    # LMS values (6 sign.figs.) at 0.1 nm steps from 390 nm to 830 nm;
-    # wavelengths in first column
-    LMS_std_all = LMS_energy(field_size, age)[0]
+    # - CIE 1931 standard XYZ spectral tristimulus values (7 sign.figs.);
+    #   wavelengths in first column
+    # - CIE 1964 standard XYZ spectral tristimulus values (7 sign.figs.);
+    #   wavelengths in first column
+    (XYZ31_std_main,
+     XYZ31_plot,
+     XYZ64_std_main,
+     XYZ64_plot) = compute_CIE_standard_XYZ(
+         VisualData.XYZ31.copy(), VisualData.XYZ64.copy())
 
-    # Vλ and weighting factors of the L and M cone fundamentals:
+    results['XYZ31'] = chop(XYZ31_std_main)
+    results['XYZ64'] = chop(XYZ64_std_main)
+    plots['XYZ31'] = chop(XYZ31_plot)
+    plots['XYZ64'] = chop(XYZ64_plot)
 
-    # - Cone-fundamental-based V(λ) values (7 sign. figs.) at 0.1 nm steps
-    #   from 390 nm to 830 nm; wavelengths in first column
-    # - Weights of L and M cone fundamentals in V(λ) synthesis
-    (Vλ_std_all, LM_weights) = Vλ_energy_and_LM_weights(field_size, age)
+    # - CIE 1931 standard xyz spectral chromaticity
+    #   coordinates (5 decimal places);
+    #   wavelengths in first column
+    # - CIE 1931 standard chromaticity coordinates
+    #   (5 decimal places) of Illuminant E
+    # - CIE 1931 standard chromaticity coordinates (5 decimal places)
+    #   for the purple line's points of tangency with the spectrum locus;
+    #   wavelengths in first column
+    # - Ditto CIE 1964
+    # - Versions for plotting
+    (xyz31_std,
+     xyz31_E,
+     xyz31_tg_purple,
+     xyz31_plot,
+     xyz31_tg_purple_plot,
+     xyz64_std,
+     xyz64_E,
+     xyz64_tg_purple,
+     xyz64_plot,
+     xyz64_tg_purple_plot) = compute_CIE_std_xy_diagram(
+         results['XYZ31'], results['XYZ31'],
+         plots['XYZ31'], plots['XYZ64'])
+
+    results['xyz31'] = chop(xyz31_std)
+    results['xyz31_white'] = xyz31_E
+    results['xyz31_tg_purple'] = chop(xyz31_tg_purple)
+    results['xyz64'] = chop(xyz64_std)
+    results['xyz64_white'] = xyz64_E
+    results['xyz64_tg_purple'] = chop(xyz64_tg_purple)
+    plots['xyz31'] = chop(xyz31_plot)
+    plots['xyz31_tg_purple'] = chop(xyz31_tg_purple_plot)
+    plots['xyz64'] = chop(xyz64_plot)
+    plots['xyz64_tg_purple'] = chop(xyz64_tg_purple_plot)
+
+    for arr in list(results.values()) + list(plots.values()):
+        _read_only(arr)
+    _CIE_standards = (types.MappingProxyType(results),
+                      types.MappingProxyType(plots))
+    return _CIE_standards
+
+
+# =============================================================================
+# Dependency graph of the stages of compute_tabulated
+# =============================================================================
+
+# Each stage of compute_tabulated, in order of computation, with the stages
+# whose results it needs.
+STAGE_DEPENDENCIES = collections.OrderedDict([
+    ('LMS', ()),
+    ('LMS_base', ()),
+    ('lms_mb', ('LMS_base',)),
+    ('lms_mw', ('LMS_base',)),
+    ('XYZ', ('LMS_base',)),
+    ('xyz', ('XYZ',)),
+    ('XYZ_purples', ('xyz',)),
+    ('xyz_purples', ('XYZ_purples',)),
+    ('CIE_standards', ()),
+])
+
+# The keys of the results and plots directories computed by each stage
+STAGE_OUTPUTS = {
+    'LMS': ('LMS', 'logLMS'),
+    'LMS_base': ('LMS_base', 'logLMS_base'),
+    'lms_mb': ('norm_coeffs_lms_mb', 'lms_mb', 'lms_mb_white',
+               'lms_mb_tg_purple'),
+    'lms_mw': ('norm_coeffs_lms_mw', 'lms_mw', 'lms_mw_white',
+               'lms_mw_tg_purple'),
+    'XYZ': ('trans_mat', 'XYZ', 'trans_mat_N', 'XYZ_N'),
+    'xyz': ('xyz', 'xyz_white', 'xyz_tg_purple', 'XYZ_tg_purple',
+            'xyz_N', 'xyz_white_N', 'xyz_tg_purple_N', 'XYZ_tg_purple_N'),
+    'XYZ_purples': ('XYZ_purples', 'XYZ_purples_N', 'λ_purple_min',
+                    'λ_purple_max', 'λ_purple_min_N', 'λ_purple_max_N'),
+    'xyz_purples': ('xyz_purples', 'xyz_purples_N'),
+    'CIE_standards': ('XYZ31', 'XYZ64', 'xyz31', 'xyz31_white',
+                      'xyz31_tg_purple', 'xyz64', 'xyz64_white',
+                      'xyz64_tg_purple'),
+}
+
+
+def required_stages(outputs=None):
+    """
+    Determine the stages of compute_tabulated needed for the given outputs.
+
+    Parameters
+    ----------
+    outputs : iterable of str
+        Keys of the results directory (e.g. 'lms_mb_white') or names of
+        stages (e.g. 'CIE_standards'). None means everything.
+
+    Returns
+    -------
+    stages : list of str
+        The required stages, including all their prerequisites, in order
+        of computation.
+    """
+    if outputs is None:
+        return list(STAGE_DEPENDENCIES)
+    if isinstance(outputs, str):
+        outputs = [outputs]
+    needed = set()
+    pending = []
+    for output in outputs:
+        if output in STAGE_DEPENDENCIES:
+            pending.append(output)
+            continue
+        for (stage, keys) in STAGE_OUTPUTS.items():
+            if output in keys:
+                pending.append(stage)
+                break
+        else:
+            raise ValueError('Unknown output: %r' % (output,))
+    while pending:
+        stage = pending.pop()
+        if stage not in needed:
+            needed.add(stage)
+            pending.extend(STAGE_DEPENDENCIES[stage])
+    return [stage for stage in STAGE_DEPENDENCIES if stage in needed]
+
+
+# =============================================================================
+# Tracing of the steps of compute_tabulated
+# =============================================================================
+
+# The steps of compute_tabulated, in order of computation. Steps that are not
+# needed for the requested outputs are skipped, and not traced.
+STEPS = ('LMS_energy', 'Vλ_synthesis', 'splines', 'compute_LMS',
+         'compute_MacLeod_Boynton_diagram', 'compute_Maxwellian_diagram',
+         'xyz_interpolated_reference_system', 'compute_XYZ',
+         'compute_xy_diagram', 'purples', 'CIE_standards')
+
+# Registered tracers, see add_tracer
+_tracers = []
+
+
+def add_tracer(tracer):
+    """
+    Register a tracer of the steps of compute_tabulated.
+
+    A tracer is an object with the methods begin(step) and end(step, info),
+    called before and after each step (see STEPS), in the thread running
+    compute_tabulated. info is a dict with
+
+    - 'seconds': the wall-clock time of the step
+    - 'allocated_bytes': the net memory allocated by the step, and
+      'peak_bytes': its peak allocation, if tracemalloc is tracing
+      (otherwise None)
+    - 'iterations' and 'function_evaluations' of the optimisation, for the
+      compute_XYZ step
+
+    When no tracer is registered, the steps are neither timed nor measured.
+    """
+    if tracer not in _tracers:
+        _tracers.append(tracer)
+
+
+def remove_tracer(tracer):
+    """
+    Unregister a tracer registered with add_tracer.
+    """
+    if tracer in _tracers:
+        _tracers.remove(tracer)
+
+
+class _NullStepTracer:
+    """
+    Step tracer used when no tracer is registered: does nothing.
+    """
+
+    def start(self, step):
+        pass
+
+    def annotate(self, **info):
+        pass
+
+
+_null_step_tracer = _NullStepTracer()
+
+
+class _StepTracer:
+    """
+    Trace consecutive steps of a computation, ending the current step when
+    the next one starts.
+    """
+
+    def __init__(self, tracers):
+        self.tracers = tuple(tracers)
+        self.step = None
+        self.info = None
+        self.start_time = None
+        self.start_bytes = None
+
+    def start(self, step):
+        """
+        End the current step (if any) and start the given one (None to stop).
+        Starting the current step again continues it.
+        """
+        if step == self.step:
+            return
+        now = time.perf_counter()
+        if self.step is not None:
+            self.info['seconds'] = now - self.start_time
+            if self.start_bytes is not None and tracemalloc.is_tracing():
+                (current, peak) = tracemalloc.get_traced_memory()
+                self.info['allocated_bytes'] = current - self.start_bytes
+                self.info['peak_bytes'] = max(peak - self.start_bytes, 0)
+            for tracer in self.tracers:
+                tracer.end(self.step, self.info)
+        self.step = step
+        if step is not None:
+            self.info = {'seconds': None, 'allocated_bytes': None,
+                         'peak_bytes': None}
+            for tracer in self.tracers:
+                tracer.begin(step)
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                self.start_bytes = tracemalloc.get_traced_memory()[0]
+            else:
+                self.start_bytes = None
+            self.start_time = time.perf_counter()
+
+    def annotate(self, **info):
+        """
+        Add information to that reported at the end of the current step.
+        """
+        self.info.update(info)
+
+
+# =============================================================================
+# Main function for derivation and tabulation of visual data
+# (for tables, plots and descriptions)
+# =============================================================================
+
+def compute_tabulated(field_size, age, λ_min=390, λ_max=830, λ_step=1,
+                      warm_start=None, outputs=None, atlas=None):
+    """
+    Compute tabulated quantities for given field size and age, at specified
+    wavlength steps, within specified wavelength domain.
+
+    Parameters
+    ----------
+    field_size : float
+        Field size in degrees.
+    age : float
+        Age in years.
+    λ_min : float
+        Lower limit of wavelength domain.
+    λ_max : float
+        Upper limit of wavelength domain.
+    λ_step : float
+        steps of tabulated results in nm.
+    warm_start : WarmStartStore
+        If given, the transformation matrix recorded for the observer is
+        used instead of solving for it, and new solutions are recorded.
+    outputs : iterable of str
+        The quantities needed (keys of results, or stage names, see
+        STAGE_DEPENDENCIES). Only the stages producing them and their
+        prerequisites are computed and returned, e.g. outputs=['LMS']
+        skips the XYZ optimisation and the purple line. None (default)
+        computes everything.
+    atlas : ObserverAtlas
+        If given, and the observer is on its grid, the XYZ transformation
+        matrix (and the LMS and V(λ) functions, if stored) are taken from
+        the atlas instead of being computed; see load_observer_atlas. The
+        atlas takes precedence over warm_start, which is neither used nor
+        updated for the observers on the grid.
+
+    Returns
+    -------
+    results : dict
+        All results: LMS, logLMS, LMS_base, logLMS_base,
+        norm_coeffs_lms_mb, lms_mb, lms_mb_white, lms_mb_tg_purple,
+        norm_coeffs_lms_mw, lms_mw, lms_mw_white, lms_mw_tg_purple,
+        trans_mat, XYZ, trans_mat_N, XYZ_N, xyz, xyz_white,
+        xyz_tg_purple, XYZ_tg_purple, xyz_N, xyz_white_N,
+        xyz_tg_purple_N, XYZ_tg_purple_N, XYZ_purples, XYZ_purples_N,
+        xyz_purples, xyz_purples_N, XYZ31, XYZ64, xyz31, xyz31_white,
+        xyz31_tg_purple, xyz64, xyz64_white, xyz64_tg_purple,
+        field_size, age, λ_min, λ_max, λ_step, λ_purple_min,
+        λ_purple_max, λ_purple_min_N, λ_purple_max_N
+    plots : dict
+        Versions for plotting: LMS_base, logLMS_base, lms_mb,
+        lms_mb_white, lms_mb_tg_purple, lms_mw, lms_mw_white,
+        lms_mw_tg_purple, XYZ, XYZ_N, xyz, xyz_white,
+        xyz_tg_purple, XYZ_tg_purple, xyz_N, xyz_white_N,
+        xyz_tg_purple_N, XYZ_tg_purple_N, XYZ_purples,
+        XYZ_purples_N, xyz_purples, xyz_purples_N, XYZ31, XYZ64,
+        xyz31, xyz31_tg_purple, xyz64, xyz64_tg_purple, field_size,
+        age, λ_min, λ_max, λ_step, λ_purple_min, λ_purple_max,
+        λ_purple_min_N, λ_purple_max_N
+    """
+
+    # =======================================================================
+    # Initialise result and plot directories for stacking of computed values
+    # =======================================================================
+
+    results = dict()
+    plots = dict()
+    stages = required_stages(outputs)
+    tracer = _StepTracer(_tracers) if _tracers else _null_step_tracer
+    entry = None if atlas is None else atlas.lookup(field_size, age)
+    from_atlas = entry is not None and 'LMS_base' in entry.dtype.names
+
+    # =======================================================================
+    # Create initial data arrays
+    # =======================================================================
+
+    # '_base' : 9 sign. figs.
+    # '_std'  : standard number of sign. figs./decimal places
+    # '_all'  : values given at 0.1 nm steps from 390 nm to 830 nm
+    # '_main' : values given at 1 nm steps from 390 nm to 830 nm
+    # '_spec' : values given at specified wavelengths
+    # '_plot' : values given at 0.1 nm steps within specified domain
+
+    # wavelength arrays:
+
+    λ_all = my_round(np.arange(390., 830. + .01, .1), 1)
+    λ_spec = np.arange(λ_min, λ_max + .01, λ_step)
+    λ_max = λ_spec[-1]
+    λ_plot = my_round(np.arange(λ_min, λ_max + .01, .1), 1)
+
+    # LMS arrays:
+
+    # LMS-base values (9 sign.figs.) at 0.1 nm steps from 390 nm to 830 nm;
+    # wavelengths in first column
+    tracer.start('LMS_energy')
+    if 'LMS_base' in stages:
+        if from_atlas:
+            LMS_base_all = np.array(entry['LMS_base'])
+        else:
+            LMS_base_all = LMS_energy(field_size, age, base=True)[0]
+    # LMS values (6 sign.figs.) at 0.1 nm steps from 390 nm to 830 nm;
+    # wavelengths in first column
+    if 'LMS' in stages:
+        if from_atlas:
+            LMS_std_all = np.array(entry['LMS'])
+        else:
+            LMS_std_all = LMS_energy(field_size, age)[0]
+
+    # Vλ and weighting factors of the L and M cone fundamentals:
+
+    # - Cone-fundamental-based V(λ) values (7 sign. figs.) at 0.1 nm steps
+    #   from 390 nm to 830 nm; wavelengths in first column
+    # - Weights of L and M cone fundamentals in V(λ) synthesis
+    need_Vλ = 'lms_mb' in stages or 'XYZ' in stages
+    if need_Vλ:
+        tracer.start('Vλ_synthesis')
+        if from_atlas:
+            (Vλ_std_all, LM_weights) = (np.array(entry['V']),
+                                        tuple(entry['LM_weights']))
+        else:
+            (Vλ_std_all, LM_weights) = Vλ_energy_and_LM_weights(field_size,
+                                                                 age)
 
     # =======================================================================
     # Create spline functions
     # =======================================================================
 
+    tracer.start('splines')
     # base:
-    (λ_all, L_base_all, M_base_all, S_base_all) = LMS_base_all.T
-    L_base_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, L_base_all)
-    M_base_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, M_base_all)
-    S_base_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, S_base_all)
+    if 'LMS_base' in stages:
+        (λ_all, L_base_all, M_base_all, S_base_all) = LMS_base_all.T
+        L_base_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, L_base_all)
+        M_base_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, M_base_all)
+        S_base_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, S_base_all)
     # std:
-    (λ_all, L_std_all, M_std_all, S_std_all) = LMS_std_all.T
-    (λ_all, V_std_all) = Vλ_std_all.T
-    L_std_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, L_std_all)
-    M_std_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, M_std_all)
-    S_std_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, S_std_all)
-    V_std_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, V_std_all)
+    if 'LMS' in stages:
+        (λ_all, L_std_all, M_std_all, S_std_all) = LMS_std_all.T
+        L_std_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, L_std_all)
+        M_std_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, M_std_all)
+        S_std_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, S_std_all)
+    if need_Vλ:
+        (λ_all, V_std_all) = Vλ_std_all.T
+        V_std_spline = scipy.interpolate.InterpolatedUnivariateSpline(λ_all, V_std_all)
 
     # =======================================================================
     # Compute the cone-fundamental-based spectral luminous efficiency
@@ -1791,319 +2921,311 @@ def compute_tabulated(field_size, age, λ_min=390, λ_max=830, λ_step=1):
 
     # - Cone-fundamental-based V(λ) values (7 sign. figs.) for specified
     #   wavelengths; wavelengths in first column.
-    Vλ_std_spec = np.array([λ_spec, V_std_spline(λ_spec)]).T
+    if need_Vλ:
+        Vλ_std_spec = np.array([λ_spec, V_std_spline(λ_spec)]).T
 
     # =======================================================================
     # Compute the LMS cone fundamentals (linear and logarithmic values)
     #=======================================================================
-    
-    # - LMS values (7 number of sign. figs.) for specified wavelengths; 
-    #   wavelengths in first column 
-    # - Briggsian logarithm of LMS values (5 decimal places)
-    #   for specified wavelengths; wavelengths in first column
-    (LMS_std_spec,
-     logLMS_std_spec) = compute_LMS(
-         λ_spec, L_std_spline, M_std_spline, S_std_spline)
-    (LMS_std_plot,
-     logLMS_std_plot) = compute_LMS(
-         λ_plot, L_std_spline, M_std_spline, S_std_spline)
-
-    results['LMS'] = chop(LMS_std_spec)
-    results['logLMS'] = chop(logLMS_std_spec)
-    plots['LMS'] = chop(LMS_std_plot)
-    plots['logLMS'] = chop(logLMS_std_plot)
+
+    if 'LMS' in stages:
+
+        tracer.start('compute_LMS')
+        # - LMS values (7 number of sign. figs.) for specified wavelengths;
+        #   wavelengths in first column
+        # - Briggsian logarithm of LMS values (5 decimal places)
+        #   for specified wavelengths; wavelengths in first column
+        (LMS_std_spec,
+         logLMS_std_spec) = compute_LMS(
+             λ_spec, L_std_spline, M_std_spline, S_std_spline)
+        (LMS_std_plot,
+         logLMS_std_plot) = compute_LMS(
+             λ_plot, L_std_spline, M_std_spline, S_std_spline)
+
+        results['LMS'] = chop(LMS_std_spec)
+        results['logLMS'] = chop(logLMS_std_spec)
+        plots['LMS'] = chop(LMS_std_plot)
+        plots['logLMS'] = chop(logLMS_std_plot)
 
     # =======================================================================
     # Compute the LMS-base cone fundamentals (linear and logarithmic values)
     # =======================================================================
 
-    # - LMS-base values (9 sign. figs) for specified wavelengths;
-    #   wavelengths in first column
-    # - Briggsian logarithm of LMS-base values (8 decimal places)
-    #   for specified wavelengths; wavelengths in first column
-    # - Versions for plotting
-    (LMS_base_spec,
-     logLMS_base_spec) = compute_LMS(
-         λ_spec, L_base_spline, M_base_spline, S_base_spline, base=True)
-    (LMS_base_plot,
-     logLMS_base_plot) = compute_LMS(
-         λ_plot, L_base_spline, M_base_spline, S_base_spline, base=True)
-
-    results['LMS_base'] = chop(LMS_base_spec)
-    results['logLMS_base'] = chop(logLMS_base_spec)
-    plots['LMS_base'] = chop(LMS_base_plot)
-    plots['logLMS_base'] = chop(logLMS_base_plot)
+    if 'LMS_base' in stages:
+
+        tracer.start('compute_LMS')
+        # - LMS-base values (9 sign. figs) for specified wavelengths;
+        #   wavelengths in first column
+        # - Briggsian logarithm of LMS-base values (8 decimal places)
+        #   for specified wavelengths; wavelengths in first column
+        # - Versions for plotting
+        (LMS_base_spec,
+         logLMS_base_spec) = compute_LMS(
+             λ_spec, L_base_spline, M_base_spline, S_base_spline, base=True)
+        (LMS_base_plot,
+         logLMS_base_plot) = compute_LMS(
+             λ_plot, L_base_spline, M_base_spline, S_base_spline, base=True)
+
+        results['LMS_base'] = chop(LMS_base_spec)
+        results['logLMS_base'] = chop(logLMS_base_spec)
+        plots['LMS_base'] = chop(LMS_base_plot)
+        plots['logLMS_base'] = chop(logLMS_base_plot)
 
     # =======================================================================
     # Compute the MacLeod‒Boynton ls chromaticity diagram
     # =======================================================================
 
-    # 'mb' denotes MacLeod‒Boynton
-
-    # - normalization coefficients (scaling factor) for calculation of
-    #   the MacLeod‒Boynton lms coordinates
-    # - MacLeod‒Boynton lms values (6 decimal places) for specified
-    #   wavelengths; wavelengths in first column
-    # - MacLeod‒Boynton lms values (6 decimal places) for Illuminant E
-    # - MacLeod‒Boynton lms values (6 decimal places) for the purple line's
-    #   points of tangency with the spectrum locus
-    # - Respective versions for plotting
-    (norm_coeffs_lms_mb,
-    lms_mb_std_spec,
-    lms_mb_std_E,
-    lms_mb_std_tg_purple,
-    lms_mb_plot,
-    lms_mb_E_plot,
-    lms_mb_tg_purple_plot) = compute_MacLeod_Boynton_diagram(
-            results['LMS_base'], plots['LMS_base'], LMS_base_all,
-            Vλ_std_all, Vλ_std_spec, LM_weights)  
-    results['norm_coeffs_lms_mb'] = chop(norm_coeffs_lms_mb)
-    results['lms_mb'] = chop(lms_mb_std_spec)
-    results['lms_mb_white'] = lms_mb_std_E
-    results['lms_mb_tg_purple'] = chop(lms_mb_std_tg_purple)
-    plots['lms_mb'] = chop(lms_mb_plot)
-    plots['lms_mb_white'] = lms_mb_E_plot
-    plots['lms_mb_tg_purple'] = chop(lms_mb_tg_purple_plot)
+    if 'lms_mb' in stages:
+
+        tracer.start('compute_MacLeod_Boynton_diagram')
+        # 'mb' denotes MacLeod‒Boynton
+
+        # - normalization coefficients (scaling factor) for calculation of
+        #   the MacLeod‒Boynton lms coordinates
+        # - MacLeod‒Boynton lms values (6 decimal places) for specified
+        #   wavelengths; wavelengths in first column
+        # - MacLeod‒Boynton lms values (6 decimal places) for Illuminant E
+        # - MacLeod‒Boynton lms values (6 decimal places) for the purple line's
+        #   points of tangency with the spectrum locus
+        # - Respective versions for plotting
+        (norm_coeffs_lms_mb,
+        lms_mb_std_spec,
+        lms_mb_std_E,
+        lms_mb_std_tg_purple,
+        lms_mb_plot,
+        lms_mb_E_plot,
+        lms_mb_tg_purple_plot) = compute_MacLeod_Boynton_diagram(
+                results['LMS_base'], plots['LMS_base'], LMS_base_all,
+                Vλ_std_all, Vλ_std_spec, LM_weights)  
+        results['norm_coeffs_lms_mb'] = chop(norm_coeffs_lms_mb)
+        results['lms_mb'] = chop(lms_mb_std_spec)
+        results['lms_mb_white'] = lms_mb_std_E
+        results['lms_mb_tg_purple'] = chop(lms_mb_std_tg_purple)
+        plots['lms_mb'] = chop(lms_mb_plot)
+        plots['lms_mb_white'] = lms_mb_E_plot
+        plots['lms_mb_tg_purple'] = chop(lms_mb_tg_purple_plot)
 
     # =======================================================================
     # Compute the Maxwellian lm chromaticity diagram
     # =======================================================================
 
-    # 'mw' denotes Maxwellian
-
-    # - normalization coefficients (scaling factors) for calculation of the
-    #   Maxwellian lms coordinates
-    # - Maxwellian lms values (6 decimal places) for specified wavelengths;
-    #   wavelengths in first column
-    # - Maxwellian lms values (6 decimal places) for Illuminant E
-    # - Maxwellian lms values (6 decimal places) for the purple line's
-    #   points of tangency with the spectrum locus
-    # - Respective versions for plotting
-    (norm_coeffs_lms_mw,
-     lms_mw_std_spec,
-     lms_mw_std_E,
-     lms_mw_std_tg_purple,
-     lms_mw_plot,
-     lms_mw_E_plot,
-     lms_mw_tg_purple_plot) = compute_Maxwellian_diagram(
-         results['LMS_base'], plots['LMS_base'])
-
-    results['norm_coeffs_lms_mw'] = chop(norm_coeffs_lms_mw)
-    results['lms_mw'] = chop(lms_mw_std_spec)
-    results['lms_mw_white'] = lms_mw_std_E
-    results['lms_mw_tg_purple'] = chop(lms_mw_std_tg_purple)
-    plots['lms_mw'] = chop(lms_mw_plot)
-    plots['lms_mw_white'] = lms_mw_E_plot
-    plots['lms_mw_tg_purple'] = chop(lms_mw_tg_purple_plot)
+    if 'lms_mw' in stages:
+
+        tracer.start('compute_Maxwellian_diagram')
+        # 'mw' denotes Maxwellian
+
+        # - normalization coefficients (scaling factors) for calculation of the
+        #   Maxwellian lms coordinates
+        # - Maxwellian lms values (6 decimal places) for specified wavelengths;
+        #   wavelengths in first column
+        # - Maxwellian lms values (6 decimal places) for Illuminant E
+        # - Maxwellian lms values (6 decimal places) for the purple line's
+        #   points of tangency with the spectrum locus
+        # - Respective versions for plotting
+        (norm_coeffs_lms_mw,
+         lms_mw_std_spec,
+         lms_mw_std_E,
+         lms_mw_std_tg_purple,
+         lms_mw_plot,
+         lms_mw_E_plot,
+         lms_mw_tg_purple_plot) = compute_Maxwellian_diagram(
+             results['LMS_base'], plots['LMS_base'])
+
+        results['norm_coeffs_lms_mw'] = chop(norm_coeffs_lms_mw)
+        results['lms_mw'] = chop(lms_mw_std_spec)
+        results['lms_mw_white'] = lms_mw_std_E
+        results['lms_mw_tg_purple'] = chop(lms_mw_std_tg_purple)
+        plots['lms_mw'] = chop(lms_mw_plot)
+        plots['lms_mw_white'] = lms_mw_E_plot
+        plots['lms_mw_tg_purple'] = chop(lms_mw_tg_purple_plot)
 
     # =======================================================================
     # Compute the cone-fundamental-based XYZ tristimulus functions
     # =======================================================================
 
-    #  Determine reference diagram
-    xyz_reference = xyz_interpolated_reference_system(
-            field_size, VisualData.XYZ31.copy(), VisualData.XYZ64.copy())
-
-    # - Non-renormalised tranformation matrix (8 decimal placed)
-    # - Non-renormalised CIE cone-fundamental-based XYZ tristimulus
-    #   values (7 sign. figs) for specified wavelengths; wavelengths
-    #   in first column
-    # - version for plotting
-    # - Ditto renormalized
-    (trans_mat_std,
-     XYZ_std_spec,
-     XYZ_plot,
-     trans_mat_std_N,
-     XYZ_std_spec_N,
-     XYZ_plot_N) = compute_XYZ(
-         L_base_spline, M_base_spline, S_base_spline, V_std_spline,
-         results['LMS_base'], plots['LMS_base'], LMS_base_all,
-         LM_weights, xyz_reference)
-
-    results['trans_mat'] = chop(trans_mat_std)
-    results['XYZ'] = chop(XYZ_std_spec)
-    results['trans_mat_N'] = chop(trans_mat_std_N)
-    results['XYZ_N'] = chop(XYZ_std_spec_N)
-    plots['XYZ'] = chop(XYZ_plot)
-    plots['XYZ_N'] = chop(XYZ_plot_N)
+    if 'XYZ' in stages:
+
+        #  Determine reference diagram (not needed with the transformation
+        #  matrix of the atlas)
+        xyz_reference = None
+        if entry is None:
+            tracer.start('xyz_interpolated_reference_system')
+            xyz_reference = xyz_interpolated_reference_system(
+                field_size, VisualData.XYZ31.copy(), VisualData.XYZ64.copy())
+
+        # - Non-renormalised tranformation matrix (8 decimal placed)
+        # - Non-renormalised CIE cone-fundamental-based XYZ tristimulus
+        #   values (7 sign. figs) for specified wavelengths; wavelengths
+        #   in first column
+        # - version for plotting
+        # - Ditto renormalized
+        tracer.start('compute_XYZ')
+        solver_info = dict()
+        if entry is not None:
+            trans_mat_known = np.array(entry['trans_mat'])
+        elif warm_start is not None:
+            trans_mat_known = warm_start.lookup(field_size, age)
+        else:
+            trans_mat_known = None
+        (trans_mat_std,
+         XYZ_std_spec,
+         XYZ_plot,
+         trans_mat_std_N,
+         XYZ_std_spec_N,
+         XYZ_plot_N) = compute_XYZ(
+             L_base_spline, M_base_spline, S_base_spline, V_std_spline,
+             results['LMS_base'], plots['LMS_base'], LMS_base_all,
+             LM_weights, xyz_reference, solver_info, trans_mat_known)
+        tracer.annotate(
+            iterations=solver_info.get('iterations', 0),
+            function_evaluations=solver_info.get('function_evaluations', 0))
+        if warm_start is not None and trans_mat_known is None:
+            warm_start.record(field_size, age,
+                              solver_info['a13'], solver_info['λ_x_min_ref'],
+                              trans_mat_std)
+
+        results['trans_mat'] = chop(trans_mat_std)
+        results['XYZ'] = chop(XYZ_std_spec)
+        results['trans_mat_N'] = chop(trans_mat_std_N)
+        results['XYZ_N'] = chop(XYZ_std_spec_N)
+        plots['XYZ'] = chop(XYZ_plot)
+        plots['XYZ_N'] = chop(XYZ_plot_N)
 
     # =======================================================================
     # Compute the cone-fundamental-based xy chromaticity diagram
     # =======================================================================
 
-    # - Non-renormalised xyz chromaticity coordinates (5 decimal places)
-    #   for specified wavelengths;
-    #   wavelengths in first column
-    # - Non-renormalised xyz chromaticity coordinates (5 decimal places)
-    #   for Illuminant E;
-    # - Non-renormalised xyz chromaticity coordinates (5 decimal places)
-    #   for the purple line's points of tangency with the spectrum locus;
-    #   wavelengths in first column
-    # - Non-renormalised XYZ tristimulus values (7 sign. figs.) for
-    #   the purple line's points of tangency with the spectrum locus;
-    #   wavelengths in first column
-    # - Respective versions for plotting
-    # - Ditto renormalised
-    (xyz_std_spec,
-     xyz_std_E,
-     xyz_std_tg_purple,
-     XYZ_std_tg_purple,
-     xyz_plot,
-     xyz_E_plot,
-     xyz_tg_purple_plot,
-     XYZ_tg_purple_plot,
-     xyz_std_spec_N,
-     xyz_std_E_N,
-     xyz_std_tg_purple_N,
-     XYZ_std_tg_purple_N,
-     xyz_plot_N,
-     xyz_E_plot_N,
-     xyz_tg_purple_plot_N,
-     XYZ_tg_purple_plot_N) = compute_xy_diagram(
-         results['XYZ'], plots['XYZ'], results['XYZ_N'], plots['XYZ_N'])
-
-    results['xyz'] = chop(xyz_std_spec)
-    results['xyz_white'] = xyz_std_E
-    results['xyz_tg_purple'] = chop(xyz_std_tg_purple)
-    results['XYZ_tg_purple'] = chop(XYZ_std_tg_purple)
-    results['xyz_N'] = chop(xyz_std_spec_N)
-    results['xyz_white_N'] = xyz_std_E_N
-    results['xyz_tg_purple_N'] = chop(xyz_std_tg_purple_N)
-    results['XYZ_tg_purple_N'] = chop(XYZ_std_tg_purple_N)
-    plots['xyz'] = chop(xyz_plot)
-    plots['xyz_white'] = xyz_E_plot
-    plots['xyz_tg_purple'] = chop(xyz_tg_purple_plot)
-    plots['XYZ_tg_purple'] = chop(XYZ_tg_purple_plot)
-    plots['xyz_N'] = chop(xyz_plot_N)
-    plots['xyz_white_N'] = xyz_E_plot_N
-    plots['xyz_tg_purple_N'] = chop(xyz_tg_purple_plot_N)
-    plots['XYZ_tg_purple_N'] = chop(XYZ_tg_purple_plot_N)
+    if 'xyz' in stages:
+
+        tracer.start('compute_xy_diagram')
+        # - Non-renormalised xyz chromaticity coordinates (5 decimal places)
+        #   for specified wavelengths;
+        #   wavelengths in first column
+        # - Non-renormalised xyz chromaticity coordinates (5 decimal places)
+        #   for Illuminant E;
+        # - Non-renormalised xyz chromaticity coordinates (5 decimal places)
+        #   for the purple line's points of tangency with the spectrum locus;
+        #   wavelengths in first column
+        # - Non-renormalised XYZ tristimulus values (7 sign. figs.) for
+        #   the purple line's points of tangency with the spectrum locus;
+        #   wavelengths in first column
+        # - Respective versions for plotting
+        # - Ditto renormalised
+        (xyz_std_spec,
+         xyz_std_E,
+         xyz_std_tg_purple,
+         XYZ_std_tg_purple,
+         xyz_plot,
+         xyz_E_plot,
+         xyz_tg_purple_plot,
+         XYZ_tg_purple_plot,
+         xyz_std_spec_N,
+         xyz_std_E_N,
+         xyz_std_tg_purple_N,
+         XYZ_std_tg_purple_N,
+         xyz_plot_N,
+         xyz_E_plot_N,
+         xyz_tg_purple_plot_N,
+         XYZ_tg_purple_plot_N) = compute_xy_diagram(
+             results['XYZ'], plots['XYZ'], results['XYZ_N'], plots['XYZ_N'])
+
+        results['xyz'] = chop(xyz_std_spec)
+        results['xyz_white'] = xyz_std_E
+        results['xyz_tg_purple'] = chop(xyz_std_tg_purple)
+        results['XYZ_tg_purple'] = chop(XYZ_std_tg_purple)
+        results['xyz_N'] = chop(xyz_std_spec_N)
+        results['xyz_white_N'] = xyz_std_E_N
+        results['xyz_tg_purple_N'] = chop(xyz_std_tg_purple_N)
+        results['XYZ_tg_purple_N'] = chop(XYZ_std_tg_purple_N)
+        plots['xyz'] = chop(xyz_plot)
+        plots['xyz_white'] = xyz_E_plot
+        plots['xyz_tg_purple'] = chop(xyz_tg_purple_plot)
+        plots['XYZ_tg_purple'] = chop(XYZ_tg_purple_plot)
+        plots['xyz_N'] = chop(xyz_plot_N)
+        plots['xyz_white_N'] = xyz_E_plot_N
+        plots['xyz_tg_purple_N'] = chop(xyz_tg_purple_plot_N)
+        plots['XYZ_tg_purple_N'] = chop(XYZ_tg_purple_plot_N)
 
     # =======================================================================
     # Compute the cone-fundamental-based XYZ tristimulus functions for
     # purple-line stimuli, as parameterized by complementary wavelength
     # =======================================================================
 
-    # - non-renormalized cone-fundamental-based XYZ tristimulus values
-    #   (7 sign. figs.) of stimuli represented on the purple line,
-    #   parameterized by complementary wavelength;
-    #   complementary wavelengths in first column.
-    # - version for plotting
-    # - Ditto renormalized
-    (XYZ_purples_std_spec,
-     XYZ_purples_plot,
-     XYZ_purples_std_spec_N,
-     XYZ_purples_plot_N) = compute_XYZ_purples(
-         results['xyz'], results['xyz_white'],
-         results['XYZ_tg_purple'],
-         plots['xyz'], plots['xyz_white'], plots['XYZ_tg_purple'],
-         results['xyz_N'], results['xyz_white_N'],
-         results['XYZ_tg_purple_N'],
-         plots['xyz_N'], plots['xyz_white_N'], plots['XYZ_tg_purple_N'])
-
-    results['XYZ_purples'] = chop(XYZ_purples_std_spec)
-    results['XYZ_purples_N'] = chop(XYZ_purples_std_spec_N)
-    plots['XYZ_purples'] = chop(XYZ_purples_plot)
-    plots['XYZ_purples_N'] = chop(XYZ_purples_plot_N)
+    if 'XYZ_purples' in stages:
+
+        tracer.start('purples')
+        # - non-renormalized cone-fundamental-based XYZ tristimulus values
+        #   (7 sign. figs.) of stimuli represented on the purple line,
+        #   parameterized by complementary wavelength;
+        #   complementary wavelengths in first column.
+        # - version for plotting
+        # - Ditto renormalized
+        (XYZ_purples_std_spec,
+         XYZ_purples_plot,
+         XYZ_purples_std_spec_N,
+         XYZ_purples_plot_N) = compute_XYZ_purples(
+             results['xyz'], results['xyz_white'],
+             results['XYZ_tg_purple'],
+             plots['xyz'], plots['xyz_white'], plots['XYZ_tg_purple'],
+             results['xyz_N'], results['xyz_white_N'],
+             results['XYZ_tg_purple_N'],
+             plots['xyz_N'], plots['xyz_white_N'], plots['XYZ_tg_purple_N'])
+
+        results['XYZ_purples'] = chop(XYZ_purples_std_spec)
+        results['XYZ_purples_N'] = chop(XYZ_purples_std_spec_N)
+        plots['XYZ_purples'] = chop(XYZ_purples_plot)
+        plots['XYZ_purples_N'] = chop(XYZ_purples_plot_N)
 
     # =======================================================================
     # Compute cone-fundamental-based xyz chromaticity coordinates for
     # purple-line stimuli, as parameterized by complementary wavelength
     # =======================================================================
 
-    # - non-renormalized cone-fundamental-based xyz chromaticity
-    #   coordinates (5 decimal places) of stimuli represented on
-    #   the purple line, parameterized by complementary wavelength;
-    #   complementary wavelengths in first column.
-    # - version for plotting
-    # - Ditto renormalized
-    (xyz_purples_std_spec,
-     xyz_purples_plot,
-     xyz_purples_std_spec_N,
-     xyz_purples_plot_N) = compute_xyz_purples(
-         results['XYZ_purples'], plots['XYZ_purples'],
-         results['XYZ_purples_N'], plots['XYZ_purples_N'])
-
-    results['xyz_purples'] = chop(xyz_purples_std_spec)
-    results['xyz_purples_N'] = chop(xyz_purples_std_spec_N)
-    plots['xyz_purples'] = chop(xyz_purples_plot)
-    plots['xyz_purples_N'] = chop(xyz_purples_plot_N)
+    if 'xyz_purples' in stages:
+
+        tracer.start('purples')
+        # - non-renormalized cone-fundamental-based xyz chromaticity
+        #   coordinates (5 decimal places) of stimuli represented on
+        #   the purple line, parameterized by complementary wavelength;
+        #   complementary wavelengths in first column.
+        # - version for plotting
+        # - Ditto renormalized
+        (xyz_purples_std_spec,
+         xyz_purples_plot,
+         xyz_purples_std_spec_N,
+         xyz_purples_plot_N) = compute_xyz_purples(
+             results['XYZ_purples'], plots['XYZ_purples'],
+             results['XYZ_purples_N'], plots['XYZ_purples_N'])
+
+        results['xyz_purples'] = chop(xyz_purples_std_spec)
+        results['xyz_purples_N'] = chop(xyz_purples_std_spec_N)
+        plots['xyz_purples'] = chop(xyz_purples_plot)
+        plots['xyz_purples_N'] = chop(xyz_purples_plot_N)
 
     # =======================================================================
-    # Compute the CIE standard XYZ colour-matching functions
+    # Add the CIE standard XYZ colour-matching functions and xy diagrams
     # =======================================================================
 
-    # NB!
-    # '_main  here means values given at 1 nm steps from 360 nm to 830 nm.
-    # '_plot' here means values given at 0.1 nm steps from 360 nm to 830 nm.
+    if 'CIE_standards' in stages:
 
-    # - CIE 1931 standard XYZ spectral tristimulus values (7 sign.figs.);
-    #   wavelengths in first column
-    # - CIE 1964 standard XYZ spectral tristimulus values (7 sign.figs.);
-    #   wavelengths in first column
-    (XYZ31_std_main,
-     XYZ31_plot,
-     XYZ64_std_main,
-     XYZ64_plot) = compute_CIE_standard_XYZ(
-         VisualData.XYZ31.copy(), VisualData.XYZ64.copy())
+        tracer.start('CIE_standards')
+        # - CIE 1931 and CIE 1964 standard XYZ spectral tristimulus values,
+        #   xyz spectral chromaticity coordinates, chromaticity coordinates of
+        #   Illuminant E and of the purple line's points of tangency with the
+        #   spectrum locus, and respective versions for plotting.
+        # - These are independent of the parameters, and are computed once and
+        #   shared (read-only) between all calls.
+        (results_std, plots_std) = CIE_standards()
+        results.update(results_std)
+        plots.update(plots_std)
 
-    results['XYZ31'] = chop(XYZ31_std_main)
-    results['XYZ64'] = chop(XYZ64_std_main)
-    plots['XYZ31'] = chop(XYZ31_plot)
-    plots['XYZ64'] = chop(XYZ64_plot)
-
-    # =======================================================================
-    # Compute the CIE standard xy diagrams
-    # =======================================================================
-
-    # - CIE 1931 standard xyz spectral chromaticity
-    #   coordinates (5 decimal places);
-    #   wavelengths in first column
-    # - CIE 1931 standard chromaticity coordinates
-    #   (5 decimal places) of Illuminant E
-    # - CIE 1931 standard chromaticity coordinates (5 decimal places)
-    #   for the purple line's points of tangency with the spectrum locus;
-    #   wavelengths in first column
-    # - CIE 1931 standard xyz spectral chromaticity
-    #   coordinates (5 decimal places);
-    #   wavelengths in first column
-    # - CIE 1931 standard chromaticity coordinates
-    #   (5 decimal places) of Illuminant E
-    # - CIE 1931 standard chromaticity coordinates (5 decimal places)
-    #   for the purple line's points of tangency with the spectrum locus;
-    #   wavelengths in first column
-    # - Versions for plotting
-
-    (xyz31_std,
-     xyz31_E,
-     xyz31_tg_purple,
-     xyz31_plot,
-     xyz31_tg_purple_plot,
-     xyz64_std,
-     xyz64_E,
-     xyz64_tg_purple,
-     xyz64_plot,
-     xyz64_tg_purple_plot) = compute_CIE_std_xy_diagram(
-         results['XYZ31'], results['XYZ31'],
-         plots['XYZ31'], plots['XYZ64'])
-
-    results['xyz31'] = chop(xyz31_std)
-    results['xyz31_white'] = xyz31_E
-    results['xyz31_tg_purple'] = chop(xyz31_tg_purple)
-    results['xyz64'] = chop(xyz64_std)
-    results['xyz64_white'] = xyz64_E
-    results['xyz64_tg_purple'] = chop(xyz64_tg_purple)
-    plots['xyz31'] = chop(xyz31_plot)
-    plots['xyz31_tg_purple'] = chop(xyz31_tg_purple_plot)
-    plots['xyz64'] = chop(xyz64_plot)
-    plots['xyz64_tg_purple'] = chop(xyz64_tg_purple_plot) 
-    
-    
     #=======================================================================
     # Stack all parameters for results and plots (values from spinboxes,
     # and computed values for purples) in respective directories
     # =======================================================================
 
+    tracer.start(None)
+
     # Assign parameter values for plots
     if np.round(field_size, 5) == np.round(field_size):
         plots['field_size'] = '%.0f' % field_size
@@ -2116,19 +3238,21 @@ def compute_tabulated(field_size, age, λ_min=390, λ_max=830, λ_step=1):
         plots['λ_min'] = '%.0f' % λ_min
         plots['λ_max'] = '%.0f' % λ_max
         plots['λ_step'] = '%.0f' % λ_step
-        plots['λ_purple_min'] = '%.0f' % plots['XYZ_purples'][0, 0]
-        plots['λ_purple_max'] = '%.0f' % plots['XYZ_purples'][-1, 0]
-        plots['λ_purple_min_N'] = '%.0f' % plots['XYZ_purples_N'][0, 0]
-        plots['λ_purple_max_N'] = '%.0f' % plots['XYZ_purples_N'][-1, 0]
+        if 'XYZ_purples' in stages:
+            plots['λ_purple_min'] = '%.0f' % plots['XYZ_purples'][0, 0]
+            plots['λ_purple_max'] = '%.0f' % plots['XYZ_purples'][-1, 0]
+            plots['λ_purple_min_N'] = '%.0f' % plots['XYZ_purples_N'][0, 0]
+            plots['λ_purple_max_N'] = '%.0f' % plots['XYZ_purples_N'][-1, 0]
 
     else:
         plots['λ_min'] = '%.1f' % λ_min
         plots['λ_max'] = '%.1f' % λ_max
         plots['λ_step'] = '%.1f' % λ_step
-        plots['λ_purple_min'] = '%.1f' % plots['XYZ_purples'][0, 0]
-        plots['λ_purple_max'] = '%.1f' % plots['XYZ_purples'][-1, 0]
-        plots['λ_purple_min_N'] = '%.1f' % plots['XYZ_purples_N'][0, 0]
-        plots['λ_purple_max_N'] = '%.1f' % plots['XYZ_purples_N'][-1, 0]
+        if 'XYZ_purples' in stages:
+            plots['λ_purple_min'] = '%.1f' % plots['XYZ_purples'][0, 0]
+            plots['λ_purple_max'] = '%.1f' % plots['XYZ_purples'][-1, 0]
+            plots['λ_purple_min_N'] = '%.1f' % plots['XYZ_purples_N'][0, 0]
+            plots['λ_purple_max_N'] = '%.1f' % plots['XYZ_purples_N'][-1, 0]
 
     # Format parameter-string representations (for description)
     if np.round(field_size, 5) == np.round(field_size):
@@ -2142,18 +3266,20 @@ def compute_tabulated(field_size, age, λ_min=390, λ_max=830, λ_step=1):
         results['λ_min'] = '%.0f' % λ_min
         results['λ_max'] = '%.0f' % λ_max
         results['λ_step'] = '%.0f' % λ_step
-        results['λ_purple_min'] = '%.0f' % results['XYZ_purples'][0, 0]
-        results['λ_purple_max'] = '%.0f' % results['XYZ_purples'][-1, 0]
-        results['λ_purple_min_N'] = '%.0f' % results['XYZ_purples_N'][0, 0]
-        results['λ_purple_max_N'] = ('%.0f' % results['XYZ_purples_N'][-1, 0])
+        if 'XYZ_purples' in stages:
+            results['λ_purple_min'] = '%.0f' % results['XYZ_purples'][0, 0]
+            results['λ_purple_max'] = '%.0f' % results['XYZ_purples'][-1, 0]
+            results['λ_purple_min_N'] = '%.0f' % results['XYZ_purples_N'][0, 0]
+            results['λ_purple_max_N'] = ('%.0f' % results['XYZ_purples_N'][-1, 0])
     else:
         results['λ_min'] = '%.1f' % λ_min
         results['λ_max'] = '%.1f' % λ_max
         results['λ_step'] = '%.1f' % λ_step
-        results['λ_purple_min'] = '%.1f' % results['XYZ_purples'][0, 0]
-        results['λ_purple_max'] = '%.1f' % results['XYZ_purples'][-1, 0]
-        results['λ_purple_min_N'] = '%.1f' % results['XYZ_purples_N'][0, 0]
-        results['λ_purple_max_N'] = ('%.1f' % results['XYZ_purples_N'][-1, 0])
+        if 'XYZ_purples' in stages:
+            results['λ_purple_min'] = '%.1f' % results['XYZ_purples'][0, 0]
+            results['λ_purple_max'] = '%.1f' % results['XYZ_purples'][-1, 0]
+            results['λ_purple_min_N'] = '%.1f' % results['XYZ_purples_N'][0, 0]
+            results['λ_purple_max_N'] = ('%.1f' % results['XYZ_purples_N'][-1, 0])
 
     # =======================================================================
     # Return all results (for tables, plots and descriptions)
@@ -2162,6 +3288,559 @@ def compute_tabulated(field_size, age, λ_min=390, λ_max=830, λ_step=1):
     return (results, plots)
 
 
+# =============================================================================
+# Atlas of precomputed observers
+# =============================================================================
+
+#    The XYZ transformation matrix of an observer requires an optimisation,
+#    which dominates the time of compute_tabulated. For the observers on a
+#    grid of field sizes and ages, the matrices (and optionally the LMS and
+#    V(λ) functions at 0.1 nm steps) are computed once by
+#    build_observer_atlas, and looked up by compute_tabulated(...,
+#    atlas=load_observer_atlas()).
+
+OBSERVER_ATLAS = 'data/observer_atlas.npy'
+OBSERVER_ATLAS_INDEX = 'data/observer_atlas.json'
+
+# Grid of the atlas: (first, last, step)
+ATLAS_FIELD_SIZES = (1., 10., .1)
+ATLAS_AGES = (20, 80, 1)
+
+_observer_atlas = None
+
+
+def _grid_values(grid):
+    """
+    Return the values of a grid (first, last, step) as an array.
+    """
+    (first, last, step) = grid
+    return my_round(np.arange(first, last + step / 2, step), 6)
+
+
+def _atlas_dtype(functions):
+    """
+    Return the record type of the atlas, with or without the functions.
+    """
+    fields = [('trans_mat', '<f8', (3, 3))]
+    if functions:
+        n = len(VisualData.absorbance)
+        fields += [('LMS_base', '<f8', (n, 4)), ('LMS', '<f8', (n, 4)),
+                   ('V', '<f8', (n, 2)), ('LM_weights', '<f8', (2,))]
+    return np.dtype(fields)
+
+
+def _atlas_entry(args):
+    """
+    Compute the atlas record of an observer, given (field_size, age,
+    functions). Runs in the worker processes of build_observer_atlas.
+    """
+    (field_size, age, functions) = args
+    entry = np.zeros((), _atlas_dtype(functions))
+    entry['trans_mat'] = compute_tabulated(field_size, age,
+                                           outputs=['XYZ'])[0]['trans_mat']
+    if functions:
+        entry['LMS_base'] = LMS_energy(field_size, age, base=True)[0]
+        entry['LMS'] = LMS_energy(field_size, age)[0]
+        (Vλ, LM_weights) = Vλ_energy_and_LM_weights(field_size, age)
+        entry['V'] = Vλ
+        entry['LM_weights'] = LM_weights
+    return entry
+
+
+class ObserverAtlas:
+    """
+    Precomputed quantities of the observers on a grid of field sizes and
+    ages, memory-mapped from an atlas file (see build_observer_atlas).
+    """
+
+    def __init__(self, records, field_sizes=ATLAS_FIELD_SIZES,
+                 ages=ATLAS_AGES):
+        """
+        Parameters
+        ----------
+        records : ndarray
+            Structured array of records, ordered by age and then field size.
+        field_sizes, ages : tuple
+            The grids (first, last, step) of the field sizes and ages.
+        """
+        self.records = records
+        self.field_sizes = tuple(field_sizes)
+        self.ages = tuple(ages)
+        self._n_field_sizes = len(_grid_values(field_sizes))
+
+    def _index(self, value, grid):
+        # Index of value in the grid, or None if not on it
+        (first, last, step) = grid
+        i = int(round((value - first) / step))
+        if (0 <= i <= round((last - first) / step) and
+                abs(first + i * step - value) < 1e-6):
+            return i
+        return None
+
+    def lookup(self, field_size, age):
+        """
+        Return the record of an observer, or None if not on the grid.
+        """
+        i = self._index(field_size, self.field_sizes)
+        j = self._index(age, self.ages)
+        if i is None or j is None:
+            return None
+        return self.records[j * self._n_field_sizes + i]
+
+    def observers(self):
+        """
+        Return the (field_size, age) of all the observers of the atlas.
+        """
+        return [(field_size, age)
+                for age in _grid_values(self.ages)
+                for field_size in _grid_values(self.field_sizes)]
+
+
+def build_observer_atlas(field_sizes=ATLAS_FIELD_SIZES, ages=ATLAS_AGES,
+                         functions=False, processes=None):
+    """
+    Compute the observers on the grid into the atlas OBSERVER_ATLAS.
+
+    The records are written as a structured .npy array, ordered by age and
+    then field size. The index OBSERVER_ATLAS_INDEX holds the grid and the
+    checksums of the CSV files of the visual data. Rerun whenever the data
+    or the computation of the transformation matrix change.
+
+    Parameters
+    ----------
+    field_sizes, ages : tuple
+        The grids (first, last, step) of the field sizes and ages.
+    functions : boolean
+        Also store the LMS, LMS-base and V(λ) functions at 0.1 nm steps
+        (about 300 kB per observer) rather than the transformation matrix
+        only.
+    processes : int
+        Number of worker processes (default: number of CPUs).
+    """
+    atlas = ObserverAtlas(None, field_sizes, ages)
+    tasks = [(field_size, age, functions)
+             for (field_size, age) in atlas.observers()]
+    records = np.lib.format.open_memmap(
+        resource_path(OBSERVER_ATLAS + '.tmp'), mode='w+',
+        dtype=_atlas_dtype(functions), shape=(len(tasks),))
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        for (i, entry) in enumerate(executor.map(_atlas_entry, tasks,
+                                                 chunksize=16)):
+            records[i] = entry
+    records.flush()
+    del records
+    os.replace(resource_path(OBSERVER_ATLAS + '.tmp'),
+               resource_path(OBSERVER_ATLAS))
+    index = {'field_sizes': list(field_sizes), 'ages': list(ages),
+             'functions': functions,
+             'csv_checksums': {filename: _file_checksum(filename)
+                               for (name, filename, columns, pad)
+                               in DATA_TABLES}}
+    with open(resource_path(OBSERVER_ATLAS_INDEX), 'w') as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+
+
+def load_observer_atlas():
+    """
+    Map the observer atlas into memory.
+
+    Returns
+    -------
+    atlas : ObserverAtlas
+        The atlas, or None if it is missing or does not match the checksums
+        of the CSV files.
+    """
+    global _observer_atlas
+    if _observer_atlas is not None:
+        return _observer_atlas or None
+    try:
+        with open(resource_path(OBSERVER_ATLAS_INDEX)) as f:
+            index = json.load(f)
+        for (filename, checksum) in index['csv_checksums'].items():
+            if _file_checksum(filename) != checksum:
+                raise ValueError('%s has changed' % filename)
+        records = np.load(resource_path(OBSERVER_ATLAS), mmap_mode='r')
+        _observer_atlas = ObserverAtlas(records, index['field_sizes'],
+                                        index['ages'])
+    except (OSError, ValueError, KeyError) as e:
+        warnings.warn('Observer atlas not used (%s)' % e)
+        _observer_atlas = False
+    return _observer_atlas or None
+
+
+def verify_observer_atlas(atlas=None, sample=20, seed=0):
+    """
+    Check a random sample of the observers of the atlas against the live
+    computation.
+
+    Parameters
+    ----------
+    atlas : ObserverAtlas
+        The atlas (default: load_observer_atlas()).
+    sample : int
+        Number of observers to check (None for all).
+    seed : int
+        Seed of the random sample.
+
+    Returns
+    -------
+    mismatches : list
+        The (field_size, age) of the observers that differ.
+    """
+    if atlas is None:
+        atlas = load_observer_atlas()
+    observers = atlas.observers()
+    if sample is not None and sample < len(observers):
+        rng = np.random.default_rng(seed)
+        observers = [observers[i] for i in
+                     rng.choice(len(observers), sample, replace=False)]
+    mismatches = []
+    for (field_size, age) in observers:
+        recorded = atlas.lookup(field_size, age)
+        computed = _atlas_entry((field_size, age,
+                                 'LMS_base' in recorded.dtype.names))
+        if not all(np.array_equal(recorded[name], computed[name])
+                   for name in recorded.dtype.names):
+            mismatches.append((field_size, age))
+    return mismatches
+
+
+# =============================================================================
+# Batch computation of the LMS cone fundamentals for several observers
+# =============================================================================
+
+#    The functions below are vectorized versions of the functions of age
+#    and/or field size above. The parameters of the observers are given as
+#    one-dimensional arrays, and the results are stacked with the observer
+#    along the first axis, i.e., (observer × wavelength × column).
+
+
+def _observer_arrays(field_sizes, ages):
+    """
+    Broadcast field sizes and ages to one-dimensional arrays of equal length.
+
+    Parameters
+    ----------
+    field_sizes : float or array_like
+        Field sizes in degrees.
+    ages : float or array_like
+        Ages in years.
+
+    Returns
+    -------
+    field_sizes, ages : ndarray
+        One-dimensional arrays of field sizes and ages, one entry per observer.
+    """
+    (field_sizes, ages) = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(field_sizes, dtype=float)),
+        np.atleast_1d(np.asarray(ages, dtype=float)))
+    if field_sizes.ndim != 1:
+        raise ValueError('field_sizes and ages must be one-dimensional')
+    return (field_sizes.copy(), ages.copy())
+
+
+def d_ocular_batch(ages):
+    """
+    Compute the optical density of the ocular media for several ages.
+
+    Parameters
+    ----------
+    ages : array_like
+        Ages in years.
+
+    Returns
+    -------
+    docul : ndarray
+        The computed optical densities of the ocular media, one per age
+        along the first axis; wavelengths in first column.
+    """
+    ages = np.atleast_1d(np.asarray(ages, dtype=float))
+    weights = np.where(ages < 60,
+                       1 + 0.02*(ages - 32),
+                       1.56 + 0.0667*(ages - 60))
+    docul = np.repeat(VisualData.docul2_fine[np.newaxis], len(ages), axis=0)
+    docul[:, :, 1] = (weights[:, np.newaxis] * VisualData.docul1_fine[:, 1] +
+                      VisualData.docul2_fine[:, 1])
+    return docul
+
+
+def absorptance_batch(field_sizes):
+    """
+    Compute the quantal absorptance of the L, M and S cones for several
+    field sizes.
+
+    Parameters
+    ----------
+    field_sizes : array_like
+        Field sizes in degrees.
+
+    Returns
+    -------
+    absorpt : ndarray
+        The computed quantal absorptances of the L, M and S cones, one per
+        field size along the first axis; wavelengths in first column.
+    """
+    field_sizes = np.atleast_1d(np.asarray(field_sizes, dtype=float))
+    LM_max = d_LM_max(field_sizes)[:, np.newaxis]
+    S_max = d_S_max(field_sizes)[:, np.newaxis]
+    absorpt = np.repeat(VisualData.absorbance[np.newaxis],
+                        len(field_sizes), axis=0)  # initialize for editing
+    absorpt[:, :, 1] = 1 - 10**(-LM_max *
+                                10**(VisualData.absorbance[:, 1]))  # L
+    absorpt[:, :, 2] = 1 - 10**(-LM_max *
+                                10**(VisualData.absorbance[:, 2]))  # M
+    absorpt[:, :, 3] = 1 - 10**(-S_max *
+                                10**(VisualData.absorbance[:, 3]))  # S
+    return absorpt
+
+
+def LMS_quantal_batch(field_sizes, ages):
+    """
+    Compute the quantum_based LMS cone fundamentals for several observers.
+
+    Parameters
+    ----------
+    field_sizes : array_like
+        Field sizes in degrees.
+    ages : array_like
+        Ages in years.
+
+    Returns
+    -------
+    LMSq : ndarray
+        The computed quantum_based LMS cone fundamentals, one per observer
+        along the first axis; wavelengths in first column.
+    """
+    (field_sizes, ages) = _observer_arrays(field_sizes, ages)
+    abt = absorptance_batch(field_sizes)
+    docul = d_ocular_batch(ages)
+    mac_max = d_mac_max(field_sizes)[:, np.newaxis]
+    transmit = 10**(-mac_max * VisualData.macula_rel[:, 1] - docul[:, :, 1])
+    LMSq = abt.copy()           # initialise for in-place editing
+    for i in range(1, 4):
+        LMSq[:, :, i] = abt[:, :, i] * transmit
+        LMSq[:, :, i] = (LMSq[:, :, i] /
+                         LMSq[:, :, i].max(axis=1)[:, np.newaxis])
+    return LMSq
+
+
+def LMS_energy_batch(field_sizes, ages, base=False, LMSq=None):
+    """
+    Compute the energy-based LMS cone fundamentals for several observers,
+    with either 9 (base) or 6 (standard) number of significant figures.
+
+    Parameters
+    ----------
+    field_sizes : array_like
+        Field sizes in degrees.
+    ages : array_like
+        Ages in years.
+    base : boolean
+        The returned energy-based LMS cone fundamentals given to the
+        precision of 9 sign. figs. if 'True', and to the precision of
+        6 sign. figs. if 'False'.
+    LMSq : ndarray, optional
+        The quantum_based LMS cone fundamentals of the observers, as
+        returned by LMS_quantal_batch, if already computed.
+
+    Returns
+    -------
+    LMS : ndarray
+        The computed energy-based LMS cone fundamentals, one per observer
+        along the first axis; wavelengths in first column.
+    LMSo_max : ndarray
+        The computed maximum values of the energy-based LMS cone fundamentals
+        before renormalization, one row per observer.
+    """
+    (field_sizes, ages) = _observer_arrays(field_sizes, ages)
+    std_2 = (ages == 32) & (np.round(field_sizes, 1) == 2)
+    std_10 = (ages == 32) & (np.round(field_sizes, 1) == 10)
+    other = ~(std_2 | std_10)
+    LMS = np.empty((len(field_sizes),) + VisualData.absorbance.shape)
+    LMSo_max = np.ones((len(field_sizes), 3))
+    if base:
+        LMS[std_2] = VisualData.LMS2_lin_energy_9_signfig
+        LMS[std_10] = VisualData.LMS10_lin_energy_9_signfig
+    else:                       # if standard
+        LMS[std_2] = VisualData.LMS2_lin_energy_6_signfig
+        LMS[std_10] = VisualData.LMS10_lin_energy_6_signfig
+    if other.any():
+        if LMSq is None:
+            LMSq = LMS_quantal_batch(field_sizes[other], ages[other])
+        else:
+            LMSq = LMSq[other]
+        λ = LMSq[:, :, :1]
+        LMSo = LMSq[:, :, 1:] * λ
+        LMSo_max[other] = LMSo.max(axis=1)
+        LMS_other = LMSq.copy()     # initialise for in-place editing
+        if base:
+            LMS_other[:, :, 1:] = sign_figs(
+                LMSo / LMSo_max[other][:, np.newaxis, :], 9)
+        else:                   # if standard
+            LMS_other[:, :, 1:] = sign_figs(
+                LMSo / LMSo_max[other][:, np.newaxis, :], 6)
+        LMS[other] = LMS_other
+    return (LMS, LMSo_max)
+
+
+def LMS_spline_batch(LMS_all):
+    """
+    Create one spline-interpolation function for the LMS cone fundamentals
+    of several observers.
+
+    All the observers share the same wavelengths, so the cubic splines
+    (with the same not-a-knot end conditions as the
+    InterpolatedUnivariateSpline of compute_tabulated) of all the observers
+    and cones are found by solving one banded system with one right-hand
+    side per observer and cone.
+
+    Parameters
+    ----------
+    LMS_all : ndarray
+        Table of LMS values at 0.1 nm steps from 390 nm to 830 nm, one
+        per observer along the first axis; wavelengths in first column.
+
+    Returns
+    -------
+    LMS_spline : function
+        Spline-interpolation function of the wavelengths, returning an
+        array with the observer along the first axis and the L, M and S
+        cone fundamentals in the columns.
+    """
+    λ_all = LMS_all[0, :, 0]
+    if not (LMS_all[:, :, 0] == λ_all).all():
+        raise ValueError('The observers must share the same wavelengths')
+    spline = scipy.interpolate.make_interp_spline(
+        λ_all, np.moveaxis(LMS_all[:, :, 1:], 0, 1), k=3)
+    return lambda λ: np.moveaxis(spline(λ), 0, 1)
+
+
+def compute_LMS_batch(λ, LMS_spline, base=False):
+    """
+    Compute the LMS cone fundamentals of several observers for given
+    wavelengths, both as linear and logarithmic values to respective
+    specified precisions.
+
+    Parameters
+    ----------
+    λ : ndarray
+        The wavelengths for which the LMS cone fundamentals are to be
+        calculated.
+    LMS_spline : function
+        Spline-interpolation function for the LMS cone fundamentals of the
+        observers (on a linear scale), as returned by LMS_spline_batch.
+    base : boolean
+        The returned energy-based LMS values are given to the precision of
+        9 sign. figs. / 8 decimal points if 'True', and to the precision of
+        6 sign. figs. / 5 decimal points if 'False'.
+
+    Returns
+    -------
+    LMS : ndarray
+        The computed LMS cone fundamentals, one per observer along the
+        first axis; wavelengths in first column.
+    logLMS : ndarray
+        The computed Briggsian logarithms of the LMS cone fundamentals,
+        one per observer along the first axis; wavelengths in first column.
+    """
+    if base:
+        LMS_sf = 9
+        logLMS_dp = 8
+    else:
+        LMS_sf = 6
+        logLMS_dp = 5
+    # Compute linear values
+    LMS_λ = LMS_spline(λ)
+    LMS = np.empty(LMS_λ.shape[:2] + (4,))
+    LMS[:, :, 0] = λ
+    LMS[:, :, 1:] = sign_figs(LMS_λ, LMS_sf)
+    LMS = chop(LMS)
+    # Compute logarithmic values
+    logLMS = LMS.copy()  # initialize for in-line editing
+    logLMS[:, :, 1:][logLMS[:, :, 1:] == 0] = -np.inf
+    logLMS[:, :, 1:][logLMS[:, :, 1:] > 0] = my_round(
+        np.log10(logLMS[:, :, 1:][logLMS[:, :, 1:] > 0]), logLMS_dp)
+    return (LMS, logLMS)
+
+
+def compute_tabulated_batch(field_sizes, ages,
+                            λ_min=390, λ_max=830, λ_step=1):
+    """
+    Compute the tabulated LMS cone fundamentals for several observers at
+    once, at specified wavelength steps, within specified wavelength domain.
+
+    The quantities that depend on age and field size only (absorptance,
+    optical density of the ocular media, quantal and energy-based LMS cone
+    fundamentals) are computed for all observers in one vectorized pass,
+    and so are the spline interpolations of the LMS cone fundamentals.
+    Quantities that require an optimisation or a convex hull per observer
+    (XYZ, xyz, purples, etc.) are not included; use compute_tabulated for
+    those.
+
+    Parameters
+    ----------
+    field_sizes : float or array_like
+        Field sizes in degrees.
+    ages : float or array_like
+        Ages in years (broadcast against field_sizes).
+    λ_min : float
+        Lower limit of wavelength domain.
+    λ_max : float
+        Upper limit of wavelength domain.
+    λ_step : float
+        steps of tabulated results in nm.
+
+    Returns
+    -------
+    results : dict
+        LMS, logLMS, LMS_base, logLMS_base with the observer along the
+        first axis, the intermediate results at 0.1 nm steps from 390 nm
+        to 830 nm d_ocular, absorptance, LMS_quantal, LMS_energy and
+        LMS_energy_base, and the arrays field_size and age.
+    plots : dict
+        Versions for plotting: LMS, logLMS, LMS_base, logLMS_base with the
+        observer along the first axis, and the arrays field_size and age.
+    """
+    (field_sizes, ages) = _observer_arrays(field_sizes, ages)
+    results = dict()
+    plots = dict()
+
+    # wavelength arrays:
+
+    λ_spec = np.arange(λ_min, λ_max + .01, λ_step)
+    λ_max = λ_spec[-1]
+    λ_plot = my_round(np.arange(λ_min, λ_max + .01, .1), 1)
+
+    # Arrays at 0.1 nm steps from 390 nm to 830 nm:
+
+    results['d_ocular'] = d_ocular_batch(ages)
+    results['absorptance'] = absorptance_batch(field_sizes)
+    results['LMS_quantal'] = LMS_quantal_batch(field_sizes, ages)
+    results['LMS_energy_base'] = LMS_energy_batch(
+        field_sizes, ages, base=True, LMSq=results['LMS_quantal'])[0]
+    results['LMS_energy'] = LMS_energy_batch(
+        field_sizes, ages, LMSq=results['LMS_quantal'])[0]
+
+    # LMS and LMS-base cone fundamentals:
+
+    LMS_base_spline = LMS_spline_batch(results['LMS_energy_base'])
+    LMS_std_spline = LMS_spline_batch(results['LMS_energy'])
+    (results['LMS'], results['logLMS']) = compute_LMS_batch(
+        λ_spec, LMS_std_spline)
+    (plots['LMS'], plots['logLMS']) = compute_LMS_batch(
+        λ_plot, LMS_std_spline)
+    (results['LMS_base'], results['logLMS_base']) = compute_LMS_batch(
+        λ_spec, LMS_base_spline, base=True)
+    (plots['LMS_base'], plots['logLMS_base']) = compute_LMS_batch(
+        λ_plot, LMS_base_spline, base=True)
+
+    results['field_size'] = field_sizes
+    results['age'] = ages
+    plots['field_size'] = field_sizes
+    plots['age'] = ages
+    return (results, plots)
+
+
 # ==============================================================================
 # For testing purposes only
 # ==============================================================================
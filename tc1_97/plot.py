@@ -21,12 +21,9 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
 import matplotlib
-import threading
 from matplotlib.ticker import MaxNLocator
 
 
-lock = threading.Lock()
-
 def LMS(axes, plots, options):
     """
     Plot the CIE 2006 LMS cone fundamentals (6 sign.figs.) onto the given axes.
@@ -40,7 +37,6 @@ def LMS(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     axes.clear()
     axes.grid(options['grid'])
     axes.tick_params(labelsize=10)
@@ -79,7 +75,6 @@ def LMS(axes, plots, options):
     else:
         axes.set_title('CIE 2006 LMS cone fundamentals',
                        fontsize=options['title_fontsize'])   
-    lock.release()
 
 
 def LMS_base(axes, plots, options):
@@ -95,7 +90,6 @@ def LMS_base(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     axes.clear()
     axes.grid(options['grid'])
     axes.tick_params(labelsize=10)
@@ -135,7 +129,6 @@ def LMS_base(axes, plots, options):
     else:
         axes.set_title('CIE 2006 LMS cone fundamentals (9 sign. figs. data)',
                        fontsize=options['title_fontsize'])
-    lock.release()
 
 
 def ls_mb(axes, plots, options):
@@ -151,7 +144,6 @@ def ls_mb(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     axes.clear()
     axes.grid(options['grid'])
     axes.tick_params(labelsize=10)
@@ -222,7 +214,6 @@ def ls_mb(axes, plots, options):
     else:
         axes.set_title(u'MacLeod\u2013Boynton ls chromaticity diagram',
                        fontsize=options['title_fontsize'])
-    lock.release()
 
 
 def lm_mw(axes, plots, options):
@@ -238,7 +229,6 @@ def lm_mw(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     axes.clear()
     axes.grid(options['grid'])
     axes.tick_params(labelsize=10)
@@ -310,7 +300,6 @@ def lm_mw(axes, plots, options):
     else:
         axes.set_title('Maxwellian lm chromaticity diagram',
                        fontsize=options['title_fontsize'])
-    lock.release()
     
     
 def XYZ(axes, plots, options):
@@ -327,7 +316,6 @@ def XYZ(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     if options['norm']:
         XYZ = plots['XYZ_N']
     else:
@@ -366,7 +354,6 @@ def XYZ(axes, plots, options):
         axes.set_title('CIE XYZ cone-fundamental-based ' +
                        'tristimulus functions',
                        fontsize=options['title_fontsize'])
-    lock.release()
 
 
 def xy(axes, plots, options):
@@ -383,7 +370,6 @@ def xy(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     if options['norm']:
         xyz = plots['xyz_N']
         xyz_white = plots['xyz_white_N']
@@ -475,7 +461,6 @@ def xy(axes, plots, options):
     else:
         axes.set_title('CIE xy cone-fundamental-based chromaticity diagram',
                        fontsize=options['title_fontsize'])
-    lock.release()
     
     
 def XYZ_purples(axes, plots, options):
@@ -493,7 +478,6 @@ def XYZ_purples(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     if options['norm']:
         XYZ_p = plots['XYZ_purples_N']
     else:
@@ -525,7 +509,6 @@ def XYZ_purples(axes, plots, options):
         axes.set_title('CIE XYZ cone-fundamental-based ' +
                        'tristimulus functions',
                        fontsize=options['title_fontsize'])
-    lock.release()    
     
     
 def xy_purples(axes, plots, options):
@@ -542,7 +525,6 @@ def xy_purples(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     if options['norm']:
         xyz = plots['xyz_N']
         xyz_purples = plots['xyz_purples_N']
@@ -629,7 +611,6 @@ def xy_purples(axes, plots, options):
     else:
         axes.set_title('CIE xy cone-fundamental-based chromaticity diagram',
                        fontsize=options['title_fontsize'])
-    lock.release()
 
 
 def XYZ31(axes, plots, options):
@@ -645,7 +626,6 @@ def XYZ31(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     axes.clear()
     axes.grid(options['grid'])
     axes.tick_params(labelsize=10)
@@ -664,7 +644,6 @@ def XYZ31(axes, plots, options):
     axes.set_title(
         u'CIE 1931 XYZ standard 2\N{DEGREE SIGN} colour-matching functions',
         fontsize=options['title_fontsize'])
-    lock.release()
 
 
 def XYZ64(axes, plots, options):
@@ -680,7 +659,6 @@ def XYZ64(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     axes.clear()
     axes.grid(options['grid'])
     axes.tick_params(labelsize=10)
@@ -699,7 +677,6 @@ def XYZ64(axes, plots, options):
     axes.set_title(
         u'CIE 1964 XYZ standard 10\N{DEGREE SIGN} colour-matching functions',
         fontsize=options['title_fontsize'])
-    lock.release()
 
 
 def xy31(axes, plots, options):
@@ -715,7 +692,6 @@ def xy31(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     axes.clear()
     axes.grid(options['grid'])
     axes.tick_params(labelsize=10)
@@ -757,7 +733,6 @@ def xy31(axes, plots, options):
     axes.set_title(
         u'CIE 1931 xy standard 2\N{DEGREE SIGN} chromaticity diagram',
         fontsize=options['title_fontsize'])
-    lock.release()
 
 
 def xy64(axes, plots, options):
@@ -773,7 +748,6 @@ def xy64(axes, plots, options):
     options : dict
         Plotting options (see code for use).
     """
-    lock.acquire()
     axes.clear()
     axes.grid(options['grid'])
     axes.tick_params(labelsize=10)
@@ -815,4 +789,3 @@ def xy64(axes, plots, options):
     axes.set_title(
         u'CIE 1964 xy standard 10\N{DEGREE SIGN} chromaticity diagram',
         fontsize=options['title_fontsize'])
-    lock.release()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_atlas: Tests of the atlas of precomputed observers of tc1_97.compute.
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+import numpy as np
+
+import tc1_97.compute
+from tc1_97.compute import (WarmStartStore, compute_tabulated,
+                            load_observer_atlas, verify_observer_atlas)
+
+atlas = load_observer_atlas()
+
+# On the grid (including a standard observer), and off the grid
+OBSERVERS = [(2., 32.), (4.5, 61.), (1., 20.), (4.55, 61.)]
+
+
+def assert_results_equal(test, computed, expected):
+    """
+    Assert that two (results, plots) of compute_tabulated are bit-identical.
+    """
+    for (results, reference) in zip(computed, expected):
+        test.assertEqual(sorted(results), sorted(reference))
+        for key in reference:
+            if isinstance(reference[key], np.ndarray):
+                np.testing.assert_array_equal(results[key], reference[key],
+                                              err_msg=key)
+            else:
+                test.assertEqual(results[key], reference[key], key)
+
+
+@unittest.skipIf(atlas is None, 'no observer atlas')
+class ObserverAtlasTest(unittest.TestCase):
+
+    def test_verify_sample(self):
+        self.assertEqual(verify_observer_atlas(atlas, sample=4, seed=1), [])
+
+    def test_lookup(self):
+        self.assertIsNotNone(atlas.lookup(4.5, 61))
+        self.assertIsNone(atlas.lookup(4.55, 61))
+
+    def test_equal_to_computation(self):
+        for observer in OBSERVERS:
+            for domain in ((390, 830, 1), (400, 700, 0.5)):
+                with self.subTest(observer=observer, domain=domain):
+                    assert_results_equal(
+                        self,
+                        compute_tabulated(*(observer + domain), atlas=atlas),
+                        compute_tabulated(*(observer + domain)))
+
+    def test_warm_start(self):
+        warm_start = WarmStartStore()
+        assert_results_equal(
+            self, compute_tabulated(4.5, 61, warm_start=warm_start,
+                                    atlas=atlas),
+            compute_tabulated(4.5, 61))
+        self.assertIsNone(warm_start.nearest(4.5, 61))  # not recorded
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_batch: Tests of tc1_97.compute_tabulated_batch.
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import tc1_97.compute
+from tc1_97.batch import is_done, main, observer_name, run
+
+# Including the standard observers, which use the tabulated LMS functions
+FIELD_SIZES = (1., 2., 4.5, 10., 10.)
+AGES = (20., 32., 57., 32., 75.)
+
+
+class BatchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        (cls.results, cls.plots) = tc1_97.compute.compute_tabulated_batch(
+            FIELD_SIZES, AGES, 400, 700, 0.5)
+
+    def test_equal_to_compute_tabulated(self):
+        for (i, (field_size, age)) in enumerate(zip(FIELD_SIZES, AGES)):
+            (results, plots) = tc1_97.compute.compute_tabulated(
+                field_size, age, 400, 700, 0.5, outputs=['LMS', 'LMS_base'])
+            for key in ('LMS', 'logLMS', 'LMS_base', 'logLMS_base'):
+                np.testing.assert_array_equal(self.results[key][i],
+                                              results[key])
+                np.testing.assert_array_equal(self.plots[key][i], plots[key])
+
+    def test_intermediates(self):
+        for (i, (field_size, age)) in enumerate(zip(FIELD_SIZES, AGES)):
+            np.testing.assert_array_equal(
+                self.results['d_ocular'][i], tc1_97.compute.d_ocular(age))
+            np.testing.assert_array_equal(
+                self.results['absorptance'][i],
+                tc1_97.compute.absorptance(field_size))
+            np.testing.assert_array_equal(
+                self.results['LMS_quantal'][i],
+                tc1_97.compute.LMS_quantal(field_size, age))
+            np.testing.assert_array_equal(
+                self.results['LMS_energy'][i],
+                tc1_97.compute.LMS_energy(field_size, age)[0])
+            np.testing.assert_array_equal(
+                self.results['LMS_energy_base'][i],
+                tc1_97.compute.LMS_energy(field_size, age, base=True)[0])
+
+
+class SweepTest(unittest.TestCase):
+    observers = [(2., 32., 400., 700., 1.), (2., 50., 400., 700., 1.),
+                 (4.5, 61., 400., 700., 1.)]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def filename(self, parameters):
+        return os.path.join(self.directory, observer_name(parameters) + '.npz')
+
+    def test_resume(self):
+        self.assertEqual(run(self.observers[:2], ['LMS'], self.directory,
+                             jobs=1, progress=False), 2)
+        finished = {parameters: os.stat(self.filename(parameters)).st_mtime_ns
+                    for parameters in self.observers[:2]}
+        # Interrupted while writing the third observer: a partial file
+        with open(self.filename(self.observers[2]) + '.tmp', 'wb') as f:
+            f.write(b'PK\x03\x04')
+        self.assertFalse(is_done(self.filename(self.observers[2]), ['LMS']))
+        self.assertEqual(run(self.observers, ['LMS'], self.directory,
+                             jobs=1, progress=False), 1)
+        for (parameters, mtime) in finished.items():
+            self.assertEqual(os.stat(self.filename(parameters)).st_mtime_ns,
+                             mtime)
+        self.assertTrue(is_done(self.filename(self.observers[2]), ['LMS']))
+        self.assertEqual(run(self.observers, ['LMS'], self.directory,
+                             jobs=1, progress=False), 0)
+        # Files lacking outputs are recomputed
+        self.assertFalse(is_done(self.filename(self.observers[0]),
+                                 ['LMS', 'XYZ']))
+        self.assertEqual(run(self.observers, ['LMS', 'XYZ'], self.directory,
+                             jobs=1, progress=False), 3)
+
+    def test_consolidate(self):
+        consolidated = os.path.join(self.directory, 'all.npz')
+        argv = ['-f', '2', '4.5', '-a', '32', '-d', '400:700:1',
+                '--outputs', 'LMS', 'xyz', '-o', self.directory,
+                '-c', consolidated, '-j', '1', '-q']
+        self.assertEqual(main(argv), 0)
+        os.remove(consolidated)
+        self.assertEqual(main(argv), 0)     # from the finished files
+        observers = [(2., 32., 400., 700., 1.), (4.5, 32., 400., 700., 1.)]
+        with np.load(consolidated) as npz:
+            np.testing.assert_array_equal(npz['parameters'], observers)
+            self.assertEqual(len(npz.files), 1 + 2 * len(observers))
+            for parameters in observers:
+                results = tc1_97.compute.compute_tabulated(
+                    *parameters, outputs=['LMS', 'xyz'])[0]
+                for output in ('LMS', 'xyz'):
+                    np.testing.assert_array_equal(
+                        npz[observer_name(parameters) + '/' + output],
+                        results[output])
+
+
+if __name__ == '__main__':
+    unittest.main()
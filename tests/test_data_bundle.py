@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_data_bundle: Tests of the binary data bundle of the tables in
+tc1_97/data.
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+import unittest.mock
+
+import numpy as np
+
+import tc1_97.compute
+from tc1_97.compute import (DATA_TABLES, VisualData, load_data_bundle,
+                            read_csv_file, verify_data_bundle)
+
+
+class DataBundleTest(unittest.TestCase):
+
+    def test_equal_to_csv_files(self):
+        bundle = load_data_bundle()
+        for (name, filename, columns, pad) in DATA_TABLES:
+            with self.subTest(name=name):
+                expected = read_csv_file(filename, pad)
+                if columns is not None:
+                    expected = expected[:, columns]
+                np.testing.assert_array_equal(bundle[name], expected)
+                np.testing.assert_array_equal(getattr(VisualData, name),
+                                              expected)
+
+    def test_verify(self):
+        self.assertEqual(verify_data_bundle(), [])
+
+    def test_load_does_not_read_csv_files(self):
+        def fail(*args):
+            self.fail('CSV file read on load')
+
+        saved = tc1_97.compute._data_bundle
+        try:
+            tc1_97.compute._data_bundle = None
+            with unittest.mock.patch('tc1_97.compute._file_checksum', fail), \
+                    unittest.mock.patch('tc1_97.compute.read_csv_file', fail):
+                tables = load_data_bundle()
+        finally:
+            tc1_97.compute._data_bundle = saved
+        self.assertEqual(sorted(tables),
+                         sorted(name for (name, *_) in DATA_TABLES))
+        self.assertFalse(tables['XYZ31'].flags.writeable)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_jobs: Tests of the background compute jobs of webapi.jobs.
+
+Copyright (C) 2019 Ivar Farup
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+
+import webapi.compute
+import webapi.jobs
+from webapi.jobs import (DONE, FAILED, FileJobStore, JobQueue, MemoryJobStore,
+                         QueueFull)
+
+KEYS = [webapi.compute.result_key(field_size, 40)
+        for field_size in (1, 2, 3, 4)]
+
+
+class BlockedComputation:
+    """
+    Stand-in for webapi.compute.get_results, blocking until released.
+    """
+
+    def __init__(self, error=None):
+        self.release = threading.Event()
+        self.calls = []
+        self.error = error
+
+    def __call__(self, key):
+        self.calls.append(key)
+        if not self.release.wait(10):
+            raise RuntimeError('not released')
+        if self.error is not None:
+            raise self.error
+
+
+class JobQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.computation = BlockedComputation()
+        patcher = unittest.mock.patch('webapi.compute.get_results',
+                                      self.computation)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.computation.release.set)
+
+    def test_dedup(self):
+        queue = JobQueue(max_workers=2)
+        job_id = queue.submit(KEYS[0])
+        self.assertEqual(queue.submit(KEYS[0]), job_id)
+        self.assertNotEqual(queue.submit(KEYS[1]), job_id)
+        self.assertEqual(queue.depth(), 2)
+        self.computation.release.set()
+        self.assertEqual(queue.status(job_id, wait=5)['state'], DONE)
+        self.assertEqual(self.computation.calls.count(KEYS[0]), 1)
+        # finished jobs are not deduplicated
+        self.assertNotEqual(queue.submit(KEYS[0]), job_id)
+
+    def test_queue_full(self):
+        queue = JobQueue(max_workers=1, max_queue=2)
+        job_ids = [queue.submit(KEYS[0]), queue.submit(KEYS[1])]
+        with self.assertRaises(QueueFull):
+            queue.submit(KEYS[2])
+        self.assertEqual(queue.submit(KEYS[1]), job_ids[1])  # deduplicated
+        self.computation.release.set()
+        for job_id in job_ids:
+            self.assertEqual(queue.status(job_id, wait=5)['state'], DONE)
+        self.assertEqual(queue.depth(), 0)
+        queue.submit(KEYS[2])
+
+    def test_long_poll(self):
+        queue = JobQueue()
+        job_id = queue.submit(KEYS[0])
+        start = time.time()
+        self.assertIn(queue.status(job_id, wait=.1)['state'],
+                      (webapi.jobs.QUEUED, webapi.jobs.RUNNING))
+        self.assertGreaterEqual(time.time() - start, .1)
+        threading.Timer(.2, self.computation.release.set).start()
+        job = queue.status(job_id, wait=5)
+        self.assertEqual(job['state'], DONE)
+        self.assertLess(time.time() - start, 5)
+        self.assertIsNotNone(job['finished'])
+        self.assertIsNone(queue.status('0123abcd', wait=.1))
+
+    def test_long_poll_other_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            queue = JobQueue(store=FileJobStore(directory))
+            other = JobQueue(store=FileJobStore(directory))
+            job_id = queue.submit(KEYS[0])
+            threading.Timer(.2, self.computation.release.set).start()
+            self.assertEqual(other.status(job_id, wait=5)['state'], DONE)
+
+    def test_failure(self):
+        self.computation.error = ValueError('secret detail')
+        self.computation.release.set()
+        queue = JobQueue()
+        with self.assertLogs('webapi.jobs', 'ERROR') as logs:
+            job = queue.status(queue.submit(KEYS[0]), wait=5)
+        self.assertEqual(job['state'], FAILED)
+        self.assertNotIn('secret', job['error'])
+        self.assertIn('secret detail', '\n'.join(logs.output))
+        self.assertEqual(queue.depth(), 0)
+
+    def test_store_failure(self):
+        store = MemoryJobStore()
+        queue = JobQueue(store=store)
+        job_id = queue.submit(KEYS[0])
+        with unittest.mock.patch.object(store, 'save',
+                                        side_effect=OSError('disk full')), \
+                self.assertLogs('webapi.jobs', 'ERROR'):
+            self.computation.release.set()
+            queue.status(job_id, wait=5)
+        self.assertEqual(queue.depth(), 0)
+        queue.submit(KEYS[0])  # not stuck in flight
+
+
+class JobStoreTest(unittest.TestCase):
+
+    def job(self, finished):
+        return {'id': os.urandom(8).hex(), 'key': KEYS[0], 'state': DONE,
+                'error': None, 'submitted': 0., 'finished': finished}
+
+    def test_memory_ttl(self):
+        store = MemoryJobStore(ttl=60)
+        old = self.job(time.time() - 61)
+        running = dict(self.job(None), state=webapi.jobs.RUNNING)
+        store.save(old)
+        store.save(running)
+        recent = self.job(time.time())
+        store.save(recent)
+        self.assertIsNone(store.load(old['id']))
+        self.assertEqual(store.load(running['id']), running)
+        self.assertEqual(store.load(recent['id']), recent)
+
+    def test_file_ttl(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = FileJobStore(directory, ttl=60)
+            (old, recent) = (self.job(time.time() - 61), self.job(time.time()))
+            store.save(old)
+            store.save(recent)
+            stale = time.time() - 61
+            os.utime(store._filename(old['id']), (stale, stale))
+            store.prune()
+            self.assertIsNone(store.load(old['id']))
+            self.assertEqual(store.load(recent['id']), recent)
+            self.assertEqual(os.listdir(directory), [recent['id'] + '.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
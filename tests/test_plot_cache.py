@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_plot_cache: Tests of the cache of rendered plots in webapi.plot.
+
+Copyright (C) 2019 Ivar Farup
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+from webapi.plot import PlotCache
+
+
+def key(plot):
+    return PlotCache.key('result', plot, {'grid': 1, 'norm': 0})
+
+
+class PlotCacheTest(unittest.TestCase):
+
+    def test_hit_returns_same_bytes(self):
+        cache = PlotCache(maxbytes=100)
+        payload = '<div>plot</div>'
+        self.assertIsNone(cache.get(key('xyz')))
+        cache.put(key('xyz'), payload)
+        self.assertIs(cache.get(key('xyz')), payload)
+        self.assertEqual(cache.get(PlotCache.key('result', 'xyz',
+                                                 {'norm': 0, 'grid': 1})),
+                         payload)
+        self.assertIsNone(cache.get(PlotCache.key('result', 'xyz',
+                                                  {'grid': 0, 'norm': 0})))
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        self.assertEqual(cache.hit_rate(), .5)
+
+    def test_eviction_order(self):
+        cache = PlotCache(maxbytes=100)
+        for plot in ('a', 'b', 'c'):
+            cache.put(key(plot), plot * 30)
+        self.assertEqual(cache.nbytes, 90)
+        cache.get(key('a'))             # b is now the least recently used
+        cache.put(key('d'), 'd' * 30)
+        self.assertIsNone(cache.get(key('b')))
+        self.assertEqual(cache.nbytes, 90)
+        # A large plot evicts as many of the least recently used as needed
+        cache.put(key('e'), 'e' * 65)
+        self.assertEqual([plot for plot in 'acde' if cache.get(key(plot))],
+                         ['d', 'e'])
+        self.assertEqual(cache.nbytes, 95)
+
+    def test_replace(self):
+        cache = PlotCache(maxbytes=100)
+        cache.put(key('a'), 'a' * 60)
+        cache.put(key('a'), 'A' * 70)
+        self.assertEqual(cache.nbytes, 70)
+        self.assertEqual(cache.get(key('a')), 'A' * 70)
+
+    def test_too_large(self):
+        cache = PlotCache(maxbytes=100)
+        cache.put(key('a'), 'a' * 50)
+        cache.put(key('b'), 'b' * 101)
+        self.assertIsNone(cache.get(key('b')))
+        self.assertEqual(cache.get(key('a')), 'a' * 50)
+        self.assertEqual(cache.nbytes, 50)
+
+    def test_clear(self):
+        cache = PlotCache(maxbytes=100)
+        cache.put(key('a'), 'a' * 50)
+        cache.clear()
+        self.assertIsNone(cache.get(key('a')))
+        self.assertEqual(cache.nbytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
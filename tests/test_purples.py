@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_purples: Tests of the purple-line computations of tc1_97.compute
+against their original implementations.
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+import numpy as np
+
+import tc1_97.compute
+from tc1_97.compute import (XYZ_purples, _purple_line_indices_delaunay,
+                            my_round, purple_line_indices)
+
+OBSERVERS = [(2., 32.), (10., 32.), (1., 20.), (4.5, 57.), (8., 80.)]
+DOMAINS = [(390., 830., 1.), (400., 700., 0.5), (450., 650., 1.),
+           (390., 780., 5.)]
+
+
+def XYZ_purples_loop(xyz_λ, xyz_E, XYZ_tg_purple_line):
+    """
+    The original row-by-row implementation of XYZ_purples.
+    """
+    (x_E, y_E) = xyz_E[:2]
+    (X_B, Y_B, Z_B) = XYZ_tg_purple_line[0, 1:]  # short-wavelength terminus
+    (X_R, Y_R, Z_R) = XYZ_tg_purple_line[1, 1:]  # long-wavelength terminus
+    XYZ_λc = []
+    inside = False
+    for i in range(len(xyz_λ[:, 0])):
+        λc = my_round(xyz_λ[i, 0], 1)
+        if (λc > my_round(XYZ_tg_purple_line[0, 0], 1) and
+                λc < my_round(XYZ_tg_purple_line[1, 0], 1)):
+            (x, y) = xyz_λ[i, 1:3]
+            α = (1 /
+                 (1 - ((y - y_E) * X_B - (x - x_E) * Y_B +
+                       (x * y_E - y * x_E) * (X_B + Y_B + Z_B)) /
+                  ((y - y_E) * X_R - (x - x_E) * Y_R +
+                   (x * y_E - y * x_E) * (X_R + Y_R + Z_R))))
+            if α >= 0 and α <= 1:
+                inside = True
+                X = α * X_B + (1 - α) * X_R
+                Y = α * Y_B + (1 - α) * Y_R
+                Z = α * Z_B + (1 - α) * Z_R
+                XYZ_λc.append([λc, X, Y, Z])
+            elif inside:
+                break
+    return np.array(XYZ_λc)
+
+
+class PurplesTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.computed = dict()
+        for observer in OBSERVERS:
+            for domain in DOMAINS:
+                cls.computed[observer + domain] = (
+                    tc1_97.compute.compute_tabulated(
+                        *(observer + domain),
+                        outputs=['lms_mb', 'lms_mw', 'xyz_purples']))
+
+    def test_purple_line_indices(self):
+        for (parameters, (results, plots)) in self.computed.items():
+            for data in (results, plots):
+                loci = {'xyz': data['xyz'][:, 1:3],
+                        'xyz_N': data['xyz_N'][:, 1:3],
+                        'lms_mb': data['lms_mb'][:, 1:4:2],
+                        'lms_mw': data['lms_mw'][:, 1:3]}
+                for (name, points) in loci.items():
+                    with self.subTest(parameters=parameters, locus=name,
+                                      n=len(points)):
+                        # (i_B, i_R) in wavelength order
+                        self.assertEqual(
+                            purple_line_indices(points),
+                            tuple(sorted(
+                                _purple_line_indices_delaunay(points))))
+
+    def test_purple_line_indices_standard(self):
+        standards = tc1_97.compute.CIE_standards()
+        for name in ('xyz31', 'xyz64'):
+            for data in standards:
+                if name in data:
+                    points = data[name][:, 1:3]
+                    self.assertEqual(
+                        purple_line_indices(points),
+                        tuple(sorted(_purple_line_indices_delaunay(points))))
+
+    def test_XYZ_purples(self):
+        for (parameters, (results, plots)) in self.computed.items():
+            for data in (results, plots):
+                for suffix in ('', '_N'):
+                    with self.subTest(parameters=parameters, suffix=suffix,
+                                      n=len(data['xyz' + suffix])):
+                        arguments = (data['xyz' + suffix],
+                                     data['xyz_white' + suffix],
+                                     data['XYZ_tg_purple' + suffix])
+                        np.testing.assert_array_equal(
+                            XYZ_purples(*arguments),
+                            XYZ_purples_loop(*arguments))
+
+    def test_XYZ_purples_empty(self):
+        (results, plots) = self.computed[OBSERVERS[0] + DOMAINS[0]]
+        tg_purple = results['XYZ_tg_purple'].copy()
+        tg_purple[1, 0] = tg_purple[0, 0]  # no wavelengths in between
+        arguments = (results['xyz'], results['xyz_white'], tg_purple)
+        self.assertEqual(XYZ_purples(*arguments).shape, (0,))
+        self.assertEqual(XYZ_purples_loop(*arguments).shape, (0,))
+
+
+if __name__ == '__main__':
+    unittest.main()
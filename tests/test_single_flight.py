@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_single_flight: Tests of the coalescing of concurrent computations in
+webapi.compute and of its metrics.
+
+Copyright (C) 2019 Ivar Farup
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import concurrent.futures
+import threading
+import time
+import unittest
+import unittest.mock
+
+import webapi.compute
+import webapi.metrics
+from webapi.compute import ResultCache, SingleFlight
+
+CALLERS = 8
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError('timed out')
+        time.sleep(.01)
+
+
+def call_concurrently(function):
+    """
+    Call function from CALLERS threads, and return the futures.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(CALLERS)
+    futures = [executor.submit(function) for _ in range(CALLERS)]
+    executor.shutdown(wait=False)
+    return futures
+
+
+def metric_value(name):
+    for line in webapi.metrics.exposition().splitlines():
+        if line.startswith(name + ' '):
+            return float(line.split()[1])
+    raise KeyError(name)
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def test_one_computation(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(10)
+            return object()
+
+        futures = call_concurrently(lambda: single_flight.do('key', compute))
+        wait_for(lambda: single_flight.coalesced == CALLERS - 1)
+        release.set()
+        values = [future.result(10) for future in futures]
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(single_flight.computations, 1)
+        self.assertTrue(all(value is values[0] for value in values))
+        single_flight.do('key', object)  # the key is released afterwards
+        self.assertEqual(single_flight.computations, 2)
+
+    def test_shared_exception(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def compute():
+            release.wait(10)
+            raise ValueError('failed')
+
+        futures = call_concurrently(lambda: single_flight.do('key', compute))
+        wait_for(lambda: single_flight.coalesced == CALLERS - 1)
+        release.set()
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result(10)
+        self.assertEqual(single_flight.computations, 1)
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def test_concurrent_misses_compute_once(self):
+        cache = ResultCache()
+        key = webapi.compute.result_key(3.3, 33)
+        release = threading.Event()
+        calls = []
+
+        def compute_tabulated(*args, **kwargs):
+            calls.append(args)
+            release.wait(10)
+            return (dict(), dict())
+
+        computations = metric_value(
+            'ciefunctions_single_flight_computations_total')
+        coalesced = metric_value('ciefunctions_single_flight_coalesced_total')
+        with unittest.mock.patch('tc1_97.compute_tabulated',
+                                 compute_tabulated):
+            futures = call_concurrently(lambda: cache.get(key))
+            wait_for(lambda: metric_value(
+                'ciefunctions_single_flight_coalesced_total') ==
+                coalesced + CALLERS - 1)
+            release.set()
+            values = [future.result(10) for future in futures]
+            cache.get(key)
+        self.assertEqual(calls, [(3.3, 33., 390., 830., 1.)])
+        self.assertTrue(all(value is values[0] for value in values))
+        self.assertEqual(metric_value(
+            'ciefunctions_single_flight_computations_total'),
+            computations + 1)
+        self.assertEqual((cache.hits, cache.misses), (1, CALLERS))
+        self.assertEqual(cache.hit_rate(), 1 / (CALLERS + 1))
+
+    def test_metrics(self):
+        cache = webapi.compute.result_cache
+        with unittest.mock.patch.multiple(cache, hits=3, misses=1):
+            self.assertEqual(
+                metric_value('ciefunctions_result_cache_hits_total'), 3)
+            self.assertEqual(
+                metric_value('ciefunctions_result_cache_misses_total'), 1)
+            self.assertEqual(
+                metric_value('ciefunctions_result_cache_hit_ratio'), .75)
+        plot_cache = webapi.plot.plot_cache
+        with unittest.mock.patch.multiple(plot_cache, hits=1, misses=3):
+            self.assertEqual(
+                metric_value('ciefunctions_plot_cache_hit_ratio'), .25)
+
+
+if __name__ == '__main__':
+    unittest.main()
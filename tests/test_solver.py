@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_solver: Tests of the determination of the XYZ transformation matrix
+by tc1_97.compute.solve_a13.
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+import scipy.interpolate
+import scipy.optimize
+
+from tc1_97.compute import (A13Objective, LMS_energy, VisualData,
+                            Vλ_energy_and_LM_weights, WarmStartStore,
+                            compute_tabulated, my_round, sign_figs,
+                            solve_a13, xyz_interpolated_reference_system)
+
+OBSERVERS = [(field_size, age)
+             for field_size in (1., 2., 4.5, 7., 10.)
+             for age in (20., 32., 50., 70., 80.)]
+
+
+def solver_arguments(field_size, age):
+    """
+    Return the positional arguments of solve_a13 for an observer, as in
+    compute_tabulated with the default wavelength domain.
+    """
+    LMS_base_all = LMS_energy(field_size, age, base=True)[0]
+    (Vλ_all, (a21, a22)) = Vλ_energy_and_LM_weights(field_size, age)
+    splines = [scipy.interpolate.InterpolatedUnivariateSpline(
+        LMS_base_all[:, 0], LMS_base_all[:, i]) for i in (1, 2, 3)]
+    splines.append(scipy.interpolate.InterpolatedUnivariateSpline(
+        Vλ_all[:, 0], Vλ_all[:, 1]))
+    (λ_main, L_main, M_main, S_main) = LMS_base_all[::10].T
+    V_main = sign_figs(a21 * L_main + a22 * M_main, 7)
+    a33 = my_round(V_main.sum() / S_main.sum(), 8)
+    xyz_ref = xyz_interpolated_reference_system(
+        field_size, VisualData.XYZ31.copy(), VisualData.XYZ64.copy())
+    return [a21, a22, a33] + splines + [λ_main, xyz_ref]
+
+
+def original_square_sum(a13, a21, a22, a33, L_spline, M_spline, S_spline,
+                        V_spline, λ, λ_ref_min, xyz_ref):
+    """
+    The objective function of the original tabulations, evaluating the
+    splines on every call.
+    """
+    xyz_ref_trunk = xyz_ref[30:, 1:].T
+    x_ref_min = xyz_ref_trunk[0, :].min()
+    (L_ref, M_ref, S_ref) = (L_spline(λ_ref_min), M_spline(λ_ref_min),
+                             S_spline(λ_ref_min))
+    (L_sum, M_sum, S_sum, V_sum) = (L_spline(λ).sum(), M_spline(λ).sum(),
+                                    S_spline(λ).sum(), V_spline(λ).sum())
+    weighted_ref = a21 * L_ref + a22 * M_ref + a33 * S_ref
+    a11 = (((a13 * (1 - x_ref_min) * (M_ref * S_sum - S_ref * M_sum)) +
+            (x_ref_min * weighted_ref * M_sum) -
+            ((1 - x_ref_min) * M_ref * V_sum)) /
+           ((1 - x_ref_min) * (L_ref * M_sum - M_ref * L_sum)))
+    a12 = (((a13 * (1 - x_ref_min) * (L_ref * S_sum - S_ref * L_sum)) +
+            (x_ref_min * weighted_ref * L_sum) -
+            ((1 - x_ref_min) * L_ref * V_sum)) /
+           ((1 - x_ref_min) * (M_ref * L_sum - L_ref * M_sum)))
+    trans_mat = np.array([[my_round(a11[0], 8), my_round(a12[0], 8),
+                           my_round(a13[0], 8)],
+                          [a21, a22, 0], [0, 0, a33]])
+    LMS = np.array([L_spline(np.arange(390, 831)),
+                    M_spline(np.arange(390, 831)),
+                    S_spline(np.arange(390, 831))])
+    (X, Y, Z) = sign_figs(np.dot(trans_mat, LMS), 7)
+    sumXYZ = X + Y + Z
+    xyz = np.array([X / sumXYZ, Y / sumXYZ, Z / sumXYZ])
+    err = ((xyz - xyz_ref_trunk)**2).sum()
+    λ_test_min = np.arange(390, 831)[xyz[0, :].argmin()]
+    ok = (λ_test_min == λ_ref_min)
+    if not ok:
+        err = err + np.inf
+    return (err, trans_mat, λ_test_min, ok)
+
+
+def original_trans_mat(a21, a22, a33, L_spline, M_spline, S_spline,
+                       V_spline, λ, xyz_ref):
+    """
+    The transformation matrix as determined in the original tabulations.
+    """
+    arguments = (a21, a22, a33, L_spline, M_spline, S_spline, V_spline, λ)
+    λ_x_min_ref = 502
+    ok = False
+    while not ok:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            a13 = scipy.optimize.fmin(
+                lambda a13: original_square_sum(
+                    a13, *arguments, λ_x_min_ref, xyz_ref)[0],
+                0.39, xtol=10**(-(10)), disp=False)
+        (_, trans_mat, λ_x_min_ref, ok) = original_square_sum(
+            a13, *arguments, λ_x_min_ref, xyz_ref)
+    return trans_mat
+
+
+class SolveA13Test(unittest.TestCase):
+
+    def test_equal_to_original(self):
+        for observer in OBSERVERS:
+            with self.subTest(observer=observer):
+                arguments = solver_arguments(*observer)
+                (trans_mat, info) = solve_a13(*arguments)
+                self.assertTrue(info['converged'])
+                self.assertEqual(info['λ_x_min_ref'],
+                                 info['λ_x_min_ref_tried'][-1])
+                np.testing.assert_array_almost_equal(
+                    trans_mat, original_trans_mat(*arguments), decimal=8)
+
+    def test_diagnostics(self):
+        arguments = solver_arguments(4.5, 50.)
+        (trans_mat, info) = solve_a13(*arguments)
+        self.assertGreater(info['iterations'], 0)
+        self.assertGreaterEqual(info['function_evaluations'],
+                                info['iterations'])
+        objective = A13Objective(*arguments, λ_ref_min=info['λ_x_min_ref'])
+        (err, expected, _, ok) = objective.full(info['a13'])
+        self.assertTrue(ok)
+        self.assertEqual(info['error'], err)
+        np.testing.assert_array_equal(trans_mat, expected)
+
+
+class WarmStartStoreTest(unittest.TestCase):
+
+    def test_nearest(self):
+        store = WarmStartStore()
+        self.assertIsNone(store.nearest(2., 32.))
+        store.record(2., 30., .39, 502, np.eye(3))
+        store.record(2., 60., .38, 506, np.eye(3))
+        store.record(8., 32., .40, 498, np.eye(3))
+        self.assertEqual(store.nearest(2., 40.), (.39, 502.))
+        self.assertEqual(store.nearest(2.5, 55.), (.38, 506.))
+        # The distance is scaled: 3 degrees weigh as much as 20 years
+        self.assertEqual(store.nearest(5., 50.), (.38, 506.))
+        self.assertEqual(store.nearest(6., 32.), (.40, 498.))
+
+    def test_save_and_load(self):
+        store = WarmStartStore()
+        for (field_size, age) in [(2., 32.), (1.7, 41.3)]:
+            compute_tabulated(field_size, age, outputs=['XYZ'],
+                              warm_start=store)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'warm_start.json')
+            store.save(filename)
+            loaded = WarmStartStore(filename)
+        self.assertEqual(len(loaded), 2)
+        for (field_size, age) in [(2., 32.), (1.7, 41.3)]:
+            self.assertEqual(loaded.nearest(field_size, age),
+                             store.nearest(field_size, age))
+            np.testing.assert_array_equal(loaded.lookup(field_size, age),
+                                          store.lookup(field_size, age))
+        self.assertIsNone(loaded.lookup(1.7, 41.4))
+
+    def test_equal_to_cold_start(self):
+        store = WarmStartStore()
+        for observer in OBSERVERS:
+            with self.subTest(observer=observer):
+                (cold, _) = compute_tabulated(*observer, outputs=['XYZ'])
+                for run in range(2):    # recorded, then reused
+                    (warm, _) = compute_tabulated(*observer, outputs=['XYZ'],
+                                                  warm_start=store)
+                    for key in ('trans_mat', 'XYZ', 'trans_mat_N', 'XYZ_N'):
+                        np.testing.assert_array_equal(warm[key], cold[key],
+                                                      err_msg=key)
+        self.assertEqual(len(store), len(OBSERVERS))
+
+
+if __name__ == '__main__':
+    unittest.main()
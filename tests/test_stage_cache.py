@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_stage_cache: Tests of the caching of the age- and field-size-dependent
+stages in tc1_97.compute.
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+import numpy as np
+
+import tc1_97.compute
+from tc1_97.compute import StageCache, VisualData, stage_cache
+
+
+def assert_results_equal(test, results, expected):
+    """
+    Assert that two results dicts of compute_tabulated are bit-identical.
+    """
+    test.assertEqual(sorted(results), sorted(expected))
+    for key in expected:
+        if isinstance(expected[key], np.ndarray):
+            np.testing.assert_array_equal(results[key], expected[key],
+                                          err_msg=key)
+        else:
+            test.assertEqual(results[key], expected[key], key)
+
+
+class StageCacheTest(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = StageCache(maxsize=4)
+        self.assertEqual(cache.get(('a',), lambda: np.zeros(2))[0], 0)
+        cache.get(('a',), lambda: self.fail('recomputed'))
+        cache.get(('b',), lambda: np.ones(2))
+        self.assertEqual(cache.info(), {'hits': 1, 'misses': 2, 'size': 2,
+                                        'maxsize': 4})
+        cache.clear()
+        self.assertEqual(cache.info(), {'hits': 0, 'misses': 0, 'size': 0,
+                                        'maxsize': 4})
+
+    def test_lru_eviction(self):
+        cache = StageCache(maxsize=2)
+        cache.get(('a',), lambda: 1)
+        cache.get(('b',), lambda: 2)
+        cache.get(('a',), lambda: self.fail('recomputed'))  # b is now LRU
+        cache.get(('c',), lambda: 3)
+        self.assertEqual(cache.info()['size'], 2)
+        self.assertEqual(cache.get(('a',), lambda: None), 1)
+        self.assertIsNone(cache.get(('b',), lambda: None))  # evicted
+        cache.resize(1)
+        self.assertEqual(cache.info()['size'], 1)
+        self.assertIsNone(cache.get(('a',), lambda: None))  # evicted
+
+    def test_maxsize_0(self):
+        cache = StageCache(maxsize=0)
+        cache.get(('a',), lambda: 1)
+        self.assertEqual(cache.get(('a',), lambda: 2), 2)
+        self.assertEqual(cache.info()['size'], 0)
+
+    def test_read_only(self):
+        cache = StageCache()
+        (a, (b, c)) = cache.get(('a',), lambda: (np.zeros(2),
+                                                 (np.zeros(2), 1.)))
+        for array in (a, b):
+            self.assertFalse(array.flags.writeable)
+            with self.assertRaises(ValueError):
+                array[0] = 1
+        stage_cache.clear()
+        self.assertFalse(tc1_97.compute.d_ocular(40).flags.writeable)
+        self.assertFalse(tc1_97.compute.LMS_energy(3, 40)[0].flags.writeable)
+
+
+class MemoizedStageTest(unittest.TestCase):
+
+    def setUp(self):
+        stage_cache.clear()
+
+    def test_key_rounding(self):
+        self.assertEqual(tc1_97.compute._cache_key_item(32 + 1e-12), 32.)
+        self.assertEqual(tc1_97.compute._cache_key_item(np.float64(2)), 2.)
+        tc1_97.compute.d_ocular(40.)
+        tc1_97.compute.d_ocular(40. + 1e-12)
+        self.assertEqual(stage_cache.info()['hits'], 1)
+
+    def test_standard_observer_key_rounding(self):
+        # LMS_energy uses the tabulated functions if age == 32 exactly; the
+        # cached value must not depend on which of two parameters rounding
+        # to the same key was computed first
+        standard = VisualData.LMS2_lin_energy_6_signfig
+        for ages in ((32 + 1e-12, 32), (32, 32 + 1e-12)):
+            stage_cache.clear()
+            for age in ages:
+                np.testing.assert_array_equal(
+                    tc1_97.compute.LMS_energy(2, age)[0], standard)
+        stage_cache.clear()
+        self.assertFalse(np.array_equal(
+            tc1_97.compute.LMS_energy(2, 32 + 1e-6)[0], standard))
+
+    def test_compute_tabulated_cold_and_warm(self):
+        for observer in ((2, 32), (3.7, 58), (10, 32)):
+            stage_cache.clear()
+            cold = tc1_97.compute.compute_tabulated(*observer)
+            self.assertGreater(stage_cache.info()['misses'], 0)
+            warm = tc1_97.compute.compute_tabulated(*observer)
+            self.assertGreater(stage_cache.info()['hits'], 0)
+            for (results, expected) in zip(warm, cold):
+                assert_results_equal(self, results, expected)
+        stage_cache.resize(0)
+        try:
+            uncached = tc1_97.compute.compute_tabulated(3.7, 58)
+        finally:
+            stage_cache.resize(256)
+        stage_cache.clear()
+        cached = tc1_97.compute.compute_tabulated(3.7, 58)
+        for (results, expected) in zip(cached, uncached):
+            assert_results_equal(self, results, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_tracer: Tests of the tracing of the steps of
+tc1_97.compute.compute_tabulated.
+
+Copyright (C) 2012-2020 Ivar Farup and Jan Henrik Wold
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from tc1_97.compute import (STEPS, add_tracer, compute_tabulated,
+                            remove_tracer)
+
+
+class RecordingTracer:
+    """
+    Tracer recording the calls of begin and end.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def begin(self, step):
+        self.events.append(('begin', step))
+
+    def end(self, step, info):
+        self.events.append(('end', step, dict(info)))
+
+    def steps(self):
+        return [event[1] for event in self.events if event[0] == 'begin']
+
+    def info(self, step):
+        return [event[2] for event in self.events
+                if event[0] == 'end' and event[1] == step][0]
+
+
+def trace(*args, **kwargs):
+    """
+    Run compute_tabulated with a RecordingTracer, and return the tracer and
+    the results.
+    """
+    tracer = RecordingTracer()
+    add_tracer(tracer)
+    try:
+        value = compute_tabulated(*args, **kwargs)
+    finally:
+        remove_tracer(tracer)
+    return (tracer, value)
+
+
+class StepTracerTest(unittest.TestCase):
+
+    def test_event_order(self):
+        (tracer, _) = trace(4.5, 61)
+        self.assertEqual(tracer.steps(), list(STEPS))
+        # Each step ends before the next one begins
+        expected = []
+        for step in STEPS:
+            expected += [('begin', step), ('end', step)]
+        self.assertEqual([event[:2] for event in tracer.events], expected)
+        for step in STEPS:
+            self.assertGreaterEqual(tracer.info(step)['seconds'], 0)
+        info = tracer.info('compute_XYZ')
+        self.assertGreater(info['iterations'], 0)
+        self.assertGreaterEqual(info['function_evaluations'],
+                                info['iterations'])
+
+    def test_skipped_steps(self):
+        (tracer, _) = trace(2, 32, outputs=['LMS'])
+        self.assertEqual(tracer.steps(),
+                         ['LMS_energy', 'splines', 'compute_LMS'])
+
+    def test_memory(self):
+        tracemalloc.start()
+        try:
+            (tracer, _) = trace(4.5, 61, outputs=['LMS'])
+        finally:
+            tracemalloc.stop()
+        info = tracer.info('compute_LMS')
+        self.assertIsNotNone(info['allocated_bytes'])
+        self.assertGreaterEqual(info['peak_bytes'], 0)
+
+    def test_unchanged_results(self):
+        for observer in [(2., 32.), (4.5, 61., 400, 700, .5)]:
+            with self.subTest(observer=observer):
+                (_, traced) = trace(*observer)
+                expected = compute_tabulated(*observer)
+                for (results, reference) in zip(traced, expected):
+                    self.assertEqual(sorted(results), sorted(reference))
+                    for key in reference:
+                        if isinstance(reference[key], np.ndarray):
+                            np.testing.assert_array_equal(
+                                results[key], reference[key], err_msg=key)
+                        else:
+                            self.assertEqual(results[key], reference[key],
+                                             key)
+
+    def test_remove(self):
+        tracer = RecordingTracer()
+        add_tracer(tracer)
+        add_tracer(tracer)              # registered once
+        compute_tabulated(2, 32, outputs=['LMS'])
+        remove_tracer(tracer)
+        compute_tabulated(2, 32, outputs=['LMS'])
+        self.assertEqual(tracer.steps(),
+                         ['LMS_energy', 'splines', 'compute_LMS'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class WebConfig(AppConfig):
+	name = 'web'
+
+	def ready(self):
+		from web import warmup
+		warmup.start()
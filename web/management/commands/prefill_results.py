@@ -0,0 +1,46 @@
+"""
+prefill_results: Compute and store the results of common observers.
+
+Usage: python manage.py prefill_results [--field-sizes 2 10] [--ages 20 ...]
+"""
+
+from django.core.management.base import BaseCommand
+
+import tc1_97
+import webapi.compute
+from web.models import ResultStore
+
+
+class Command(BaseCommand):
+	help = 'Compute and store the results of common observers in the Result and Plot tables'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--field-sizes', type=float, nargs='+',
+		                    default=[1., 2., 3., 4., 5., 6., 7., 8., 9., 10.])
+		parser.add_argument('--ages', type=float, nargs='+',
+		                    default=[float(age) for age in range(20, 71, 5)] + [32.])
+		parser.add_argument('--lambda-min', type=float, default=390.)
+		parser.add_argument('--lambda-max', type=float, default=830.)
+		parser.add_argument('--lambda-step', type=float, default=1.)
+		parser.add_argument('--force', action='store_true',
+		                    help='Recompute observers that are already stored')
+
+	def handle(self, *args, **options):
+		store = ResultStore()
+		computed = skipped = 0
+		for field_size in options['field_sizes']:
+			for age in sorted(set(options['ages'])):
+				key = webapi.compute.result_key(field_size, age,
+				                                options['lambda_min'],
+				                                options['lambda_max'],
+				                                options['lambda_step'])
+				if key in store and not options['force']:
+					skipped += 1
+					continue
+				store.set(key, tc1_97.compute_tabulated(
+					*webapi.compute.key_parameters(key),
+					atlas=tc1_97.load_observer_atlas()))
+				computed += 1
+				self.stdout.write('Stored %s' % key)
+		self.stdout.write(self.style.SUCCESS(
+			'%d observers computed, %d already stored' % (computed, skipped)))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Plot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_size', models.FloatField()),
+                ('age', models.FloatField()),
+                ('lambda_min', models.FloatField()),
+                ('lambda_max', models.FloatField()),
+                ('lambda_step', models.FloatField()),
+                ('data', models.BinaryField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('field_size', 'age', 'lambda_min', 'lambda_max', 'lambda_step'), name='unique_plot_parameters')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Result',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_size', models.FloatField()),
+                ('age', models.FloatField()),
+                ('lambda_min', models.FloatField()),
+                ('lambda_max', models.FloatField()),
+                ('lambda_step', models.FloatField()),
+                ('data', models.BinaryField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('field_size', 'age', 'lambda_min', 'lambda_max', 'lambda_step'), name='unique_result_parameters')],
+            },
+        ),
+    ]
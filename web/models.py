@@ -1,32 +1,105 @@
-from django.db import models
+import logging
+
+from django.db import models, DatabaseError, IntegrityError, transaction
+
+import webapi.compute
+import webapi.utils
+
+log = logging.getLogger(__name__)
 
 # Create your models here.
 
+# Results are deterministic, so the models are a memo table of computed
+# results and plots, with one row per observer. The data are the
+# dictionaries returned by tc1_97.compute_tabulated, packed as compressed
+# NumPy .npz.
+
+PARAMETERS = ('field_size', 'age', 'lambda_min', 'lambda_max', 'lambda_step')
+
 class Result(models.Model):
 	field_size = models.FloatField()
-	age = models.IntegerField()
+	age = models.FloatField()
 	lambda_min = models.FloatField()
 	lambda_max = models.FloatField()
 	lambda_step = models.FloatField()
-	data = models.TextField() 
-	
+	data = models.BinaryField()
+
+	class Meta:
+		constraints = [models.UniqueConstraint(fields=PARAMETERS,
+		                                       name='unique_result_parameters')]
+
 	def __unicode__(self):
 		return u'%s %s' % (self.age, self.field_size)
-		
+
 	def get_data(self):
-		return self.data
+		return webapi.utils.npz_to_dict(self.data)
 
 class Plot(models.Model):
 	field_size = models.FloatField()
-	age = models.IntegerField()
+	age = models.FloatField()
 	lambda_min = models.FloatField()
 	lambda_max = models.FloatField()
 	lambda_step = models.FloatField()
-	data = models.TextField() 
-	
+	data = models.BinaryField()
+
+	class Meta:
+		constraints = [models.UniqueConstraint(fields=PARAMETERS,
+		                                       name='unique_plot_parameters')]
+
 	def __unicode__(self):
 		return u'%s %s' % (self.age, self.field_size)
-		
+
 	def get_data(self):
-		return self.data
+		return webapi.utils.npz_to_dict(self.data)
+
+
+class ResultStore:
+	"""
+	Backend of webapi.compute.ResultCache storing the (results, plots) in
+	the Result and Plot tables, keyed by webapi.compute.result_key.
+
+	Database errors (e.g., missing tables before migrate) are logged, and
+	the store then behaves as empty, so that the results are recomputed.
+	Each query runs in its own savepoint, so that an error does not break
+	the transaction of the request.
+	"""
+
+	def parameters(self, key):
+		return dict(zip(PARAMETERS, webapi.compute.key_parameters(key)))
+
+	def get(self, key):
+		parameters = self.parameters(key)
+		try:
+			with transaction.atomic():
+				result = Result.objects.filter(**parameters).first()
+				plot = Plot.objects.filter(**parameters).first()
+		except DatabaseError:
+			log.warning('Reading result %s failed', key, exc_info=True)
+			return None
+		if result is None or plot is None:
+			return None
+		return (result.get_data(), plot.get_data())
+
+	def set(self, key, value):
+		parameters = self.parameters(key)
+		(results, plots) = value
+		try:
+			with transaction.atomic():
+				Result.objects.update_or_create(
+					defaults={'data': webapi.utils.dict_to_npz(results)}, **parameters)
+				Plot.objects.update_or_create(
+					defaults={'data': webapi.utils.dict_to_npz(plots)}, **parameters)
+		except IntegrityError:
+			pass  # stored concurrently by another process
+		except DatabaseError:
+			log.warning('Storing result %s failed', key, exc_info=True)
 
+	def __contains__(self, key):
+		parameters = self.parameters(key)
+		try:
+			with transaction.atomic():
+				return (Result.objects.filter(**parameters).exists() and
+				        Plot.objects.filter(**parameters).exists())
+		except DatabaseError:
+			log.warning('Looking up result %s failed', key, exc_info=True)
+			return False
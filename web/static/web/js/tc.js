@@ -171,6 +171,11 @@ $( "button#btnCompute" ).on('click', function(){
 	flushCache();
 	$.get( ajaxUrl )
 				.done(function() {
+					observerQuery = "?field_size=" + field_size +
+									"&age=" + age +
+									"&lambda_min=" + lambda_min +
+									"&lambda_max=" + lambda_max +
+									"&lambda_step=" + lambda_step;
 					dontCache = true;
 					refreshAllObjects();
 					updateLabels();
@@ -184,6 +189,11 @@ $( "button#btnCompute" ).on('click', function(){
 
 });
 
+//Query string naming the computed observer, so that the output URLs are
+//complete and can be cached by the browser and shared caches. Empty until
+//the first computation: the server then uses the observer of the session.
+var observerQuery = "";
+
 //Object definition for axis
 function axis_label(x, y){
 	this.x = x;
@@ -289,7 +299,7 @@ function refreshObject(object, name){
 	updatePlotOptions();
 /* object is a String: can be 'table' or 'description'*/
 	$( "div#" + name + "_" + object ).siblings(".velo").show();
-	ajaxUrl = '/get_'+ object + '/' + name + '/' + plot_options.norm + "/" + plot_options.log10 + "/";
+	ajaxUrl = '/get_'+ object + '/' + name + '/' + plot_options.norm + "/" + plot_options.log10 + "/" + observerQuery;
 	$.get( ajaxUrl )
 				.done(function( data ) {
 					$( "div#" + name + "_" + object ).empty();
@@ -344,7 +354,7 @@ function refreshPlot(plot){
 						plot_options.cie64 + "/" + 
 						plot_options.labels + "/" +
 						plot_options.norm + "/" +
-                        plot_options.log10 + "/")
+                        plot_options.log10 + "/" + observerQuery)
 							.done(function( data ) {
 								all_plots[plot].setPlot(getOptionsString(), data); //Cache plot
 								$( "div#" + plot + "_plot" ).empty();
@@ -366,7 +376,7 @@ function refreshPlot(plot){
 //This function sends table data to the user
 
 $( "button#getCsv" ).on("click", function(){
-	location.href = "/get_csv/" + currentPlot + "/";
+	location.href = "/get_csv/" + currentPlot + "/" + observerQuery;
 });
 
 
@@ -450,7 +460,7 @@ function showStandard( standard_plot ){
 						plot_options.cie64 + "/" + 
 						plot_options.labels + "/" +
 						plot_options.norm + "/" +
-					    plot_options.log10 + "/")
+					    plot_options.log10 + "/" + observerQuery)
 							.done(function( data ) {
 								all_plots[standard_plot].setPlot(getOptionsString(), data); //Cache plot
 								$( "div#" + standard_plot + "_plot" ).empty();
@@ -5,7 +5,21 @@ when you run "manage.py test".
 Replace this with more appropriate tests for your application.
 """
 
-from django.test import TestCase
+import io
+import json
+import struct
+import threading
+from unittest import mock
+
+import numpy as np
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+import webapi.compute
+import webapi.plot
+from web import warmup
+from web.models import Plot, Result, ResultStore
 
 
 class SimpleTest(TestCase):
@@ -14,3 +28,300 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class ResultStoreTest(TestCase):
+    key = webapi.compute.result_key(2.5, 40, 390, 830, 1)
+    value = ({'LMS': np.arange(4.)}, {'LMS': np.arange(8.)})
+
+    def test_set_get(self):
+        store = ResultStore()
+        self.assertIsNone(store.get(self.key))
+        self.assertNotIn(self.key, store)
+        store.set(self.key, self.value)
+        store.set(self.key, self.value)  # replaces
+        self.assertIn(self.key, store)
+        self.assertEqual(Result.objects.count(), 1)
+        (results, plots) = store.get(self.key)
+        np.testing.assert_array_equal(results['LMS'], self.value[0]['LMS'])
+        np.testing.assert_array_equal(plots['LMS'], self.value[1]['LMS'])
+
+    def test_database_error(self):
+        store = ResultStore()
+        store.set(self.key, self.value)
+        with mock.patch.object(Result.objects, 'filter',
+                               side_effect=DatabaseError('no such table')), \
+                mock.patch.object(Plot.objects, 'update_or_create',
+                                  side_effect=DatabaseError('no such table')), \
+                self.assertLogs('web.models', 'WARNING'):
+            self.assertIsNone(store.get(self.key))
+            self.assertNotIn(self.key, store)
+            store.set(self.key, self.value)
+        self.assertIn(self.key, store)  # still usable afterwards
+
+
+class ObserverParametersTest(TestCase):
+
+    def test_invalid_query(self):
+        url = reverse('get_table', kwargs={'plot': 'lms', 'norm': 0, 'log10': 0})
+        for query in ('field_size=abc', 'age=', 'field_size=2&age=nan',
+                      'field_size=2&lambda_step=inf'):
+            response = self.client.get(url + '?' + query)
+            self.assertEqual(response.status_code, 400, query)
+        url = reverse('get_plot', kwargs={'plot': 'xyz31', 'grid': 1, 'cie31': 1,
+                                          'cie64': 1, 'labels': 0, 'norm': 0,
+                                          'log10': 0})
+        self.assertEqual(self.client.get(url + '?age=x').status_code, 400)
+
+    def test_no_observer(self):
+        url = reverse('get_table', kwargs={'plot': 'lms', 'norm': 0, 'log10': 0})
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+    def test_valid_query(self):
+        url = reverse('get_table', kwargs={'plot': 'lms', 'norm': 0, 'log10': 0})
+        response = self.client.get(url + '?field_size=2&age=32')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+
+
+
+class SubmitJobTest(TestCase):
+
+    def test_invalid_parameters(self):
+        url = reverse('submit_job', kwargs={
+            'field_size': '1.2.3', 'age': 32, 'lambda_min': 390,
+            'lambda_max': 830, 'lambda_step': 1})
+        with mock.patch('web.views.job_queue.submit') as submit:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 400)
+        submit.assert_not_called()
+
+
+class CacheControlTest(TestCase):
+
+    def setUp(self):
+        self.client.get(reverse('compute', kwargs={
+            'field_size': 2, 'age': 32, 'lambda_min': 390, 'lambda_max': 830,
+            'lambda_step': 1}))
+
+    def get(self, plot, query=''):
+        url = reverse('get_table', kwargs={'plot': plot, 'norm': 0, 'log10': 0})
+        return self.client.get(url + query)
+
+    def test_standard_plot(self):
+        for query in ('', '?field_size=2&age=32'):
+            response = self.get('xyz31', query)
+            self.assertEqual(response['Cache-Control'], 'public, max-age=86400')
+            self.assertNotIn('Cookie', response.get('Vary', ''))
+            response = self.client.get(response.request['PATH_INFO'] + query,
+                                       HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+    def test_query_observer(self):
+        response = self.get('xyz', '?field_size=2&age=32')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=86400')
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+
+    def test_session_observer(self):
+        response = self.get('xyz')
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        self.assertIn('Cookie', response['Vary'])
+
+
+class DataTest(TestCase):
+    observer = '?field_size=2&age=32'
+
+    def setUp(self):
+        (self.results, self.plots) = webapi.compute.get_results(
+            webapi.compute.result_key(2, 32, 390, 830, 1))
+
+    def get(self, key, query='', **headers):
+        return self.client.get(reverse('get_data', kwargs={'key': key}) +
+                               self.observer + query, **headers)
+
+    def test_json(self):
+        response = self.get('xyz', '&format=json')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        content = json.loads(response.content)
+        self.assertEqual(content['key'], 'xyz')
+        self.assertEqual(content['shape'], list(self.results['xyz'].shape))
+        np.testing.assert_array_equal(content['data'], self.results['xyz'])
+        content = json.loads(self.get('field_size').content)
+        self.assertEqual(content['data'], self.results['field_size'])
+
+    def test_bin(self):
+        response = self.get('xyz', '&format=bin')
+        self.assertEqual(response['Content-Type'], 'application/octet-stream')
+        self.assertEqual(response['X-Array-Shape'],
+                         '%d,%d' % self.results['xyz'].shape)
+        content = response.content
+        (ndim,) = struct.unpack_from('<I', content)
+        shape = struct.unpack_from('<%dI' % ndim, content, 4)
+        value = np.frombuffer(content, '<f8', offset=4 * (ndim + 1))
+        np.testing.assert_array_equal(value.reshape(shape),
+                                      self.results['xyz'])
+
+    def test_npy(self):
+        response = self.get('LMS', '&format=npy&set=plots')
+        self.assertEqual(response['Content-Type'], 'application/x-npy')
+        np.testing.assert_array_equal(np.load(io.BytesIO(response.content)),
+                                      self.plots['LMS'])
+
+    def test_accept(self):
+        for (accept, content_type) in (
+                ('application/x-npy', 'application/x-npy'),
+                ('application/octet-stream;q=0.9', 'application/octet-stream'),
+                ('text/html, application/json', 'application/json'),
+                ('*/*', 'application/json'),
+                ('', 'application/json')):
+            response = self.get('xyz', HTTP_ACCEPT=accept)
+            self.assertEqual(response.status_code, 200, accept)
+            self.assertEqual(response['Content-Type'], content_type, accept)
+            self.assertEqual(response['Vary'], 'Accept')
+        # An explicit format overrides the Accept header
+        response = self.get('xyz', '&format=npy', HTTP_ACCEPT='application/json')
+        self.assertEqual(response['Content-Type'], 'application/x-npy')
+
+    def test_slice(self):
+        response = self.get('xyz', '&format=npy&lambda_from=500&lambda_to=510')
+        value = np.load(io.BytesIO(response.content))
+        xyz = self.results['xyz']
+        np.testing.assert_array_equal(
+            value, xyz[(xyz[:, 0] >= 500) & (xyz[:, 0] <= 510)])
+        self.assertEqual(len(value), 11)
+        response = self.get('xyz', '&lambda_from=abc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_not_acceptable(self):
+        self.assertEqual(self.get('xyz', HTTP_ACCEPT='text/html').status_code,
+                         406)
+        self.assertEqual(self.get('xyz', '&format=xml').status_code, 406)
+        # Non-numerical values are only available as JSON
+        self.assertEqual(self.get('field_size', '&format=bin').status_code,
+                         406)
+
+    def test_not_found(self):
+        self.assertEqual(self.get('no_such_key').status_code, 404)
+        self.assertEqual(self.get('xyz31_white', '&set=plots').status_code,
+                         404)
+
+
+class CSVTest(TestCase):
+    observer = '?field_size=2&age=50&lambda_step=0.1'
+
+    def test_equal_to_savetxt(self):
+        (results, _) = webapi.compute.get_results(
+            webapi.compute.result_key(2, 50, 390, 830, 0.1))
+        for (plot, key, row_format) in (
+                ('xyz', 'XYZ', '%.1f, %.6e, %.6e, %.6e'),
+                ('xy', 'xyz', '%.1f, %.5f, %.5f, %.5f'),
+                ('lms_base', 'LMS_base', '%.1f, %.8e, %.8e, %.8e'),
+                ('xyz_purples', 'XYZ_purples', '%.1f, %.6e, %.6e, %.6e'),
+                ('xy_purples', 'xyz_purples', '%.1f, %.5f, %.5f, %.5f')):
+            response = self.client.get(
+                reverse('get_csv', kwargs={'plot': plot}) + self.observer)
+            self.assertTrue(response.streaming, plot)
+            expected = io.BytesIO()
+            np.savetxt(expected, results[key], row_format)
+            self.assertEqual(b''.join(response.streaming_content),
+                             expected.getvalue(), plot)
+        self.assertEqual(len(results['XYZ']), 4401)
+
+    def test_not_found(self):
+        response = self.client.get(
+            reverse('get_csv', kwargs={'plot': 'cc'}) + self.observer)
+        self.assertEqual(response.status_code, 404)
+
+
+class PlotCacheTest(TestCase):
+
+    def test_hit(self):
+        webapi.plot.plot_cache.clear()
+        url = reverse('get_plot', kwargs={'plot': 'xyz31', 'grid': 1,
+                                          'cie31': 1, 'cie64': 1, 'labels': 0,
+                                          'norm': 0, 'log10': 0})
+        response = self.client.get(url + '?field_size=2&age=32')
+        self.assertEqual(response.status_code, 200)
+        hits = webapi.plot.plot_cache.hits
+        with mock.patch('web.views.mpld3.fig_to_html') as fig_to_html:
+            cached = self.client.get(url + '?field_size=2&age=32')
+        fig_to_html.assert_not_called()
+        self.assertEqual(webapi.plot.plot_cache.hits, hits + 1)
+        self.assertEqual(cached.content, response.content)
+
+
+class MetricsTest(TestCase):
+
+    def test_disabled_by_default(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+
+    @override_settings(CIEFUNCTIONS_METRICS_HOSTS=('127.0.0.1',))
+    def test_hosts(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'ciefunctions_compute_seconds', response.content)
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='192.0.2.1')
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(CIEFUNCTIONS_METRICS_TOKEN='secret')
+    def test_token(self):
+        for (authorization, status) in (('Bearer secret', 200),
+                                        ('Bearer wrong', 404), ('', 404)):
+            response = self.client.get(reverse('metrics'),
+                                       HTTP_AUTHORIZATION=authorization)
+            self.assertEqual(response.status_code, status, authorization)
+
+
+class WarmupTest(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(warmup, 'ready', threading.Event())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(CIEFUNCTIONS_WARMUP=True)
+    def test_ready_after_warm_up(self):
+        release = threading.Event()
+        with mock.patch.object(warmup, 'warm_up',
+                               lambda keys, plots: release.wait(10)):
+            warmup.start()
+            response = self.client.get(reverse('ready'))
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response['Retry-After'], '1')
+            release.set()
+            self.assertTrue(warmup.ready.wait(10))
+        response = self.client.get(reverse('ready'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), {'ready': True})
+
+    @override_settings(CIEFUNCTIONS_WARMUP=True)
+    def test_ready_after_failure(self):
+        with mock.patch.object(warmup, 'warm_up',
+                               side_effect=MemoryError('warm-up failed')), \
+                mock.patch('threading.excepthook') as excepthook:
+            warmup.start()
+            self.assertTrue(warmup.ready.wait(10))
+            for thread in threading.enumerate():
+                if thread.name == 'warm-up':
+                    thread.join(10)
+        self.assertIs(excepthook.call_args.args[0].exc_type, MemoryError)
+        self.assertEqual(self.client.get(reverse('ready')).status_code, 200)
+
+    @override_settings(CIEFUNCTIONS_WARMUP=False)
+    def test_disabled(self):
+        warmup.start()
+        self.assertEqual(self.client.get(reverse('ready')).status_code, 200)
+
+    @override_settings(CIEFUNCTIONS_WARMUP_OBSERVERS=[(2, 32), (4.5, 61),
+                                                      (1, 20, 400, 700, .5)])
+    def test_warm_up(self):
+        keys = warmup.observer_keys()
+        self.assertEqual(keys, [
+            webapi.compute.result_key(2, 32),
+            webapi.compute.result_key(10, 32),
+            webapi.compute.result_key(4.5, 61),
+            webapi.compute.result_key(1, 20, 400, 700, .5)])
+        with mock.patch('webapi.compute.get_results') as get_results:
+            warmup.warm_up(keys)
+        self.assertEqual([call.args[0] for call in get_results.call_args_list],
+                         keys)
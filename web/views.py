@@ -7,29 +7,69 @@ import webapi.description
 import webapi.table
 import webapi.utils
 import webapi.compute
+import webapi.data
+import webapi.jobs
+import webapi.metrics
 
 
 from django.shortcuts import render
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseRedirect, HttpResponseBadRequest, HttpResponseNotFound, StreamingHttpResponse, JsonResponse
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+from django.core.cache import caches
 
-import matplotlib as mpl
-mpl.use("AGG")
-import matplotlib.pyplot as plt
+from web.models import ResultStore
+from web import warmup
+
+from matplotlib.figure import Figure
 import mpld3
 from django.utils.safestring import mark_safe
 
 import numpy as np
-from io import StringIO
+from types import MappingProxyType
 
 import logging
 log = logging.getLogger(__name__)
 
+import functools
+import hmac
 import time
 from time import gmtime, strftime
 
-#Global options for plot, table & description. Contains defaults.
-
-options = { 	'grid' 			 : 0,
+# Cross-process stores of compute results, looked up before computing:
+# - optionally, the Django cache (e.g. memcached) with the alias given in
+#   settings.CIEFUNCTIONS_RESULT_CACHE
+# - the Result and Plot tables of the database, unless
+#   settings.CIEFUNCTIONS_RESULT_STORE is False
+if getattr(settings, 'CIEFUNCTIONS_RESULT_CACHE', None):
+	webapi.compute.result_cache.backends.append(caches[settings.CIEFUNCTIONS_RESULT_CACHE])
+if getattr(settings, 'CIEFUNCTIONS_RESULT_STORE', True):
+	webapi.compute.result_cache.backends.append(ResultStore())
+
+# Metrics of the steps of the computations, unless
+# settings.CIEFUNCTIONS_METRICS is False
+if getattr(settings, 'CIEFUNCTIONS_METRICS', True):
+	webapi.metrics.enable()
+
+# Background compute jobs: a bounded pool of worker threads. The job records
+# are kept in memory, or in settings.CIEFUNCTIONS_JOB_DIR to share them
+# between the processes of one machine, for settings.CIEFUNCTIONS_JOB_TTL
+# seconds after the job has finished.
+_job_ttl = getattr(settings, 'CIEFUNCTIONS_JOB_TTL', 3600.)
+job_queue = webapi.jobs.JobQueue(
+	max_workers=getattr(settings, 'CIEFUNCTIONS_JOB_WORKERS', 2),
+	max_queue=getattr(settings, 'CIEFUNCTIONS_JOB_QUEUE', 16),
+	store=(webapi.jobs.FileJobStore(settings.CIEFUNCTIONS_JOB_DIR, _job_ttl)
+	       if getattr(settings, 'CIEFUNCTIONS_JOB_DIR', None)
+	       else webapi.jobs.MemoryJobStore(_job_ttl)))
+
+#Default options for plot, table & description. Immutable, so that concurrent
+#requests cannot affect each other; each request makes its own options with
+#makeOptions.
+
+DEFAULT_OPTIONS = MappingProxyType({
+				'grid' 			 : 0,
 				'full_title'	 : True,
             	'cie31' 		 : 0,
             	'cie64' 		 : 0,
@@ -39,45 +79,97 @@ options = { 	'grid' 			 : 0,
             	'norm'			 : False,
             	'title_fontsize' : 13,
 			    'log10'          : False
-}
-
-def updateOptions(optionSet):
-
-	try: options['grid'] = optionSet['grid']
-	except: pass
-	
-	try: options['full_title'] = bool(optionSet['full_title'])
-	except: pass
-	
-	try: options['cie31'] = optionSet['cie31']
-	except: pass
-	
-	try: options['cie64'] = optionSet['cie64']
-	except: pass
-	
-	try: options['labels'] = optionSet['labels']
-	except: pass
-	
-	try: options['axis_labels'] = bool(optionSet['axis_labels'])
-	except: pass
-	
-	try: options['label_fontsize'] = optionSet['label_fontsize']
-	except: pass
-	
-	try: options['norm'] = bool(optionSet['norm'])
-	except: pass
-
-	try: options['log10'] = bool(optionSet['log10'])
-	except: pass
-
-	return
+})
+
+def makeOptions(optionSet):
+	"""
+	Return the immutable options of a request: the defaults, overridden by optionSet.
+	"""
+	options = dict(DEFAULT_OPTIONS)
+	for key in ('full_title', 'axis_labels', 'norm', 'log10'):
+		if key in optionSet:
+			options[key] = bool(optionSet[key])
+	for key in ('grid', 'cie31', 'cie64', 'labels', 'label_fontsize'):
+		if key in optionSet:
+			options[key] = optionSet[key]
+	return MappingProxyType(options)
 
 def time_now():
 	return strftime("%Y-%m-%d %H:%M:%S", gmtime())
 	
+def request_result_key(request):
+	"""
+	Return the result key of the observer given by the query parameters
+	field_size, age, lambda_min, lambda_max and lambda_step, or else of the
+	session's observer. Raises ValueError for invalid (or non-finite)
+	parameters, and KeyError if there are none and no session observer.
+	"""
+	params = request.GET
+	if 'field_size' in params or 'age' in params:
+		parameters = [float(params.get(name, default)) for (name, default) in
+		              (('field_size', 2), ('age', 32), ('lambda_min', 390),
+		               ('lambda_max', 830), ('lambda_step', 1))]
+		if not np.isfinite(parameters).all():
+			raise ValueError('Non-finite observer parameters')
+		return webapi.compute.result_key(*parameters)
+	return request.session['result_key']
+
+def session_results(request):
+	"""
+	Return the (results, plots) of the request's observer from the result cache.
+	"""
+	return webapi.compute.get_results(request_result_key(request))
+
+# HTTP caching. The outputs are pure functions of the URL (plot and display
+# flags), the observer and the version of the code and data. Outputs of the
+# CIE 1931/1964 standards do not depend on the observer at all.
+
+PLOTS = ('lms', 'lms_base', 'bm', 'lm', 'xyz', 'xy', 'xyz_purples', 'xy_purples',
+         'xyz31', 'xyz64', 'xy31', 'xy64')
+STANDARD_PLOTS = ('xyz31', 'xyz64', 'xy31', 'xy64')
+
+def cacheable(standard=STANDARD_PLOTS):
+	"""
+	Decorate an output view with ETag validation (304 Not Modified) and
+	Cache-Control: shared for a day for the standard plots and for URLs giving
+	the observer in the query (revalidated with the ETag afterwards, since the
+	URLs do not change with new versions), and private, revalidated ones when
+	the observer is the session's. Only the latter vary with the cookie.
+	"""
+	def etag_func(request, plot, *args, **kwargs):
+		if plot in standard:
+			return webapi.utils.etag(request.path)
+		return webapi.utils.etag(request.path, request_result_key(request))
+
+	def decorator(view):
+		view = condition(etag_func=etag_func)(view)
+
+		@functools.wraps(view)
+		def wrapper(request, plot, *args, **kwargs):
+			# Validate the observer once, before etag_func and the view use it
+			try:
+				request_result_key(request)
+			except (ValueError, KeyError):
+				return HttpResponseBadRequest('Invalid or missing observer parameters')
+			response = view(request, plot, *args, **kwargs)
+			if response.status_code in (200, 304):
+				if (plot in standard or
+				    'field_size' in request.GET or 'age' in request.GET):
+					patch_cache_control(response, public=True, max_age=24 * 3600)
+					if not request.session.modified:
+						# Not Vary: Cookie (added by the session middleware if
+						# the session was read); the response is the same for all
+						request.session.accessed = False
+				else:
+					patch_cache_control(response, private=True, no_cache=True)
+					patch_vary_headers(response, ['Cookie'])
+			return response
+		return wrapper
+	return decorator
+
 def get_filename_params(request):
 	
-	results	 		= request.session['results']
+	results	 		= session_results(request)[0]
 	
 	age 			= str(int(results['age']))
 	field_size 		= str(results['field_size'].replace(".", "_"))
@@ -89,30 +181,39 @@ def get_filename_params(request):
 
 	return filename_params
 
-def get_plot(request, plot, grid, cie31, cie64, labels, norm, log10):
-	start = time.time()
-	log.debug("[%s] Requesting %s/%s/%s/%s/%s/%s/%s - \t\tsID: %s" % (time_now(), plot, grid, cie31, cie64, labels, norm, log10, request.session.session_key))
-
-	#Figure
-	fig = plt.figure()
+def metric_label(plot):
+	"""
+	Return the label of a plot in the metrics, bounding the number of series.
+	"""
+	return plot if plot in PLOTS else 'unknown'
+
+def observe_session(request):
+	"""
+	Record the size of the serialized session data in the metrics.
+	"""
+	webapi.metrics.session_bytes.observe(len(request.session.encode(dict(request.session))))
+
+def render_plot(key, plot, options):
+	"""
+	Return the HTML of a plot of the observer with the given result key,
+	rendered with the given options. Repeated plots are served from the
+	cache of rendered plots.
+	"""
+	cache_key = webapi.plot.PlotCache.key(key, plot, options)
+	resulting_plot = webapi.plot.plot_cache.get(cache_key)
+	if resulting_plot is not None:
+		return resulting_plot
+
+	#Figure (a Figure object rather than pyplot, so that requests share no state)
+	fig = Figure()
 
 	#Figure size, in inches, 100 dots-per-inch
 	dpi = 80
 	fig.set_size_inches(8.0, 4.8)
 	ax = fig.add_subplot(111)
-	plots = request.session['plots']
-	results = request.session['results']
-	
-	optionSet = { 	'grid' 				: int(grid),
-            		'cie31' 			: int(cie31),
-            		'cie64' 			: int(cie64),
-            		'labels' 			: int(labels),
-            		'norm'				: bool(int(norm)),
-					'log10'				: bool(int(log10))
-    }
-    
-	updateOptions(optionSet)
+	plots = webapi.compute.get_results(key)[1]
 
+	draw_start = time.perf_counter()
 	if plot == 'lms':
 		webapi.plot.lms(ax, plots, options)
 	
@@ -149,113 +250,137 @@ def get_plot(request, plot, grid, cie31, cie64, labels, norm, log10):
 	elif plot == 'xy64':
 		webapi.plot.xy64(ax, plots, options)
 
-	htmlFig = mpld3.fig_to_html(fig, template_type='general')
-	theFig = mark_safe(htmlFig)
-	resulting_plot = theFig
-	plt.close(fig)
+	webapi.metrics.plot_seconds.observe(time.perf_counter() - draw_start, metric_label(plot))
+
+	with webapi.metrics.mpld3_seconds.time(metric_label(plot)):
+		htmlFig = mpld3.fig_to_html(fig, template_type='general')
+	resulting_plot = mark_safe(htmlFig)
+	webapi.plot.plot_cache.put(cache_key, resulting_plot)
+	return resulting_plot
+
+@cacheable()
+def get_plot(request, plot, grid, cie31, cie64, labels, norm, log10):
+	start = time.time()
+	log.debug("[%s] Requesting %s/%s/%s/%s/%s/%s/%s - \t\tsID: %s" % (time_now(), plot, grid, cie31, cie64, labels, norm, log10, request.session.session_key))
+
+	optionSet = { 	'grid' 				: int(grid),
+            		'cie31' 			: int(cie31),
+            		'cie64' 			: int(cie64),
+            		'labels' 			: int(labels),
+            		'norm'				: bool(int(norm)),
+					'log10'				: bool(int(log10))
+    }
+    
+	options = makeOptions(optionSet)
+
+	resulting_plot = render_plot(request_result_key(request), plot, options)
 	stop = time.time()
-	log.debug("[%s] Plot %s/%s/%s/%s/%s/%s/%s produced in %s seconds - \t\tsID: %s" % ( time_now(), plot,  grid, cie31, cie64, labels, norm, log10, str(stop - start), request.session.session_key))
-	print("[%s] Plot %s/%s/%s/%s/%s/%s/%s produced in %s seconds - \t\tsID: %s" % ( time_now(), plot,  grid, cie31, cie64, labels, norm, log10, str(stop - start), request.session.session_key))
+	log.debug("[%s] Plot %s/%s/%s/%s/%s/%s/%s produced in %s seconds (plot cache hit rate %.2f) - \t\tsID: %s" % ( time_now(), plot,  grid, cie31, cie64, labels, norm, log10, str(stop - start), webapi.plot.plot_cache.hit_rate(), request.session.session_key))
 	return HttpResponse(resulting_plot)
 
+@cacheable()
 def get_table(request, plot, norm, log10):
-	results = request.session['results']
+	results = session_results(request)[0]
 
 	optionSet = {		'norm'				: bool(int(norm)),
 						'log10'				: bool(int(log10))
 				}
     
-	updateOptions(optionSet)
+	options = makeOptions(optionSet)
 
-	if plot == 'lms':
-		return HttpResponse(mark_safe(webapi.table.lms(results, options, '')))
+	with webapi.metrics.table_seconds.time(metric_label(plot)):
+		if plot == 'lms':
+			return HttpResponse(mark_safe(webapi.table.lms(results, options, '')))
 
-	elif plot == 'lms_base':
-		return HttpResponse(mark_safe(webapi.table.lms_base(results, options, '')))
+		elif plot == 'lms_base':
+			return HttpResponse(mark_safe(webapi.table.lms_base(results, options, '')))
 
-	elif plot == 'bm':
-		return HttpResponse(mark_safe(webapi.table.bm(results, options, '')))
+		elif plot == 'bm':
+			return HttpResponse(mark_safe(webapi.table.bm(results, options, '')))
 
-	elif plot == 'lm':
-		return HttpResponse(mark_safe(webapi.table.lm(results, options, '')))
+		elif plot == 'lm':
+			return HttpResponse(mark_safe(webapi.table.lm(results, options, '')))
 
-	elif plot == 'xyz':
-		return HttpResponse(mark_safe(webapi.table.xyz(results, options, '')))
+		elif plot == 'xyz':
+			return HttpResponse(mark_safe(webapi.table.xyz(results, options, '')))
 
-	elif plot == 'xy':
-		return HttpResponse(mark_safe(webapi.table.xy(results, options, '')))
+		elif plot == 'xy':
+			return HttpResponse(mark_safe(webapi.table.xy(results, options, '')))
 	
-	elif plot == 'xyz_purples':
-		return HttpResponse(mark_safe(webapi.table.xyz_purples(results, options, '')))
+		elif plot == 'xyz_purples':
+			return HttpResponse(mark_safe(webapi.table.xyz_purples(results, options, '')))
 
-	elif plot == 'xy_purples':
-		return HttpResponse(mark_safe(webapi.table.xyz_purples(results, options, '')))
+		elif plot == 'xy_purples':
+			return HttpResponse(mark_safe(webapi.table.xyz_purples(results, options, '')))
 
-	elif plot == 'xy31':
-		return HttpResponse(mark_safe(webapi.table.xy31(results, options, '')))
+		elif plot == 'xy31':
+			return HttpResponse(mark_safe(webapi.table.xy31(results, options, '')))
 
-	elif plot == 'xyz31':
-		return HttpResponse(mark_safe(webapi.table.xyz31(results, options, '')))
+		elif plot == 'xyz31':
+			return HttpResponse(mark_safe(webapi.table.xyz31(results, options, '')))
 
-	elif plot == 'xyz64':
-		return HttpResponse(mark_safe(webapi.table.xyz64(results, options, '')))
+		elif plot == 'xyz64':
+			return HttpResponse(mark_safe(webapi.table.xyz64(results, options, '')))
 
-	elif plot == 'xy64':
-		return HttpResponse(mark_safe(webapi.table.xy64(results, options, '')))
+		elif plot == 'xy64':
+			return HttpResponse(mark_safe(webapi.table.xy64(results, options, '')))
 		
-	else:
-		return HttpResponse('No table for plot %s' % plot)
+		else:
+			return HttpResponse('No table for plot %s' % plot)
 
 
+@cacheable()
 def get_description(request, plot, norm, log10):
-	results = request.session['results']
+	results = session_results(request)[0]
 	
 	optionSet = {		'norm'				: bool(int(norm)),
 						'log10'				: bool(int(log10))
 				}
     
-	updateOptions(optionSet)
+	options = makeOptions(optionSet)
 
-	if plot == 'lms':
-		return HttpResponse(mark_safe(webapi.description.lms(results, '', options, '')))
+	with webapi.metrics.description_seconds.time(metric_label(plot)):
+		if plot == 'lms':
+			return HttpResponse(mark_safe(webapi.description.lms(results, '', options, '')))
 
-	elif plot == 'lms_base':
-		return HttpResponse(mark_safe(webapi.description.lms_base(results, '', options, '')))
+		elif plot == 'lms_base':
+			return HttpResponse(mark_safe(webapi.description.lms_base(results, '', options, '')))
 
-	elif plot == 'bm':
-		return HttpResponse(mark_safe(webapi.description.bm(results, '', options, '')))
+		elif plot == 'bm':
+			return HttpResponse(mark_safe(webapi.description.bm(results, '', options, '')))
 
-	elif plot == 'lm':
-		return HttpResponse(mark_safe(webapi.description.lm(results, '', options, '')))
+		elif plot == 'lm':
+			return HttpResponse(mark_safe(webapi.description.lm(results, '', options, '')))
 
-	elif plot == 'xyz':
-		return HttpResponse(mark_safe(webapi.description.xyz(results, '', options, '')))
+		elif plot == 'xyz':
+			return HttpResponse(mark_safe(webapi.description.xyz(results, '', options, '')))
 
-	elif plot == 'xy':
-		return HttpResponse(mark_safe(webapi.description.xy(results, '', options, '')))
+		elif plot == 'xy':
+			return HttpResponse(mark_safe(webapi.description.xy(results, '', options, '')))
 
-	elif plot == 'xyz_purples':
-		return HttpResponse(mark_safe(webapi.description.xyz_purples(results, '', options, '')))
+		elif plot == 'xyz_purples':
+			return HttpResponse(mark_safe(webapi.description.xyz_purples(results, '', options, '')))
 	
-	elif plot == 'xy_purples':
-		return HttpResponse(mark_safe(webapi.description.xy_purples(results, '', options, '')))
+		elif plot == 'xy_purples':
+			return HttpResponse(mark_safe(webapi.description.xy_purples(results, '', options, '')))
 	
-	elif plot == 'xyz31':
-		return HttpResponse(mark_safe(webapi.description.xyz31(results, '', options, '')))
+		elif plot == 'xyz31':
+			return HttpResponse(mark_safe(webapi.description.xyz31(results, '', options, '')))
 
-	elif plot == 'xyz64':
-		return HttpResponse(mark_safe(webapi.description.xyz64(results, '', options, '')))
+		elif plot == 'xyz64':
+			return HttpResponse(mark_safe(webapi.description.xyz64(results, '', options, '')))
 		
-	elif plot == 'xy31':
-		return HttpResponse(mark_safe(webapi.description.xy31(results, '', options, '')))
+		elif plot == 'xy31':
+			return HttpResponse(mark_safe(webapi.description.xy31(results, '', options, '')))
 
-	elif plot == 'xy64':
-		return HttpResponse(mark_safe(webapi.description.xy64(results, '', options, '')))
+		elif plot == 'xy64':
+			return HttpResponse(mark_safe(webapi.description.xy64(results, '', options, '')))
 		
-	else:
-		return HttpResponse('No description for plot %s' % plot)
+		else:
+			return HttpResponse('No description for plot %s' % plot)
 
 
+@cacheable(standard=())  # the file names give the observer
 def get_csv(request, plot):
 
 	format = { 	'xyz' 			:  '%.1f, %.6e, %.6e, %.6e',
@@ -270,7 +395,7 @@ def get_csv(request, plot):
 			   	'lm'			: '%.1f, %.6f, %.6f, %.6f',
 			   	'cc'			: '%.1f, %.5f, %.5f, %.5f',
 
-				'xyz_purples'   : '%.1f, %.5f, %.5f, %.5f',
+				'xyz_purples'   : '%.1f, %.6e, %.6e, %.6e',
 				'xy_purples'   : '%.1f, %.5f, %.5f, %.5f'
 	}
 
@@ -297,15 +422,113 @@ def get_csv(request, plot):
 			   		'cc'			: 'cc'
 	}
 
+	results_key = {
+					'lms' 			: 'LMS',
+					'lms_base'		: 'LMS_base',
+
+					'bm'			: 'lms_mb',
+					'lm'			: 'lms_mw',
+
+					'xyz' 			: 'XYZ',
+					'xy'			: 'xyz',
+
+					'xyz_purples'	: 'XYZ_purples',
+					'xy_purples'    : 'xyz_purples',
+
+					'xyz31' 		: 'XYZ31',
+					'xyz64' 		: 'XYZ64',
+
+					'xy31'			: 'xyz31',
+					'xy64'			: 'xyz64',
+	}
+
+	if plot not in results_key:
+		return HttpResponseNotFound('No CSV for plot %s' % plot)
+
 	filename = plot_name[plot] + get_filename_params(request) + ".csv"
 	
-	output = StringIO.StringIO()
-	thePlot = request.session['results']
-	np.savetxt(output, thePlot[plot], format[plot])
-	response = HttpResponse(output.getvalue(), mimetype='text/csv')
+	thePlot = session_results(request)[0]
+	response = StreamingHttpResponse(
+		webapi.data.csv_chunks(thePlot[results_key[plot]], format[plot]),
+		content_type='text/csv')
 	response['Content-Disposition'] = 'attachment; filename = "%s"' % filename
 	return response
 
+def get_data(request, key):
+	"""
+	Return a results key as JSON, raw little-endian float64 with a shape
+	header, or .npy.
+
+	Query parameters:
+	- format: json, bin or npy (otherwise negotiated from the Accept header)
+	- set: results (default) or plots (0.1 nm steps)
+	- lambda_from, lambda_to: wavelength range of the rows returned
+	- field_size, age, lambda_min, lambda_max, lambda_step: the observer
+	  (default: the observer of the session)
+	"""
+	params = request.GET
+	format = webapi.data.negotiate(params.get('format'), request.META.get('HTTP_ACCEPT', ''))
+	if format is None:
+		return HttpResponse('Supported formats: %s' % ', '.join(webapi.data.CONTENT_TYPES), status=406)
+	try:
+		result_key = request_result_key(request)
+		lambda_from = float(params['lambda_from']) if 'lambda_from' in params else None
+		lambda_to = float(params['lambda_to']) if 'lambda_to' in params else None
+	except (ValueError, KeyError):
+		return HttpResponseBadRequest('Invalid or missing observer parameters')
+
+	results, plots = webapi.compute.get_results(result_key)
+	data = plots if params.get('set') == 'plots' else results
+	if key not in data:
+		return HttpResponseNotFound('No data %s' % key)
+	value = webapi.data.select(data[key], lambda_from, lambda_to)
+	content = webapi.data.encode(key, value, format)
+	if content is None:
+		return HttpResponse('%s is only available as json' % key, status=406)
+	response = HttpResponse(content, content_type=webapi.data.CONTENT_TYPES[format])
+	response['Vary'] = 'Accept'
+	if isinstance(value, np.ndarray):
+		response['X-Array-Shape'] = ','.join(str(n) for n in value.shape)
+	return response
+
+def submit_job(request, field_size, age, lambda_min, lambda_max, lambda_step):
+	"""
+	Submit a background compute job. Returns the job as JSON (202), 400 if
+	the parameters are not numbers, or 503 if the queue is full.
+	"""
+	try:
+		key = webapi.compute.result_key(field_size, age, lambda_min, lambda_max, lambda_step)
+	except ValueError:
+		return HttpResponseBadRequest('Invalid or missing observer parameters')
+	try:
+		job_id = job_queue.submit(key)
+	except webapi.jobs.QueueFull:
+		response = JsonResponse({'error': 'Too many compute jobs, try again later'}, status=503)
+		response['Retry-After'] = '5'
+		return response
+	return job_response(request, job_queue.status(job_id), status=202)
+
+def get_job(request, job_id):
+	"""
+	Return the state of a compute job as JSON. With ?wait=seconds (at most 30),
+	wait for the job to finish first.
+	"""
+	try:
+		wait = min(float(request.GET.get('wait', 0)), 30.)
+	except ValueError:
+		return HttpResponseBadRequest('Invalid wait')
+	job = job_queue.status(job_id, wait)
+	if job is None:
+		return HttpResponseNotFound('No job %s' % job_id)
+	return job_response(request, job)
+
+def job_response(request, job, status=200):
+	if job['state'] == webapi.jobs.DONE:
+		request.session['result_key'] = job['key']
+		observe_session(request)
+	return JsonResponse({'job': job['id'], 'state': job['state'], 'error': job['error']},
+	                    status=status)
+
 def compute(request, field_size, age, lambda_min, lambda_max, lambda_step):
     start      = time.time()
     field_size = float(field_size)
@@ -316,7 +539,10 @@ def compute(request, field_size, age, lambda_min, lambda_max, lambda_step):
 
     print('compute')
 
-    request.session['results'], request.session['plots'] = webapi.compute_tabulated(field_size, age, lambda_min, lambda_max, lambda_step)
+    key = webapi.compute.result_key(field_size, age, lambda_min, lambda_max, lambda_step)
+    webapi.compute.get_results(key)
+    request.session['result_key'] = key
+    observe_session(request)
     print('done')
     stop = time.time()
     log.debug("[%s] Compute performed in %s seconds - sID: %s" % ( time_now(), str(stop - start), request.session.session_key))
@@ -324,6 +550,37 @@ def compute(request, field_size, age, lambda_min, lambda_max, lambda_step):
     return HttpResponse('Calculate fields updated')
 
 
+def metrics(request):
+	"""
+	The metrics in the Prometheus text format. Disabled (404) unless enabled
+	by one or both of:
+	- settings.CIEFUNCTIONS_METRICS_HOSTS: the REMOTE_ADDRs allowed (note
+	  that behind a proxy on the same host, all requests come from it)
+	- settings.CIEFUNCTIONS_METRICS_TOKEN: a token required in the header
+	  Authorization: Bearer <token>
+	"""
+	hosts = getattr(settings, 'CIEFUNCTIONS_METRICS_HOSTS', None)
+	token = getattr(settings, 'CIEFUNCTIONS_METRICS_TOKEN', None)
+	if not hosts and not token:
+		return HttpResponseNotFound()
+	if hosts and request.META.get('REMOTE_ADDR') not in hosts:
+		return HttpResponseNotFound()
+	if token and not hmac.compare_digest(
+			request.META.get('HTTP_AUTHORIZATION', '').encode(),
+			('Bearer ' + token).encode()):
+		return HttpResponseNotFound()
+	return HttpResponse(webapi.metrics.exposition(), content_type=webapi.metrics.CONTENT_TYPE)
+
+def ready(request):
+	"""
+	Readiness probe: 503 until the warm-up of the worker has finished.
+	"""
+	if not warmup.ready.is_set():
+		response = JsonResponse({'ready': False}, status=503)
+		response['Retry-After'] = '1'
+		return response
+	return JsonResponse({'ready': True})
+
 def home(request):
 
 	log.info("[%s] New request. sessionId: %s" % (time_now(), request.session.session_key))
@@ -365,7 +622,10 @@ def home(request):
 
 	#Call an initial compute
 	start = time.time()
-	request.session['results'], request.session['plots'] = webapi.compute_tabulated(field_size, age, lambda_min, lambda_max, lambda_step)
+	key = webapi.compute.result_key(field_size, age, lambda_min, lambda_max, lambda_step)
+	webapi.compute.get_results(key)
+	request.session['result_key'] = key
+	observe_session(request)
 	stop = time.time()
 	log.debug("[%s] Initial compute performed in %s seconds - \tsID: %s" % ( time_now(), str(stop - start), request.session.session_key))
 	
@@ -0,0 +1,87 @@
+"""
+warmup: Load the visual data and precompute popular observers when a web
+worker starts, so that the first requests do not pay for them.
+
+Settings:
+- CIEFUNCTIONS_WARMUP: run the warm-up at app-ready time (default True)
+- CIEFUNCTIONS_WARMUP_OBSERVERS: observers to precompute in addition to
+  2°/32 and 10°/32 years, as (field_size, age) or (field_size, age,
+  lambda_min, lambda_max, lambda_step)
+- CIEFUNCTIONS_WARMUP_PLOTS: also render the plots of the observers with the
+  default options into the plot cache (default False)
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+import tc1_97
+import webapi.compute
+
+log = logging.getLogger(__name__)
+
+DEFAULT_OBSERVERS = ((2., 32.), (10., 32.))
+
+# Set when the warm-up has finished (or is disabled); reported by views.ready
+ready = threading.Event()
+
+
+def observer_keys():
+	"""
+	Return the result keys of the observers to warm up.
+	"""
+	observers = list(DEFAULT_OBSERVERS) + list(
+		getattr(settings, 'CIEFUNCTIONS_WARMUP_OBSERVERS', ()))
+	keys = []
+	for observer in observers:
+		parameters = tuple(observer) + (390., 830., 1.)[len(observer) - 2:]
+		key = webapi.compute.result_key(*parameters)
+		if key not in keys:
+			keys.append(key)
+	return keys
+
+
+def warm_up(keys, render_plots=False):
+	"""
+	Load the visual data, then compute the results of the observers with the
+	given result keys into webapi.compute.result_cache, and optionally render
+	their plots with the default options. Failures are logged, not raised.
+	"""
+	from web import views  # configures the result cache backends
+
+	start = time.time()
+	for (name, *_) in tc1_97.DATA_TABLES:
+		getattr(tc1_97.VisualData, name)
+	tc1_97.load_observer_atlas()
+	for key in keys:
+		try:
+			webapi.compute.get_results(key)
+			if render_plots:
+				options = views.makeOptions({})
+				for plot in views.PLOTS:
+					views.render_plot(key, plot, options)
+		except Exception:
+			log.exception('Warm-up of %s failed', key)
+	log.info('Warm-up of %d observers done in %.2f seconds',
+	         len(keys), time.time() - start)
+
+
+def start():
+	"""
+	Start the configured warm-up in a background thread, setting ready when
+	it has finished.
+	"""
+	if not getattr(settings, 'CIEFUNCTIONS_WARMUP', True):
+		ready.set()
+		return
+
+	def run():
+		try:
+			warm_up(observer_keys(),
+			        getattr(settings, 'CIEFUNCTIONS_WARMUP_PLOTS', False))
+		finally:
+			ready.set()
+
+	threading.Thread(target=run, name='warm-up', daemon=True).start()
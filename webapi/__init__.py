@@ -28,3 +28,6 @@ import webapi.plot
 import webapi.table
 import webapi.description
 import webapi.utils
+import webapi.data
+import webapi.jobs
+import webapi.metrics
@@ -19,12 +19,181 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import collections
+import concurrent.futures
+import threading
+
+import numpy as np
+
 import tc1_97
+import webapi.metrics
 from webapi.utils import ndarray_to_list
 
 
-def compute_tabulated(field_size, age, lambda_min=390, lambda_max=830, lambda_step=1):
-    results, plots =  tc1_97.compute_tabulated(field_size, age, lambda_min, lambda_max, lambda_step)
+def compute_tabulated(field_size, age, lambda_min=390, lambda_max=830, lambda_step=1,
+                      outputs=None):
+    key = result_key(field_size, age, lambda_min, lambda_max, lambda_step)
+    if outputs is None:
+        results, plots = get_results(key)
+    else:
+        results, plots = single_flight.do(
+            (key, repr(outputs)),
+            lambda: tc1_97.compute_tabulated(*key_parameters(key), outputs=outputs,
+                                             atlas=tc1_97.load_observer_atlas()))
+    results = dict(results)  # shared between callers; convert copies
+    plots = dict(plots)
     ndarray_to_list(results)
     ndarray_to_list(plots)
     return results, plots
+
+
+# =============================================================================
+# Single-flight coalescing of identical concurrent computations
+# =============================================================================
+
+class SingleFlight:
+    """
+    Let concurrent callers with the same key share one computation: the
+    first caller computes, the others wait for its result (or exception).
+    The per-key state is removed as soon as the computation is finished.
+    """
+
+    def __init__(self):
+        self.computations = 0   # number of computations run
+        self.coalesced = 0      # number of callers served by another's run
+        self._calls = dict()
+        self._lock = threading.Lock()
+
+    def do(self, key, function):
+        """
+        Return function(), sharing the call with concurrent callers of the
+        same key.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = concurrent.futures.Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return call.result()
+        try:
+            call.set_result(function())
+        except BaseException as e:
+            call.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self.computations += 1
+        return call.result()
+
+
+single_flight = SingleFlight()
+
+
+# =============================================================================
+# Process-wide cache of compute results
+# =============================================================================
+
+def result_key(field_size, age, lambda_min=390, lambda_max=830, lambda_step=1):
+    """
+    Make the cache key of the results for the given observer parameters.
+
+    The key is a short string, suitable for storing in the session and as
+    a key of a (cross-process) cache backend.
+    """
+    return 'tc1_97/%r/%r/%r/%r/%r' % (float(field_size), float(age),
+                                      float(lambda_min), float(lambda_max),
+                                      float(lambda_step))
+
+
+def key_parameters(key):
+    """
+    Return the observer parameters (field_size, age, lambda_min, lambda_max,
+    lambda_step) encoded in a key made by result_key.
+    """
+    return tuple(float(param) for param in key.split('/')[1:])
+
+
+class ResultCache:
+    """
+    Bounded least-recently-used cache of the (results, plots) of
+    tc1_97.compute_tabulated, keyed by result_key.
+
+    The arrays are kept as read-only ndarrays, shared between all requests
+    of the process. On misses, the cross-process backends (objects with
+    get(key) and set(key, value) methods, e.g. a Django cache or a database
+    store) are consulted in order before computing, and are filled with
+    what they lacked.
+    """
+
+    def __init__(self, maxsize=32, backends=()):
+        self.maxsize = maxsize
+        self.backends = list(backends)
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the (results, plots) for the key, computing them if missing.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        return single_flight.do(key, lambda: self._load(key))
+
+    def _load(self, key):
+        # Fetch from the backends or compute, and store
+        value = None
+        missing = []
+        for backend in self.backends:
+            value = backend.get(key)
+            if value is not None:
+                break
+            missing.append(backend)
+        if value is None:
+            with webapi.metrics.compute_seconds.time():
+                value = tc1_97.compute_tabulated(
+                    *key_parameters(key), atlas=tc1_97.load_observer_atlas())
+        for backend in missing:
+            backend.set(key, value)
+        for dictionary in value:
+            for item in dictionary.values():
+                if isinstance(item, np.ndarray):
+                    item.setflags(write=False)
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def hit_rate(self):
+        """
+        Return the fraction of lookups served from the process-wide cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def clear(self):
+        """
+        Remove all entries from the process-wide cache (not the backend).
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+result_cache = ResultCache()
+
+
+def get_results(key):
+    """
+    Return the (results, plots) dictionaries for a key made by result_key,
+    as native ndarrays, from the process-wide cache.
+    """
+    return result_cache.get(key)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+data: Encode computed results as JSON, raw binary or .npy for the data API.
+
+Copyright (C) 2019 Ivar Farup
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import io
+import json
+import struct
+
+import numpy as np
+
+# Formats: name -> content type
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'bin': 'application/octet-stream',
+    'npy': 'application/x-npy',
+}
+
+
+def negotiate(format=None, accept=''):
+    """
+    Choose the format from an explicit format name or else the Accept
+    header. Return None if none of the formats is acceptable.
+    """
+    if format:
+        return format if format in CONTENT_TYPES else None
+    if not accept:
+        return 'json'
+    for media_range in accept.split(','):
+        media_type = media_range.split(';')[0].strip()
+        if media_type in ('*/*', 'application/*'):
+            return 'json'
+        for (name, content_type) in CONTENT_TYPES.items():
+            if media_type == content_type:
+                return name
+    return None
+
+
+def select(value, lambda_from=None, lambda_to=None):
+    """
+    Select the rows of a tabulated value with wavelength (first column)
+    within [lambda_from, lambda_to]. Values other than tables are returned
+    unchanged.
+    """
+    if not isinstance(value, np.ndarray) or value.ndim != 2:
+        return value
+    rows = np.ones(len(value), bool)
+    if lambda_from is not None:
+        rows &= value[:, 0] >= lambda_from
+    if lambda_to is not None:
+        rows &= value[:, 0] <= lambda_to
+    return value[rows]
+
+
+def to_json(key, value):
+    """
+    Encode a value as compact JSON: {"key": ..., "shape": ..., "data": ...}.
+    """
+    if isinstance(value, np.ndarray):
+        content = {'key': key, 'shape': value.shape, 'data': value.tolist()}
+    else:
+        content = {'key': key, 'data': value}
+    return json.dumps(content, separators=(',', ':')).encode()
+
+
+def to_binary(value):
+    """
+    Encode an array as raw little-endian float64, preceded by a header of
+    little-endian uint32: the number of dimensions, followed by the shape.
+    """
+    value = np.asarray(value, dtype='<f8')
+    header = struct.pack('<%dI' % (value.ndim + 1), value.ndim, *value.shape)
+    return header + value.tobytes()
+
+
+def to_npy(value):
+    """
+    Encode an array in the NumPy .npy format.
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(value, dtype='<f8'))
+    return buffer.getvalue()
+
+
+def encode(key, value, format):
+    """
+    Encode a value in the given format. Return None if the value cannot be
+    represented in it (non-numerical values are JSON only).
+    """
+    if format == 'json':
+        return to_json(key, value)
+    if not isinstance(value, (np.ndarray, int, float)):
+        return None
+    if format == 'bin':
+        return to_binary(value)
+    return to_npy(value)
+
+
+def csv_chunks(value, row_format, chunk_rows=1024):
+    """
+    Generate the CSV text of a table in chunks of rows, as np.savetxt
+    would write it. Each chunk is formatted with a single %-operation, so
+    memory use is bounded by the chunk size.
+    """
+    value = np.atleast_2d(value)
+    for start in range(0, len(value), chunk_rows):
+        chunk = value[start:start + chunk_rows]
+        yield ((row_format + '\n') * len(chunk)) % tuple(chunk.ravel())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+jobs: Run compute jobs in the background, to be polled for completion.
+
+Copyright (C) 2019 Ivar Farup
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+import webapi.compute
+
+log = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class QueueFull(Exception):
+    """
+    Raised when a job is submitted while the queue is at its limit.
+    """
+
+
+# =============================================================================
+# Job stores
+# =============================================================================
+
+class MemoryJobStore:
+    """
+    Job records (dicts) kept in the memory of the process. Records of jobs
+    finished more than ttl seconds ago are dropped.
+    """
+
+    def __init__(self, ttl=3600.):
+        self.ttl = ttl
+        self._jobs = dict()
+        self._lock = threading.Lock()
+
+    def save(self, job):
+        with self._lock:
+            self._jobs[job['id']] = dict(job)
+            self._prune()
+
+    def load(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return None if job is None else dict(job)
+
+    def _prune(self):
+        expired = time.time() - self.ttl
+        for job_id in [job_id for (job_id, job) in self._jobs.items()
+                       if job['finished'] is not None and
+                       job['finished'] < expired]:
+            del self._jobs[job_id]
+
+
+class FileJobStore:
+    """
+    Job records kept as JSON files in a directory, so that all the worker
+    processes of a single machine see the same jobs. Files not written for
+    ttl seconds (i.e., of finished jobs, or left by a dead process) are
+    removed, at most once per minute.
+    """
+
+    PRUNE_INTERVAL = 60.
+
+    def __init__(self, directory, ttl=3600.):
+        self.directory = directory
+        self.ttl = ttl
+        self._next_prune = 0.
+        os.makedirs(directory, exist_ok=True)
+
+    def _filename(self, job_id):
+        return os.path.join(self.directory, '%s.json' % job_id)
+
+    def save(self, job):
+        filename = self._filename(job['id'])
+        with open(filename + '.tmp', 'w') as f:
+            json.dump(job, f)
+        os.replace(filename + '.tmp', filename)  # atomic
+        if time.time() >= self._next_prune:
+            self.prune()
+
+    def load(self, job_id):
+        if not job_id.isalnum():
+            return None
+        try:
+            with open(self._filename(job_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def prune(self):
+        """
+        Remove the files not written for ttl seconds.
+        """
+        now = time.time()
+        self._next_prune = now + self.PRUNE_INTERVAL
+        for entry in os.scandir(self.directory):
+            try:
+                if (entry.name.endswith(('.json', '.tmp')) and
+                        entry.stat().st_mtime < now - self.ttl):
+                    os.remove(entry.path)
+            except OSError:
+                pass  # removed concurrently by another process
+
+
+# =============================================================================
+# Job queue
+# =============================================================================
+
+class JobQueue:
+    """
+    Bounded pool of worker threads computing results into
+    webapi.compute.result_cache.
+
+    Identical jobs that are queued or running are deduplicated, and at most
+    max_queue jobs can be queued or running at a time.
+    """
+
+    def __init__(self, max_workers=2, max_queue=16, store=None):
+        self.max_queue = max_queue
+        self.store = MemoryJobStore() if store is None else store
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers, thread_name_prefix='compute-job')
+        self._in_flight = dict()   # result key -> job id
+        self._finished = dict()    # job id -> threading.Event
+        self._lock = threading.Lock()
+
+    def submit(self, key):
+        """
+        Submit a job computing the results for a key made by
+        webapi.compute.result_key, and return the job id.
+
+        Raises QueueFull if the queue is at its limit.
+        """
+        with self._lock:
+            if key in self._in_flight:
+                return self._in_flight[key]
+            if len(self._in_flight) >= self.max_queue:
+                raise QueueFull('%d jobs in the queue' % len(self._in_flight))
+            job = {'id': uuid.uuid4().hex, 'key': key, 'state': QUEUED,
+                   'error': None, 'submitted': time.time(), 'finished': None}
+            self.store.save(job)
+            self._in_flight[key] = job['id']
+            self._finished[job['id']] = threading.Event()
+        self._executor.submit(self._run, job)
+        return job['id']
+
+    def _run(self, job):
+        try:
+            job['state'] = RUNNING
+            self.store.save(job)
+            webapi.compute.get_results(job['key'])
+            job['state'] = DONE
+        except Exception:
+            log.exception('Compute job %s (%s) failed', job['id'], job['key'])
+            job['state'] = FAILED
+            job['error'] = 'The computation failed'
+        finally:
+            job['finished'] = time.time()
+            try:
+                self.store.save(job)
+            except Exception:
+                log.exception('Saving compute job %s failed', job['id'])
+            with self._lock:
+                del self._in_flight[job['key']]
+                self._finished.pop(job['id']).set()
+
+    def status(self, job_id, wait=0):
+        """
+        Return the job record, or None if unknown. If wait > 0, wait up to
+        wait seconds for the job to finish first (long-polling).
+        """
+        with self._lock:
+            finished = self._finished.get(job_id)
+        if wait > 0:
+            if finished is not None:
+                finished.wait(wait)
+            else:
+                # the job may run in another process sharing the store
+                deadline = time.time() + wait
+                job = self.store.load(job_id)
+                while (job is not None and job['state'] in (QUEUED, RUNNING)
+                       and time.time() < deadline):
+                    time.sleep(.1)
+                    job = self.store.load(job_id)
+        return self.store.load(job_id)
+
+    def depth(self):
+        """
+        Return the number of jobs queued or running.
+        """
+        with self._lock:
+            return len(self._in_flight)
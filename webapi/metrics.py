@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+metrics: Histograms of the time spent in computing and rendering, and the
+counters of the caches, exposed in the Prometheus text format.
+
+Copyright (C) 2019 Ivar Farup
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import bisect
+import contextlib
+import threading
+import time
+
+import tc1_97.compute
+import webapi
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds of the buckets, in seconds and bytes
+TIME_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1.,
+                2.5, 5., 10.)
+SIZE_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+COUNT_BUCKETS = (5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Histogram:
+    """
+    Cumulative histogram of observed values, with one series per value of
+    an optional label.
+    """
+
+    def __init__(self, name, documentation, buckets=TIME_BUCKETS, label=None):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label = label
+        self._series = dict()  # label value -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, label_value=None):
+        """
+        Record an observed value, of the series with the given label value.
+        """
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [
+                    [0] * (len(self.buckets) + 1), 0., 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextlib.contextmanager
+    def time(self, label_value=None):
+        """
+        Context manager observing the wall-clock time of its block.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, label_value)
+
+    def _labels(self, label_value, **extra):
+        labels = [] if label_value is None else [(self.label, label_value)]
+        labels.extend(extra.items())
+        if not labels:
+            return ''
+        return '{%s}' % ','.join(
+            '%s="%s"' % (name, str(value).replace('\\', '\\\\')
+                         .replace('"', '\\"').replace('\n', '\\n'))
+            for (name, value) in labels)
+
+    def exposition(self):
+        """
+        Return the histogram in the Prometheus text format.
+        """
+        lines = ['# HELP %s %s' % (self.name, self.documentation),
+                 '# TYPE %s histogram' % self.name]
+        with self._lock:
+            series = sorted(self._series.items(), key=lambda item: str(item[0]))
+            series = [(label_value, list(counts), total, count)
+                      for (label_value, (counts, total, count)) in series]
+        for (label_value, counts, total, count) in series:
+            cumulative = 0
+            for (bound, bucket_count) in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                lines.append('%s_bucket%s %d' % (
+                    self.name,
+                    self._labels(label_value, le=bound if bound == '+Inf'
+                                 else repr(float(bound))),
+                    cumulative))
+            lines.append('%s_sum%s %r' % (self.name, self._labels(label_value),
+                                          total))
+            lines.append('%s_count%s %d' % (self.name,
+                                            self._labels(label_value), count))
+        return '\n'.join(lines) + '\n'
+
+
+class Sampled:
+    """
+    Counter or gauge whose value is read from a function when exposed, e.g.
+    a counter attribute of a cache.
+    """
+
+    def __init__(self, name, documentation, kind, function):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.function = function
+
+    def exposition(self):
+        """
+        Return the metric in the Prometheus text format.
+        """
+        return '# HELP %s %s\n# TYPE %s %s\n%s %r\n' % (
+            self.name, self.documentation, self.name, self.kind, self.name,
+            float(self.function()))
+
+
+# =============================================================================
+# The histograms of the web app
+# =============================================================================
+
+compute_seconds = Histogram(
+    'ciefunctions_compute_seconds',
+    'Time of a full compute_tabulated.')
+compute_step_seconds = Histogram(
+    'ciefunctions_compute_step_seconds',
+    'Time of the steps of compute_tabulated.', label='step')
+solver_iterations = Histogram(
+    'ciefunctions_solver_iterations',
+    'Iterations of the optimisation of the XYZ transformation matrix.',
+    COUNT_BUCKETS)
+plot_seconds = Histogram(
+    'ciefunctions_plot_seconds',
+    'Time of drawing a plot with matplotlib.', label='plot')
+mpld3_seconds = Histogram(
+    'ciefunctions_mpld3_seconds',
+    'Time of serializing a plot to HTML with mpld3.', label='plot')
+table_seconds = Histogram(
+    'ciefunctions_table_seconds',
+    'Time of generating the HTML of a table.', label='plot')
+description_seconds = Histogram(
+    'ciefunctions_description_seconds',
+    'Time of generating the HTML of a description.', label='plot')
+session_bytes = Histogram(
+    'ciefunctions_session_bytes',
+    'Size of the serialized session data.', SIZE_BUCKETS)
+
+HISTOGRAMS = [compute_seconds, compute_step_seconds, solver_iterations,
+              plot_seconds,
+              mpld3_seconds, table_seconds, description_seconds,
+              session_bytes]
+
+
+# =============================================================================
+# The counters of the caches of the web app (read when exposed)
+# =============================================================================
+
+SAMPLED = [
+    Sampled('ciefunctions_single_flight_computations_total',
+            'Computations run by the single-flight coalescing.', 'counter',
+            lambda: webapi.compute.single_flight.computations),
+    Sampled('ciefunctions_single_flight_coalesced_total',
+            'Callers served by a concurrent identical computation.',
+            'counter', lambda: webapi.compute.single_flight.coalesced),
+    Sampled('ciefunctions_result_cache_hits_total',
+            'Lookups served from the process-wide result cache.', 'counter',
+            lambda: webapi.compute.result_cache.hits),
+    Sampled('ciefunctions_result_cache_misses_total',
+            'Lookups missing the process-wide result cache.', 'counter',
+            lambda: webapi.compute.result_cache.misses),
+    Sampled('ciefunctions_result_cache_hit_ratio',
+            'Fraction of lookups served from the process-wide result cache.',
+            'gauge', lambda: webapi.compute.result_cache.hit_rate()),
+    Sampled('ciefunctions_plot_cache_hits_total',
+            'Lookups served from the rendered-plot cache.', 'counter',
+            lambda: webapi.plot.plot_cache.hits),
+    Sampled('ciefunctions_plot_cache_misses_total',
+            'Lookups missing the rendered-plot cache.', 'counter',
+            lambda: webapi.plot.plot_cache.misses),
+    Sampled('ciefunctions_plot_cache_hit_ratio',
+            'Fraction of lookups served from the rendered-plot cache.',
+            'gauge', lambda: webapi.plot.plot_cache.hit_rate()),
+    Sampled('ciefunctions_plot_cache_bytes',
+            'Size of the rendered plots in the cache.', 'gauge',
+            lambda: webapi.plot.plot_cache.nbytes),
+]
+
+
+class StepMetrics:
+    """
+    Tracer of tc1_97.compute_tabulated recording the time of the steps and
+    the iterations of the solver.
+    """
+
+    def begin(self, step):
+        pass
+
+    def end(self, step, info):
+        compute_step_seconds.observe(info['seconds'], step)
+        if 'iterations' in info:
+            solver_iterations.observe(info['iterations'])
+
+
+step_metrics = StepMetrics()
+
+
+def enable():
+    """
+    Record the steps of tc1_97.compute_tabulated (idempotent).
+    """
+    tc1_97.compute.add_tracer(step_metrics)
+
+
+def exposition():
+    """
+    Return all the histograms and counters in the Prometheus text format.
+    """
+    return ''.join(metric.exposition() for metric in HISTOGRAMS + SAMPLED)
@@ -19,6 +19,9 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import collections
+import threading
+
 import tc1_97.plot as tc
 from webapi.utils import list_to_ndarray
 
@@ -91,3 +94,72 @@ def xy_purples(axis, plots, options):
     plots = plots.copy()
     list_to_ndarray(plots)
     return tc.xy_purples(axis, plots, options)
+
+
+# =============================================================================
+# Cache of rendered plots
+# =============================================================================
+
+class PlotCache:
+    """
+    Least-recently-used cache of rendered plots (e.g. mpld3 HTML), keyed by
+    (result key, plot, options), bounded by the total size in bytes.
+    """
+
+    def __init__(self, maxbytes=64 * 2**20):
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(result_key, plot, options):
+        """
+        Make the cache key of a plot rendered with the given options dict.
+        """
+        return (result_key, plot, tuple(sorted(options.items())))
+
+    def get(self, key):
+        """
+        Return the rendered plot for the key, or None if missing.
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, payload):
+        """
+        Store a rendered plot, evicting the least recently used ones to stay
+        within maxbytes.
+        """
+        size = len(payload)
+        if size > self.maxbytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= len(self._entries.pop(key))
+            self._entries[key] = payload
+            self.nbytes += size
+            while self.nbytes > self.maxbytes:
+                self.nbytes -= len(self._entries.popitem(last=False)[1])
+
+    def hit_rate(self):
+        """
+        Return the fraction of lookups served from the cache.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+plot_cache = PlotCache()
@@ -19,8 +19,16 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import glob
+import hashlib
+import io
+import os
+
 import numpy as np
 
+import tc1_97
+import webapi
+
 
 def ndarray_to_list(dictionary):
     """
@@ -38,3 +46,56 @@ def list_to_ndarray(dictionary):
     for key in dictionary:
         if type(dictionary[key]) is list:
             dictionary[key] = np.array(dictionary[key])
+
+
+def dict_to_npz(dictionary):
+    """
+    Pack the dictionary (ndarrays, strings and numbers) into compressed
+    NumPy .npz bytes.
+    """
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **dictionary)
+    return buffer.getvalue()
+
+
+def npz_to_dict(data):
+    """
+    Unpack a dictionary packed by dict_to_npz.
+    """
+    with np.load(io.BytesIO(bytes(data))) as npz:
+        return {key: npz[key] if npz[key].ndim else npz[key].item()
+                for key in npz.files}
+
+
+def version_hash():
+    """
+    Return a hash identifying the version of the code and data producing
+    the outputs (the sources of tc1_97 and webapi, and the data bundle
+    index), for use in HTTP validators.
+    """
+    global _version_hash
+    if _version_hash is None:
+        sha1 = hashlib.sha1()
+        for package in (tc1_97, webapi):
+            directory = os.path.dirname(os.path.abspath(package.__file__))
+            for filename in sorted(glob.glob(os.path.join(directory, '*.py'))):
+                with open(filename, 'rb') as f:
+                    sha1.update(f.read())
+        with open(tc1_97.resource_path(tc1_97.DATA_BUNDLE_INDEX), 'rb') as f:
+            sha1.update(f.read())
+        _version_hash = sha1.hexdigest()[:16]
+    return _version_hash
+
+
+_version_hash = None
+
+
+def etag(*parts):
+    """
+    Make a strong ETag from the parts identifying an output and the version
+    hash.
+    """
+    sha1 = hashlib.sha1(version_hash().encode())
+    for part in parts:
+        sha1.update(b'\0' + str(part).encode())
+    return '"%s"' % sha1.hexdigest()